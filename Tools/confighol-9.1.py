@@ -1,8 +1,31 @@
 #!/usr/bin/env python3
 # confighol-9.1.py - HOLFY27 vApp HOLification Tool
-# Version 2.26 - 2026-08-03
+# Version 2.27 - 2026-10-18
 # Author - Burke Azbill and HOL Core Team
 #
+# v2.27: ESXi host configuration performance pass:
+#        - ESXi HostSystem lookup uses SearchIndex.FindByDnsName (one call,
+#          no server-side view) instead of a CreateContainerView/Destroy
+#          pair per host.
+#        - Exit-code-only subprocess probes (playwright, certutil) discard
+#          output via DEVNULL instead of capturing and decoding it.
+#        - All SmartConnect calls share one module-level unverified
+#          SSLContext (_SSL_CTX) instead of building one per connection.
+#        - ESXi authorized_keys copy is skipped when ~/.cache/holfy27/
+#          esx_keyed_hosts.json records the same key digest for the host.
+#          Delete that file to force a re-copy after a host is rebuilt.
+#        - Function-local imports hoisted to module scope so worker threads
+#          do not contend on the import lock.
+#        - configure_esxi_host() polls TCP/22 (bounded ~3s) instead of a
+#          fixed 2s sleep after enabling SSH.
+#        - ESXi hosts are configured in parallel, bounded by ESX_MAX_PARALLEL
+#          (8) concurrent hosts.
+#        - Generated SSH config sets UserKnownHostsFile=/dev/null and
+#          LogLevel=ERROR; known_hosts deletion is now opt-in via
+#          --scrub-known-hosts.
+#        - get_esx_hosts_from_config() parses [RESOURCES] ESXiHosts once with
+#          a precompiled pattern; shared by Step 1 and Vault CA distribution.
+#
 # v2.26: fix_vsp_controlplane_sizing() now targets the BenS-validated 4 vCPU /
 #        10240 MiB control-plane size (was a 12-vCPU / 24576 MiB floor, which
 #        conflicted with BenS's vsp-remediate.sh CP_TARGET=4 sizing).
@@ -337,6 +360,7 @@
 #    python3 confighol.py --skip-vcshell     # Skip vCenter shell configuration
 #    python3 confighol.py --skip-nsx         # Skip NSX configuration
 #    python3 confighol.py --esx-only         # Only configure ESXi hosts
+#    python3 confighol.py --scrub-known-hosts # Also delete holuser known_hosts
 #    python3 confighol.py --skip-proxy-config # Skip all proxy/NO_PROXY configuration
 #    python3 confighol.py --yes-proxy        # Auto-confirm proxy config (no prompt)
 #
@@ -358,21 +382,30 @@ Python patterns and the lsfunctions library for consistency.
 """
 
 import os
+import re
 import sys
 import glob
+import socket
+import base64
 import argparse
 import time
 import ssl
 import json
+import hashlib
 import shutil
 import subprocess
 import tempfile
 import zipfile
 import io
+import threading
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Optional, Tuple, List
+from urllib.parse import urlparse
 
 import requests
+import urllib3
 
 # Add hol directory to path for imports
 sys.path.insert(0, '/home/holuser/hol')
@@ -388,7 +421,7 @@ import lsfunctions as lsf
 # CONFIGURATION CONSTANTS
 #==============================================================================
 
-SCRIPT_VERSION = '2.24'
+SCRIPT_VERSION = '2.27'
 SCRIPT_NAME = 'confighol.py'
 
 # SSH key paths
@@ -401,6 +434,18 @@ ESX_AUTH_KEYS_PATH = '/etc/ssh/keys-root/authorized_keys'
 ESX_USERNAME = 'root'
 SSH_SERVICE_NAME = 'TSM-SSH'  # Technical Support Mode - SSH
 
+# Local record of ESXi hosts that already hold the current authorized_keys
+# Format: {"hostname": "<sha256 of authorized_keys contents>"}
+ESX_KEYED_HOSTS_CACHE = os.path.expanduser('~/.cache/holfy27/esx_keyed_hosts.json')
+_ESX_KEYED_HOSTS_LOCK = threading.Lock()
+
+# Maximum ESXi hosts configured concurrently (keeps concurrent SSH sessions
+# well under sshd MaxStartups on the hosts and the Manager)
+ESX_MAX_PARALLEL = 8
+
+# Leading hostname of a config.ini host entry ("host:flag"); skips comments
+_CONFIG_HOST_RE = re.compile(r'^\s*([^#;:\s][^:\s]*)')
+
 # Linux/vCenter SSH configuration
 LINUX_AUTH_FILE = '/root/.ssh/authorized_keys'
 VPXD_CONFIG = '/etc/vmware-vpx/vpxd.cfg'
@@ -415,6 +460,12 @@ NSX_PASSWORD_EXPIRY_DAYS = 999
 # Password expiration setting for vCenter (999)
 PASSWORD_MAX_DAYS = 999
 
+# Shared unverified TLS context for all pyVmomi SmartConnect calls
+# (lab certificates are self-signed; build once instead of per connection)
+_SSL_CTX = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
 #==============================================================================
 # HELPER FUNCTIONS - FILE OPERATIONS
 #==============================================================================
@@ -476,17 +527,20 @@ def create_authorized_keys_file() -> str:
 # HELPER FUNCTIONS - SSH CONFIG SETUP
 #==============================================================================
 
-def setup_ssh_environment():
+def setup_ssh_environment(scrub_known_hosts: bool = False):
     """
     Set up the SSH environment for passwordless authentication.
     
     This function:
     1. Renames the Firefox SSL certificate state file to prevent issues
-    2. Removes stale known_hosts files on Manager and LMC
-    3. Creates SSH config to auto-accept new host keys
+    2. Creates SSH config that ignores known_hosts and auto-accepts host keys
+    3. Optionally removes stale known_hosts files on Manager and LMC
     
     These steps are critical for reliable SSH connectivity in lab environments
-    where VMs are frequently rebuilt with new host keys.
+    where VMs are frequently rebuilt with new host keys. Since the SSH config
+    (and lsf.ssh/lsf.scp) bypass known_hosts, scrubbing is opt-in.
+    
+    :param scrub_known_hosts: If True, also delete the known_hosts files
     """
     lsf.write_output('Setting up SSH environment...')
     
@@ -499,20 +553,23 @@ def setup_ssh_environment():
         lsf.write_output(f'Backing up Firefox SSL state: {filepath[0]}')
         os.rename(filepath[0], backup_path)
     
-    # Remove known_hosts files to prevent host key verification failures
-    # Lab VMs are frequently rebuilt with new host keys, so stale entries cause issues
-    known_hosts_files = [
-        '/home/holuser/.ssh/known_hosts',
-        '/lmchol/home/holuser/.ssh/known_hosts'
-    ]
-    for known_hosts in known_hosts_files:
-        if os.path.exists(known_hosts):
-            lsf.write_output(f'Removing stale known_hosts: {known_hosts}')
-            os.remove(known_hosts)
-    
-    # Create SSH config to auto-accept new host keys
-    # This prevents interactive prompts during SSH connections
-    ssh_config_content = "Host *\n\tStrictHostKeyChecking=no\n"
+    # Remove known_hosts files (opt-in via --scrub-known-hosts)
+    # Lab VMs are frequently rebuilt with new host keys, but the SSH config
+    # below already keeps stale entries from being consulted
+    if scrub_known_hosts:
+        known_hosts_files = [
+            '/home/holuser/.ssh/known_hosts',
+            '/lmchol/home/holuser/.ssh/known_hosts'
+        ]
+        for known_hosts in known_hosts_files:
+            if os.path.exists(known_hosts):
+                lsf.write_output(f'Removing stale known_hosts: {known_hosts}')
+                os.remove(known_hosts)
+    
+    # Create SSH config to auto-accept new host keys without recording them
+    # This prevents interactive prompts and stale host key failures
+    ssh_config_content = ("Host *\n\tStrictHostKeyChecking=no\n"
+                          "\tUserKnownHostsFile=/dev/null\n\tLogLevel=ERROR\n")
     ssh_config_files = [
         '/home/holuser/.ssh/config',
         '/lmchol/home/holuser/.ssh/config'
@@ -640,6 +697,37 @@ def update_esxi_session_timeout(hostname: str, timeout: int = 0, dry_run: bool =
         return False
 
 
+def _load_esx_keyed_hosts() -> dict:
+    """
+    Load the cache of ESXi hosts that already have the current authorized_keys.
+    
+    :return: Dict of hostname -> sha256 digest (empty if missing or unreadable)
+    """
+    try:
+        with open(ESX_KEYED_HOSTS_CACHE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_esx_keyed_host(hostname: str, digest: str):
+    """
+    Record that an ESXi host now holds the authorized_keys with this digest.
+    
+    :param hostname: ESXi host FQDN
+    :param digest: sha256 hex digest of the authorized_keys contents
+    """
+    with _ESX_KEYED_HOSTS_LOCK:
+        keyed_hosts = _load_esx_keyed_hosts()
+        keyed_hosts[hostname] = digest
+        try:
+            os.makedirs(os.path.dirname(ESX_KEYED_HOSTS_CACHE), exist_ok=True)
+            with open(ESX_KEYED_HOSTS_CACHE, 'w') as f:
+                json.dump(keyed_hosts, f, indent=2)
+        except OSError as e:
+            lsf.write_output(f'{hostname}: WARNING - Could not update {ESX_KEYED_HOSTS_CACHE}: {e}')
+
+
 def configure_esxi_host(hostname: str, host_system, auth_keys_file: str, 
                         dry_run: bool = False) -> bool:
     """
@@ -670,20 +758,31 @@ def configure_esxi_host(hostname: str, host_system, auth_keys_file: str,
             lsf.write_output(f'{hostname}: WARNING - Failed to enable SSH via API')
             # Don't fail completely - try via direct SSH later
     
-    # Give SSH time to start if we just enabled it
+    # Give SSH time to start if we just enabled it: poll port 22 for up to
+    # ~3s and continue as soon as it answers instead of a fixed sleep
     if not dry_run:
-        time.sleep(2)
+        for _ in range(6):
+            if lsf.test_tcp_port(hostname, 22, timeout=0.5):
+                break
+            time.sleep(0.25)
     
     # Step 2: Copy authorized_keys for passwordless SSH access
+    # Skipped when a previous run already pushed identical key contents
     if not dry_run:
-        lsf.write_output(f'{hostname}: Copying authorized_keys for passwordless SSH')
-        result = lsf.scp(auth_keys_file, f'{ESX_USERNAME}@{hostname}:{ESX_AUTH_KEYS_PATH}', password)
-        if result.returncode != 0:
-            lsf.write_output(f'{hostname}: WARNING - Failed to copy authorized_keys')
-            success = False
+        with open(auth_keys_file, 'rb') as f:
+            keys_digest = hashlib.sha256(f.read()).hexdigest()
+        if _load_esx_keyed_hosts().get(hostname) == keys_digest:
+            lsf.write_output(f'{hostname}: authorized_keys already current (cached), skipping copy')
         else:
-            # Set proper permissions on the authorized_keys file
-            lsf.ssh(f'chmod 600 {ESX_AUTH_KEYS_PATH}', f'{ESX_USERNAME}@{hostname}', password)
+            lsf.write_output(f'{hostname}: Copying authorized_keys for passwordless SSH')
+            result = lsf.scp(auth_keys_file, f'{ESX_USERNAME}@{hostname}:{ESX_AUTH_KEYS_PATH}', password)
+            if result.returncode != 0:
+                lsf.write_output(f'{hostname}: WARNING - Failed to copy authorized_keys')
+                success = False
+            else:
+                # Set proper permissions on the authorized_keys file
+                lsf.ssh(f'chmod 600 {ESX_AUTH_KEYS_PATH}', f'{ESX_USERNAME}@{hostname}', password)
+                _record_esx_keyed_host(hostname, keys_digest)
     else:
         lsf.write_output(f'{hostname}: Would copy authorized_keys to {ESX_AUTH_KEYS_PATH}')
     
@@ -711,12 +810,58 @@ def configure_esxi_host(hostname: str, host_system, auth_keys_file: str,
     return success
 
 
+def get_esx_hosts_from_config() -> list:
+    """
+    Get list of ESXi hostnames from the config.ini file.
+    
+    Parses the [RESOURCES] ESXiHosts entries (format: hostname:maintenance_flag)
+    in a single pass, skipping blank and commented lines.
+    
+    :return: List of ESXi hostnames (FQDNs)
+    """
+    if not lsf.config.has_option('RESOURCES', 'ESXiHosts'):
+        return []
+    
+    esx_hosts = []
+    for line in lsf.config.get('RESOURCES', 'ESXiHosts', raw=True).splitlines():
+        match = _CONFIG_HOST_RE.match(line)
+        if match:
+            esx_hosts.append(match.group(1))
+    return esx_hosts
+
+
+def find_esxi_host_system(hostname: str):
+    """
+    Find an ESXi HostSystem by DNS name across all connected sessions.
+    
+    SearchIndex.FindByDnsName is a single server-side lookup and avoids
+    allocating a container view over the whole inventory. Falls back to a
+    name match (lsf.get_host) for hosts registered under a non-DNS name.
+    
+    :param hostname: ESXi host FQDN
+    :return: vim.HostSystem or None
+    """
+    for si in lsf.sis:
+        try:
+            host_system = si.content.searchIndex.FindByDnsName(
+                dnsName=hostname, vmSearch=False
+            )
+        except Exception:
+            continue
+        if host_system:
+            return host_system
+    return lsf.get_host(hostname)
+
+
 def configure_all_esxi_hosts(esx_hosts: list, auth_keys_file: str, 
                              dry_run: bool = False) -> dict:
     """
     Configure all ESXi hosts from the config.ini.
     
-    :param esx_hosts: List of ESXi host entries from config
+    Hosts are configured in parallel, at most ESX_MAX_PARALLEL at a time,
+    so large labs do not trip sshd MaxStartups throttling.
+    
+    :param esx_hosts: List of ESXi hostnames (see get_esx_hosts_from_config)
     :param auth_keys_file: Path to authorized_keys file
     :param dry_run: If True, preview only
     :return: Dict with success/fail counts
@@ -732,32 +877,35 @@ def configure_all_esxi_hosts(esx_hosts: list, auth_keys_file: str,
     lsf.write_output('ESXi Host Configuration')
     lsf.write_output('=' * 60)
     
-    for entry in esx_hosts:
-        # Skip comments and empty lines
-        if not entry or entry.strip().startswith('#'):
-            continue
-        
-        # Parse entry format: hostname:maintenance_mode_flag
-        parts = entry.split(':')
-        hostname = parts[0].strip()
-        
+    def _configure_one(hostname: str) -> str:
         # Wait for host to be reachable
         if not lsf.test_ping(hostname):
             lsf.write_output(f'{hostname}: Host not reachable, skipping')
-            results['failed'] += 1
-            results['hosts'].append({'host': hostname, 'status': 'unreachable'})
-            continue
+            return 'unreachable'
         
         # Get host object from connected sessions
-        host_system = lsf.get_host(hostname)
+        host_system = find_esxi_host_system(hostname)
         
         # Configure the host
         if configure_esxi_host(hostname, host_system, auth_keys_file, dry_run):
-            results['success'] += 1
-            results['hosts'].append({'host': hostname, 'status': 'success'})
-        else:
-            results['failed'] += 1
-            results['hosts'].append({'host': hostname, 'status': 'failed'})
+            return 'success'
+        return 'failed'
+    
+    with ThreadPoolExecutor(max_workers=min(ESX_MAX_PARALLEL, len(esx_hosts))) as executor:
+        futures = [(hostname, executor.submit(_configure_one, hostname))
+                   for hostname in esx_hosts]
+        # Collect in config order so the summary stays stable
+        for hostname, future in futures:
+            try:
+                status = future.result()
+            except Exception as e:
+                lsf.write_output(f'{hostname}: ERROR - {e}')
+                status = 'failed'
+            if status == 'success':
+                results['success'] += 1
+            else:
+                results['failed'] += 1
+            results['hosts'].append({'host': hostname, 'status': status})
     
     return results
 
@@ -887,8 +1035,6 @@ def configure_vcenter_password_policies(hostname: str, user: str, password: str,
     :param dry_run: If True, preview only
     :return: True if successful
     """
-    import requests
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
     if dry_run:
@@ -929,14 +1075,11 @@ def configure_vcenter_password_policies(hostname: str, user: str, password: str,
         
         si = None
         try:
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
             si = connect.SmartConnect(
                 host=hostname,
                 user=user,
                 pwd=password,
-                sslContext=context
+                sslContext=_SSL_CTX
             )
             lsf.write_output(f'{hostname}: SUCCESS - Connected to vSphere API')
         except Exception as conn_err:
@@ -1033,11 +1176,8 @@ def configure_auto_platform_isolation(hostname: str, user: str, password: str,
         return True
 
     try:
-        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
         si = connect.SmartConnect(host=hostname, user=user, pwd=password,
-                                  sslContext=context)
+                                  sslContext=_SSL_CTX)
         content = si.RetrieveContent()
 
         container = content.viewManager.CreateContainerView(
@@ -1398,7 +1538,6 @@ def get_nsx_root_password_from_sddc(nsx_fqdn: str, password: str,
     :param resource_type: SDDC Manager resource type (NSXT_MANAGER or NSXT_EDGE)
     :return: The actual root password, or None if lookup fails
     """
-    import re
     
     # Try to find the matching SDDC Manager based on the domain
     sddc_managers = _get_sddc_managers()
@@ -1536,8 +1675,6 @@ def enable_nsx_ssh_via_api(hostname: str, user: str, password: str,
     :param dry_run: If True, preview only
     :return: True if successful
     """
-    import requests
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
     if dry_run:
@@ -1807,7 +1944,6 @@ def _get_nsx_manager_for_edge(edge_hostname: str) -> Optional[str]:
     :param edge_hostname: NSX Edge hostname (e.g. edge-wld01-01a)
     :return: NSX Manager FQDN, or None if not found
     """
-    import re
     
     if 'VCF' not in lsf.config or 'vcfnsxmgr' not in lsf.config['VCF']:
         return None
@@ -1851,8 +1987,6 @@ def enable_nsx_edge_ssh_via_api(edge_hostname: str, nsx_manager: str,
     :param dry_run: If True, preview only
     :return: True if SSH is now enabled
     """
-    import requests
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
     if dry_run:
@@ -2102,9 +2236,6 @@ def configure_aria_automation_vms(auth_keys_file: str, password: str,
     
     success = True
     
-    import re
-    from urllib.parse import urlparse
-    
     # Collect hostnames from vravms config
     hostnames_to_configure = []
     for vravm in vravms:
@@ -2415,12 +2546,9 @@ def enable_ops_vm_ssh_via_guest_ops(vm_name: str, vcenter_fqdn: str,
         lsf.write_output(f'{vm_name}: Would enable SSH via Guest Operations API')
         return True
     
-    import ssl as ssl_module
-    
     try:
-        context = ssl_module._create_unverified_context()
         si = connect.SmartConnect(host=vcenter_fqdn, user=vcenter_user,
-                                  pwd=password, sslContext=context)
+                                  pwd=password, sslContext=_SSL_CTX)
     except Exception as e:
         lsf.write_output(f'{vm_name}: Could not connect to vCenter {vcenter_fqdn}: {e}')
         return False
@@ -2538,7 +2666,6 @@ def configure_operations_vms(auth_keys_file: str, password: str,
     
     # Also discover Ops VMs from vcfcomponenturls (e.g. opslogs-a.site-a.vcf.lab)
     if lsf.config.has_section('VCFFINAL') and lsf.config.has_option('VCFFINAL', 'vcfcomponenturls'):
-        from urllib.parse import urlparse
         comp_urls = lsf.config.get('VCFFINAL', 'vcfcomponenturls').split('\n')
         default_vc = ''
         if lsf.config.has_option('RESOURCES', 'vCenters'):
@@ -2749,7 +2876,6 @@ def check_certutil_installed() -> bool:
     
     :return: True if certutil is available
     """
-    import shutil
     return shutil.which(CERTUTIL_BINARY) is not None
 
 
@@ -2808,12 +2934,11 @@ def check_playwright_installed() -> bool:
     
     :return: True if both the Python package and chromium binary are available
     """
-    import subprocess
     
     # Check 1: is the playwright Python package importable?
     pkg_check = subprocess.run(
         ['python3', '-c', 'import playwright'],
-        capture_output=True, timeout=30
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
     )
     if pkg_check.returncode != 0:
         return False
@@ -2827,7 +2952,7 @@ def check_playwright_installed() -> bool:
          '_ep = _pw.chromium.executable_path; '
          '_pw.stop(); '
          'assert _os.path.isfile(_ep), f"not found: {_ep}"'],
-        capture_output=True, text=True, timeout=30
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
     )
     return chromium_check.returncode == 0
 
@@ -2847,11 +2972,11 @@ def install_playwright(dry_run: bool = False) -> bool:
         lsf.write_output('Would install playwright package and chromium browser')
         return True
         
-    import subprocess
     playwright_install_ok = True
     
     # Check if package is importable first
-    pkg_check = subprocess.run(['python3', '-c', 'import playwright'], capture_output=True)
+    pkg_check = subprocess.run(['python3', '-c', 'import playwright'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     playwright_pkg_ok = (pkg_check.returncode == 0)
     
     # Step 1: pip install playwright
@@ -3029,8 +3154,6 @@ def import_ca_to_firefox_profile(ca_pem: str, profile_path: str,
     :param dry_run: If True, only show what would be done
     :return: True if import successful
     """
-    import tempfile
-    import subprocess
     
     if dry_run:
         lsf.write_output(f'Would import "{ca_name}" to Firefox profile: {profile_path}')
@@ -3053,7 +3176,9 @@ def import_ca_to_firefox_profile(ca_pem: str, profile_path: str,
             '-n', ca_name
         ]
         
-        result = subprocess.run(check_cmd, capture_output=True, text=True)
+        # Only the exit code matters for the existence check and delete
+        result = subprocess.run(check_cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL)
         if result.returncode == 0:
             # Certificate exists, delete it first to allow update
             lsf.write_output(f'Certificate "{ca_name}" already exists, updating...')
@@ -3062,7 +3187,8 @@ def import_ca_to_firefox_profile(ca_pem: str, profile_path: str,
                 '-d', f'sql:{profile_path}',
                 '-n', ca_name
             ]
-            subprocess.run(delete_cmd, capture_output=True)
+            subprocess.run(delete_cmd, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
         
         # Import the CA certificate
         # Trust flags: C,, = trusted CA for SSL/TLS, not for email or code signing
@@ -3075,13 +3201,15 @@ def import_ca_to_firefox_profile(ca_pem: str, profile_path: str,
         ]
         
         lsf.write_output(f'Importing CA to Firefox profile: {os.path.basename(profile_path)}')
-        result = subprocess.run(import_cmd, capture_output=True, text=True)
+        result = subprocess.run(import_cmd, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
         
         if result.returncode == 0:
             lsf.write_output(f'Successfully imported "{ca_name}" to Firefox')
             return True
         else:
-            lsf.write_output(f'ERROR: certutil failed: {result.stderr}')
+            stderr = result.stderr.decode(errors='replace')
+            lsf.write_output(f'ERROR: certutil failed: {stderr}')
             return False
             
     except Exception as e:
@@ -3343,7 +3471,6 @@ def _trust_vault_ca_on_nsx(hostname: str, password: str,
     :param dry_run: If True, preview only
     :return: True if successful
     """
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     if dry_run:
@@ -3412,7 +3539,6 @@ def _nsx_reregister_compute_managers(hostname: str, password: str,
     :param dry_run: If True, preview only
     :return: True if all compute managers were re-registered
     """
-    import urllib3, ssl, socket, hashlib
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     if dry_run:
@@ -3509,7 +3635,6 @@ def _trust_vault_ca_on_sddc_manager(hostname: str, password: str,
     :param dry_run: If True, preview only
     :return: True if successful
     """
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     if dry_run:
@@ -3671,8 +3796,6 @@ def _trust_vault_ca_on_auto(hostname: str, password: str,
     :param dry_run: If True, preview only
     :return: True if successful or already imported
     """
-    import base64
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     if dry_run:
@@ -3823,14 +3946,9 @@ def distribute_vault_ca_trust(ca_pem: str, password: str,
     # --- ESXi Hosts ---
     lsf.write_output('')
     lsf.write_output('--- ESXi Hosts ---')
-    if 'RESOURCES' in lsf.config and 'ESXiHosts' in lsf.config['RESOURCES']:
-        esx_entries = lsf.config.get('RESOURCES', 'ESXiHosts').split('\n')
-        for entry in esx_entries:
-            entry = entry.strip()
-            if not entry or entry.startswith('#'):
-                continue
-            parts = entry.split(':')
-            hostname = parts[0].strip()
+    esx_hosts = get_esx_hosts_from_config()
+    if esx_hosts:
+        for hostname in esx_hosts:
             total_count += 1
             if _trust_vault_ca_on_esxi(hostname, password, ca_pem, dry_run):
                 success_count += 1
@@ -4074,8 +4192,6 @@ def download_vcenter_ca_certificates(vcenter_hostname: str) -> Optional[list]:
     :param vcenter_hostname: vCenter FQDN
     :return: List of tuples (cert_name, cert_pem) or None on failure
     """
-    import zipfile
-    import io
     
     url = f"https://{vcenter_hostname}{VCENTER_CERTS_ENDPOINT}"
     lsf.write_output(f'Downloading CA certificates from: {url}')
@@ -4310,7 +4426,6 @@ def disable_sddc_auto_rotate(dry_run: bool = False) -> bool:
     :param dry_run: If True, preview what would be done
     :return: True if successful (or no auto-rotate policies found)
     """
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     sddc_managers = _get_sddc_managers()
@@ -4577,9 +4692,6 @@ def configure_vcf_fleet_password_policy(dry_run: bool = False) -> bool:
     :param dry_run: If True, preview only
     :return: True if successful
     """
-    import requests
-    import urllib3
-    from datetime import datetime, timedelta
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     
     lsf.write_output('')
@@ -4595,7 +4707,6 @@ def configure_vcf_fleet_password_policy(dry_run: bool = False) -> bool:
             for entry in urls_raw:
                 url = entry.split(',')[0].strip()
                 if 'ops-' in url and '.vcf.lab' in url:
-                    from urllib.parse import urlparse
                     parsed = urlparse(url)
                     ops_fqdns.append(parsed.hostname)
     except Exception:
@@ -4609,7 +4720,6 @@ def configure_vcf_fleet_password_policy(dry_run: bool = False) -> bool:
                     for entry in vcf_urls:
                         url = entry.split(',')[0].strip()
                         if 'ops-' in url:
-                            from urllib.parse import urlparse
                             parsed = urlparse(url)
                             ops_fqdns.append(parsed.hostname)
         except Exception:
@@ -4915,7 +5025,6 @@ def configure_vsp_proxy(dry_run: bool = False) -> bool:
     registry, holorouter IPs (e.g. 192.168.0.0/24, 10.0.0.0/8), and all lab DNS
     under .vcf.lab plus .site-a/.site-b site zones.
     """
-    import urllib3
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     PROXY_URL = lsf.LAB_PROXY_URL
@@ -5736,6 +5845,7 @@ Examples:
   python3 confighol.py --skip-vcshell     Skip vCenter shell configuration
   python3 confighol.py --skip-nsx         Skip NSX configuration
   python3 confighol.py --esx-only         Only configure ESXi hosts
+  python3 confighol.py --scrub-known-hosts  Also delete holuser known_hosts files
 
 Prerequisites:
   - Complete successful LabStartup reaching Ready state
@@ -5755,6 +5865,9 @@ NOTE: NSX Edge SSH is enabled automatically via Guest Operations.
                         help='Skip NSX configuration')
     parser.add_argument('--esx-only', action='store_true',
                         help='Only configure ESXi hosts')
+    parser.add_argument('--scrub-known-hosts', action='store_true',
+                        help='Also delete holuser known_hosts on Manager and LMC '
+                             '(not needed: SSH config ignores known_hosts)')
     parser.add_argument('--skip-proxy-config', action='store_true',
                         help='Skip Step 9: all proxy and NO_PROXY configuration '
                              '(vCenter OS, Supervisor CP, Supervisor API, VSP nodes). '
@@ -5827,7 +5940,7 @@ NOTE: NSX Edge SSH is enabled automatically via Guest Operations.
         sys.exit(1)
     
     # Setup SSH environment
-    setup_ssh_environment()
+    setup_ssh_environment(args.scrub_known_hosts)
     
     # Create authorized_keys file
     auth_keys_file = create_authorized_keys_file()
@@ -5840,9 +5953,7 @@ NOTE: NSX Edge SSH is enabled automatically via Guest Operations.
     if 'vCenters' in lsf.config['RESOURCES']:
         vcenters = lsf.config.get('RESOURCES', 'vCenters').split('\n')
     
-    esx_hosts = []
-    if 'ESXiHosts' in lsf.config['RESOURCES']:
-        esx_hosts = lsf.config.get('RESOURCES', 'ESXiHosts').split('\n')
+    esx_hosts = get_esx_hosts_from_config()
     
     # Connect to vCenters (needed for ESXi API access)
     if vcenters and not args.dry_run:
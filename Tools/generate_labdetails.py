@@ -11,28 +11,60 @@ Usage:
     python3 Tools/generate_labdetails.py
     python3 Tools/generate_labdetails.py --output /path/to/LABDETAILS.md
     python3 Tools/generate_labdetails.py --dry-run
+    python3 Tools/generate_labdetails.py --verbose
 """
 
+import io
+import glob
+import heapq
 import os
+import re
 import sys
 import json
+import time
+import pickle
 import socket
 import argparse
 import datetime
+import logging
+import threading
 import subprocess
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import attrgetter
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterator, Optional, Any, Callable, TextIO
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+log = logging.getLogger(__name__)
+
+# Use orjson for REST response parsing when available (optional, faster)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Use ijson to stream large SDDC Manager list responses when available (optional)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Try to import pyVmomi
 try:
     from pyVim import connect
@@ -40,7 +72,7 @@ try:
     PYVMOMI_AVAILABLE = True
 except ImportError:
     PYVMOMI_AVAILABLE = False
-    print("WARNING: pyVmomi not available. vCenter queries will be limited.")
+    log.warning("pyVmomi not available. vCenter queries will be limited.")
 
 #==============================================================================
 # CONFIGURATION
@@ -52,6 +84,54 @@ HOL_ROOT = f'{HOME}/hol'
 CONFIG_INI = '/tmp/config.ini'
 CREDS_FILE = f'{HOME}/creds.txt'
 DEFAULT_OUTPUT = f'{HOL_ROOT}/LABDETAILS.md'
+HOLODECK_DIR = f'{HOL_ROOT}/holodeck'
+
+# Collected LabEnvironment snapshot, reused while the lab config is unchanged.
+# Live state (power states, free space) drifts, so snapshots also expire.
+ENV_CACHE = '/tmp/labenv.pkl'
+ENV_CACHE_TTL = 15 * 60
+
+# [RESOURCES] URLS entry: "url[,expected text]" per line; '#' lines skipped
+_URL_RE = re.compile(r'^[ \t]*([^#,\s][^,\n]*)(?:,([^\n]*))?$', re.M)
+
+# NSX manager VIP name -> first manager node name (queried instead of the VIP)
+_NSX_NODE_MAP = {
+    'nsx-mgmt-a': 'nsx-mgmt-01a',
+    'nsx-wld01-a': 'nsx-wld01-01a',
+}
+_NSX_NODE_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _NSX_NODE_MAP)) + r')\b')
+
+# URL substring -> service name for the Web Interfaces table (first match wins)
+_URL_SERVICE_RULES = (
+    ('vc-mgmt', 'vCenter Management'),
+    ('vc-wld', 'vCenter Workload'),
+    ('sddcmanager', 'SDDC Manager'),
+    ('nsx', 'NSX Manager'),
+    ('ops-a', 'VCF Operations'),
+    ('auto-', 'VCF Automation'),
+    ('opslcm', 'VCF Operations Manager'),
+    ('vmware.com', 'VMware.com (Internet Test)'),
+)
+# Management VMs shown on the Network Architecture diagram (name substring match)
+_SHOW_MGMT_VMS_RE = re.compile('|'.join(map(re.escape, (
+    'sddcmanager-a', 'vc-mgmt-a', 'vc-wld01-a', 'nsx-mgmt-01a', 'nsx-wld01-01a',
+))))
+# Aria/VCF Operations appliances shown on the Complete Infrastructure Diagram
+_ARIA_VMS_RE = re.compile('|'.join(map(re.escape, ('auto', 'ops-a', 'opslcm', 'opslogs'))))
+
+# vSphere VirtualMachine.PowerState -> VM inventory table label
+_POWER_MAP = {'poweredOn': 'On', 'poweredOff': 'Off', 'suspended': 'Suspended'}
+
+# Services whose :5480 URL is the appliance management (VAMI) interface
+_VAMI_SERVICES = frozenset(('vCenter Management', 'vCenter Workload'))
+
+# Conservative lifetime for cached SDDC Manager access tokens (seconds)
+SDDC_TOKEN_TTL = 30 * 60
+
+# Characters that are not valid in Mermaid node/subgraph IDs -> '_'
+_ID_TRANS = str.maketrans({'-': '_', '.': '_', ' ': '_'})
+# VM, datastore, edge and DVS subgraph IDs only ever had '-' replaced
+_DASH_TRANS = str.maketrans({'-': '_'})
 
 # Mermaid color styles for different sections
 # Using CSS-style colors in Mermaid style definitions
@@ -66,11 +146,294 @@ MERMAID_STYLES = """
     classDef network fill:#7ec8d9,stroke:#0c5460,stroke-width:2px,color:#333
 """
 
+#==============================================================================
+# MARKDOWN TEMPLATES
+#==============================================================================
+
+# Closes a Mermaid block and the section that contains it
+_MERMAID_SECTION_END_MD = """```
+
+---
+
+"""
+
+# Fully static sections are written with a single buf.write(); sections that
+# only interpolate lab values are filled in with str.format_map()
+
+_HIGH_LEVEL_HEAD_MD = """    subgraph External["External Network"]
+        Internet[("Internet<br/>192.168.0.0/24")]
+    end
+
+    subgraph vPod["vPod Environment"]
+        subgraph CoreVMs["Core Infrastructure VMs<br/>10.1.10.128/25"]
+            Router["holorouter<br/>{router_ip}<br/>(DNS/DHCP/Proxy/FW)"]
+            Console["console<br/>{console_ip}<br/>(Linux Main Console)"]
+            Manager["manager<br/>{manager_ip}<br/>(Lab Startup/Automation)"]
+        end
+
+        subgraph VCF["VMware Cloud Foundation"]
+"""
+
+_HIGH_LEVEL_LINKS_MD = """        end
+    end
+
+    Internet --> Router
+    Router --> Console
+    Router --> Manager
+    Router --> VCF
+
+    class Router,Console,Manager coreVM
+    class External external
+"""
+
+_NETWORK_HEAD_MD = """    subgraph External["External/Internet"]
+        ExtNet["192.168.0.0/24"]
+    end
+
+    subgraph Router["holorouter ({router_ip})"]
+        FW["Firewall/NAT"]
+        DNS["DNS Server"]
+        Proxy["Squid Proxy :3128"]
+    end
+
+    subgraph Networks["Internal Networks"]
+        subgraph CoreNet["Core Network<br/>10.1.10.128/25"]
+            Console2["console<br/>{console_ip}"]
+            Manager2["manager<br/>{manager_ip}"]
+        end
+
+        subgraph MgmtNet["Management Network<br/>10.1.1.0/24"]
+            direction TB
+"""
+
+_NETWORK_TAIL_MD = """        end
+    end
+
+    ExtNet --> FW
+    FW --> CoreNet
+    FW --> MgmtNet
+
+    class Console2,Manager2 coreVM
+    class ExtNet external
+"""
+
+_CORE_INFRASTRUCTURE_MD = """## Core Infrastructure VMs
+
+```mermaid
+flowchart TB
+{styles}
+
+    subgraph Core["Core Infrastructure VMs (L1)"]
+        subgraph RouterVM["holorouter - {router_ip}"]
+            RouterSvc["Services:<br/>- DNS Server<br/>- DHCP Server<br/>- Squid Proxy (:3128)<br/>- Firewall/NAT<br/>- NTP Server"]
+        end
+
+        subgraph ConsoleVM["console - {console_ip}"]
+            ConsoleSvc["Services:<br/>- Linux Desktop (Ubuntu)<br/>- Firefox Browser<br/>- VNC (:5901)<br/>- RDP (:3389)<br/>- SSH (:22)"]
+        end
+
+        subgraph ManagerVM["manager - {manager_ip}"]
+            ManagerSvc["Services:<br/>- Lab Startup Scripts<br/>- NFS Export (/tmp/holorouter)<br/>- Python Automation<br/>- SSH (:22 via port 5480)"]
+        end
+    end
+
+    RouterVM --> ConsoleVM
+    RouterVM --> ManagerVM
+
+    class RouterVM,ConsoleVM,ManagerVM coreVM
+```
+
+---
+
+"""
+
+_NETWORK_SUBNETS_MD = """## Network Subnets Reference
+
+| Network | Subnet | Gateway | Purpose |
+| ------- | ------ | ------- | ------- |
+| Core/External | 10.1.10.128/25 | 10.1.10.129 | Console, Manager, Router |
+| Management | 10.1.1.0/24 | 10.1.1.1 | VCF Management Components |
+| vSAN | 10.1.2.0/24 | - | vSAN Traffic |
+| vMotion | 10.1.3.0/24 | - | vMotion Traffic |
+| TEP (Overlay) | 10.1.5.128/25 | 10.1.5.129 | NSX Transport Endpoint (GENEVE) |
+| External (Holodeck) | 192.168.0.0/24 | 192.168.0.1 | External/Internet Access |
+
+---
+
+"""
+
+_BOOT_SEQUENCE_MD = """## Lab Startup Boot Sequence
+
+```mermaid
+sequenceDiagram
+    participant Router as holorouter
+    participant Manager as manager
+    participant ESXi as ESXi Hosts
+    participant NSX as NSX Manager
+    participant Edges as NSX Edges
+    participant VC as vCenter
+    participant SDDC as SDDC Manager
+    participant Ops as VCF Operations Suite
+
+    Note over Router,Ops: Lab Startup Sequence (labstartup.py)
+
+    Router->>Router: Start DNS/DHCP/Proxy
+    Manager->>Manager: Initialize lsfunctions
+    Manager->>ESXi: Connect to ESXi hosts
+    ESXi->>ESXi: Exit Maintenance Mode
+
+    Manager->>Manager: Verify vSAN Datastore
+    Manager->>NSX: Power On NSX Manager(s)
+    Manager->>Edges: Power On NSX Edge VMs
+
+    Note over Edges: Wait 5 minutes for Edge boot
+
+    Manager->>VC: Power On vCenter(s)
+
+    Note over VC: Wait for vCenter API
+
+    Manager->>Manager: Connect to vCenters
+    Manager->>SDDC: Power On sddcmanager-a
+    Manager->>Ops: Power On VCF Operations Suite VMs
+
+    Manager->>Manager: Verify URLs
+    Manager->>Router: Signal Ready
+
+    Note over Router,Ops: Lab Ready!
+```
+
+---
+
+"""
+
+_CREDENTIALS_HEAD_MD = """## Credentials
+
+> **Note:** The lab password is stored in `/home/holuser/creds.txt`
+
+| System | Username | Password |
+| ------ | -------- | -------- |
+| vCenter (Management) | administrator@vsphere.local | See `/home/holuser/creds.txt` |
+"""
+
+_CREDENTIALS_TAIL_MD = """| SDDC Manager | administrator@vsphere.local | See `/home/holuser/creds.txt` |
+| NSX Manager | admin | See `/home/holuser/creds.txt` |
+| ESXi Hosts | root | See `/home/holuser/creds.txt` |
+| VCF Operations Suite | admin@local | See `/home/holuser/creds.txt` |
+| Linux VMs (holuser) | holuser | See `/home/holuser/creds.txt` |
+| Linux VMs (root) | root | See `/home/holuser/creds.txt` |
+
+---
+
+"""
+
+# Closes the complete-architecture diagram: links and class assignments
+_COMPLETE_DIAGRAM_TAIL_MD = """            end
+        end
+    end
+
+    Internet --> Router
+    Router --> Console
+    Router --> Manager
+    Manager --> L2
+
+    SDDC --> VCM
+    SDDC --> VCW
+    VCM --> MgmtHosts
+    VCM --> NSXM
+    VCW --> WldHosts
+    VCW --> NSXW
+
+    class Router,Console,Manager coreVM
+    class Internet external
+    class MgmtDomain,SDDC,VCM,NSXM,MgmtHosts mgmtDomain
+    class WldDomain,VCW,NSXW,WldHosts,SCP wldDomain
+    class VCFOps vcfops
+"""
+
+# Raw string: the shell snippets keep their backslashes; literal braces are doubled
+_QUICK_REFERENCE_MD = r'''## Quick Reference Commands
+
+### Lab Startup
+
+```bash
+# Full lab startup
+cd /home/holuser/hol && python3 labstartup.py
+
+# Check lab status
+cat /lmchol/startup_status.txt
+
+# View startup dashboard
+firefox /lmchol/home/holuser/startup-status.htm
+```
+
+### vCenter Connection (Python)
+
+```python
+from pyVim import connect
+
+# Read password from creds.txt
+with open('/home/holuser/creds.txt', 'r') as f:
+    password = f.read().strip()
+
+si = connect.SmartConnect(
+    host="{mgmt_vc}",
+    user="administrator@vsphere.local",
+    pwd=password,
+    disableSslCertValidation=True
+)
+```
+
+### SDDC Manager API
+
+```bash
+# Read password from creds.txt
+PASSWORD=$(cat /home/holuser/creds.txt)
+
+# Get access token
+TOKEN=$(curl -k -s -X POST "https://sddcmanager-a.site-a.vcf.lab/v1/tokens" \
+  -H "Content-Type: application/json" \
+  -d "{{\"username\": \"administrator@vsphere.local\", \"password\": \"$PASSWORD\"}}" \
+  | python3 -c "import sys,json; print(json.load(sys.stdin)['accessToken'])")
+
+# List domains
+curl -k -s "https://sddcmanager-a.site-a.vcf.lab/v1/domains" \
+  -H "Authorization: Bearer $TOKEN" | python3 -m json.tool
+```
+
+### NSX Manager API
+
+```bash
+# Read password from creds.txt
+PASSWORD=$(cat /home/holuser/creds.txt)
+
+# Get cluster status
+curl -k -s -u admin:$PASSWORD \
+  https://nsx-mgmt-01a.site-a.vcf.lab/api/v1/cluster/status | python3 -m json.tool
+```
+
+---
+
+'''
+
+_FOOTER_MD = """## Document Information
+
+| Property | Value |
+| -------- | ----- |
+| **Generated** | {generated} |
+| **Generated By** | `python3 Tools/generate_labdetails.py` |
+| **Lab Configuration** | `/tmp/config.ini` |
+| **Source INI** | `/home/holuser/hol/holodeck/{lab_sku}.ini` |
+| **Lab Startup Script** | `/home/holuser/hol/labstartup.py` |
+"""
+
 #==============================================================================
 # DATA CLASSES
 #==============================================================================
 
-@dataclass
+# Per-object records (one per VM/host/datastore/port group/edge) use
+# slots=True to drop the per-instance __dict__ on large inventories
+
+@dataclass(slots=True)
 class VMInfo:
     """Virtual Machine information"""
     name: str
@@ -81,7 +444,7 @@ class VMInfo:
     host: str = ""
     description: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class HostInfo:
     """ESXi Host information"""
     fqdn: str
@@ -106,7 +469,7 @@ class ClusterInfo:
     datastore_type: str = ""
     domain: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class DatastoreInfo:
     """Datastore information"""
     name: str
@@ -124,14 +487,14 @@ class DomainInfo:
     sso_domain: str = ""
     clusters: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class NetworkInfo:
     """Network/Portgroup information"""
     name: str
     dvs_name: str = ""
     vlan: str = ""
 
-@dataclass 
+@dataclass(slots=True)
 class NSXEdgeInfo:
     """NSX Edge information"""
     name: str
@@ -202,19 +565,113 @@ def test_ping(host: str, timeout: int = 2) -> bool:
     except Exception:
         return False
 
+# resolve_host cache: {hostname: (ip or "", monotonic expiry)}. Failures are
+# cached too so a misconfigured name only costs one resolver timeout per TTL.
+RESOLVE_CACHE_TTL = 900
+RESOLVE_CACHE_MAX = 256
+_resolve_cache: Dict[str, tuple] = {}
+_resolve_lock = threading.Lock()
+
 def resolve_host(hostname: str) -> str:
-    """Resolve hostname to IP address"""
+    """Resolve hostname to IP address (positive and negative results cached)"""
+    now = time.monotonic()
+    with _resolve_lock:
+        cached = _resolve_cache.get(hostname)
+    if cached and now < cached[1]:
+        return cached[0]
+    
+    try:
+        ip = socket.gethostbyname(hostname)
+    except Exception:
+        ip = ""
+    
+    with _resolve_lock:
+        _resolve_cache.pop(hostname, None)
+        if len(_resolve_cache) >= RESOLVE_CACHE_MAX:
+            # Drop the oldest entry (dicts keep insertion order)
+            _resolve_cache.pop(next(iter(_resolve_cache)))
+        _resolve_cache[hostname] = (ip, now + RESOLVE_CACHE_TTL)
+    return ip
+
+@lru_cache(maxsize=1)
+def get_dns_domain() -> str:
+    """Return the first search domain from /etc/resolv.conf (read once)"""
     try:
-        return socket.gethostbyname(hostname)
+        with open('/etc/resolv.conf', 'r') as f:
+            for line in f:
+                if line.startswith('search'):
+                    domains = line.split()[1:]
+                    return domains[0] if domains else ""
     except Exception:
-        return ""
+        return "site-a.vcf.lab"
+    return ""
+
+@lru_cache(maxsize=1)
+def get_primary_ip() -> str:
+    """
+    Return this machine's primary IPv4 address without forking `hostname -I`.
+    
+    Connecting a UDP socket sends no packets; it only selects the source
+    address the kernel would route lab traffic from.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(('10.1.10.129', 53))
+            return sock.getsockname()[0]
+    except OSError:
+        return "10.1.10.131"
+
+@contextmanager
+def container_view(content, vim_types: list):
+    """ContainerView over the whole inventory that is always Destroy()ed"""
+    view = content.viewManager.CreateContainerView(content.rootFolder, vim_types, True)
+    try:
+        yield view
+    finally:
+        view.Destroy()
+
+def retrieve_properties(content, type_paths: Dict[Any, List[str]]) -> Dict[Any, List[tuple]]:
+    """
+    Fetch selected properties for every object of several types with one
+    shared ContainerView and a single PropertyCollector call, instead of
+    one inventory walk per type and one SOAP round-trip per attribute.
+    
+    :param content: ServiceInstance content
+    :param type_paths: {vim_type: [property paths]}, e.g.
+                       {vim.VirtualMachine: ['name', 'runtime.powerState']}
+    :return: {vim_type: [(managed_object, {path: value}), ...]}
+    """
+    results = {vim_type: [] for vim_type in type_paths}
+    
+    with container_view(content, list(type_paths)) as view:
+        traversal = vim.PropertyCollector.TraversalSpec(
+            name='traverseView', path='view', skip=False, type=vim.view.ContainerView
+        )
+        filter_spec = vim.PropertyCollector.FilterSpec(
+            objectSet=[vim.PropertyCollector.ObjectSpec(
+                obj=view, skip=True, selectSet=[traversal]
+            )],
+            propSet=[
+                vim.PropertyCollector.PropertySpec(type=vim_type, pathSet=paths, all=False)
+                for vim_type, paths in type_paths.items()
+            ]
+        )
+        contents = content.propertyCollector.RetrieveContents([filter_spec]) or []
+    
+    for oc in contents:
+        for vim_type in type_paths:
+            if isinstance(oc.obj, vim_type):
+                results[vim_type].append((oc.obj, {prop.name: prop.val for prop in oc.propSet}))
+                break
+    
+    return results
 
 def safe_api_call(func, *args, **kwargs) -> Optional[Any]:
     """Safely execute an API call and return None on failure"""
     try:
         return func(*args, **kwargs)
     except Exception as e:
-        print(f"  API call failed: {e}")
+        log.warning("  API call failed: %s", e)
         return None
 
 #==============================================================================
@@ -231,37 +688,57 @@ class LabDataCollector:
         self.env = LabEnvironment()
         self.vcenter_connections = {}
         
-    def collect_all(self) -> LabEnvironment:
-        """Collect all lab environment data"""
-        print("Starting lab data collection...")
+        # Sources that could not be queried; a run with any is not cached
+        self.errors: List[str] = []
         
-        # Load config
-        self._load_config()
+        # Shared keep-alive session for all SDDC Manager / NSX REST calls
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
         
-        # Collect core infrastructure info
-        self._collect_core_info()
+        # SDDC Manager access tokens: {host: (token, monotonic expiry)}
+        self._token_cache: Dict[str, tuple] = {}
         
-        # Collect from SDDC Manager
-        self._collect_sddc_info()
+    def collect_all(self) -> LabEnvironment:
+        """
+        Collect all lab environment data.
         
-        # Collect from vCenters
-        self._collect_vcenter_info()
+        Independent phases overlap: core info runs alongside SDDC Manager
+        collection, then vCenter and NSX collection (which both need the
+        SDDC domain list) run alongside each other. Each phase writes
+        disjoint LabEnvironment fields.
+        """
+        log.info("Starting lab data collection...")
         
-        # Collect NSX info
-        self._collect_nsx_info()
+        # Load config
+        self._load_config()
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Collect core infrastructure info and SDDC Manager inventory
+            core = executor.submit(self._collect_core_info)
+            self._collect_sddc_info()
+            core.result()
+            
+            # Collect from vCenters and NSX
+            nsx = executor.submit(self._collect_nsx_info)
+            self._collect_vcenter_info()
+            nsx.result()
         
         # Disconnect vCenters
         self._disconnect_vcenters()
         
-        print("Data collection complete.")
+        log.info("Data collection complete.")
         return self.env
     
     def _load_config(self):
         """Load configuration from config.ini"""
-        print("Loading configuration...")
+        log.info("Loading configuration...")
         
         if not os.path.isfile(self.config_path):
-            print(f"  Config file not found: {self.config_path}")
+            log.warning("  Config file not found: %s", self.config_path)
             return
         
         self.config.read(self.config_path)
@@ -274,34 +751,20 @@ class LabDataCollector:
             self.env.lab_type = self.config.get('VPOD', 'labtype').upper()
         
         # Get DNS domain from resolv.conf
-        try:
-            with open('/etc/resolv.conf', 'r') as f:
-                for line in f:
-                    if line.startswith('search'):
-                        domains = line.split()[1:]
-                        if domains:
-                            self.env.dns_domain = domains[0]
-                        break
-        except Exception:
-            self.env.dns_domain = "site-a.vcf.lab"
+        self.env.dns_domain = get_dns_domain()
         
         # Collect URLs from config
         if self.config.has_option('RESOURCES', 'URLS'):
             urls_raw = self.config.get('RESOURCES', 'URLS')
-            for line in urls_raw.strip().split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split(',', 1)
-                    url = parts[0].strip()
-                    text = parts[1].strip() if len(parts) > 1 else ""
-                    self.env.urls.append((url, text))
+            for m in _URL_RE.finditer(urls_raw):
+                self.env.urls.append((m.group(1).strip(), (m.group(2) or '').strip()))
         
-        print(f"  Lab SKU: {self.env.lab_sku}")
-        print(f"  Lab Type: {self.env.lab_type}")
+        log.info("  Lab SKU: %s", self.env.lab_sku)
+        log.info("  Lab Type: %s", self.env.lab_type)
     
     def _collect_core_info(self):
         """Collect core infrastructure information"""
-        print("Collecting core infrastructure info...")
+        log.info("Collecting core infrastructure info...")
         
         # Router
         router_ip = resolve_host('router')
@@ -318,27 +781,23 @@ class LabDataCollector:
             self.env.console_ip = "10.1.10.130"
         
         # Manager (this machine)
-        try:
-            result = subprocess.run(['hostname', '-I'], capture_output=True, text=True)
-            if result.returncode == 0:
-                self.env.manager_ip = result.stdout.strip().split()[0]
-        except Exception:
-            self.env.manager_ip = "10.1.10.131"
+        self.env.manager_ip = get_primary_ip()
         
-        print(f"  Router: {self.env.router_ip}")
-        print(f"  Console: {self.env.console_ip}")
-        print(f"  Manager: {self.env.manager_ip}")
+        log.info("  Router: %s", self.env.router_ip)
+        log.info("  Console: %s", self.env.console_ip)
+        log.info("  Manager: %s", self.env.manager_ip)
     
     def _collect_sddc_info(self):
         """Collect information from SDDC Manager"""
-        print("Collecting SDDC Manager info...")
+        log.info("Collecting SDDC Manager info...")
         
         sddc_host = "sddcmanager-a.site-a.vcf.lab"
         
         # Get access token
         token = self._get_sddc_token(sddc_host)
         if not token:
-            print("  Could not authenticate to SDDC Manager")
+            log.warning("  Could not authenticate to SDDC Manager")
+            self.errors.append(f"{sddc_host}: authentication failed")
             return
         
         headers = {
@@ -346,115 +805,195 @@ class LabDataCollector:
             'Content-Type': 'application/json'
         }
         
+        # Fetch domains, clusters and hosts concurrently. Each worker reads
+        # and parses its whole response, so the three downloads overlap;
+        # results are merged in order below since clusters depend on domains
+        base_url = f'https://{sddc_host}/v1'
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            domains = executor.submit(
+                self._fetch_elements, f'{base_url}/domains', headers, self._parse_domain
+            )
+            clusters = executor.submit(
+                self._fetch_elements, f'{base_url}/clusters', headers, self._parse_cluster
+            )
+            hosts = executor.submit(self._fetch_hosts, f'{base_url}/hosts', headers)
+        
         # Get domains
         try:
-            resp = requests.get(
-                f'https://{sddc_host}/v1/domains',
-                headers=headers,
-                verify=False,
-                timeout=30
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                for elem in data.get('elements', []):
-                    domain = DomainInfo(
-                        name=elem.get('name', ''),
-                        domain_type=elem.get('type', ''),
-                        sso_domain=elem.get('ssoName', '')
-                    )
-                    
-                    # Get vCenter
-                    vcenters = elem.get('vcenters', [])
-                    if vcenters:
-                        domain.vcenter_fqdn = vcenters[0].get('fqdn', '')
-                    
-                    # Get NSX
-                    nsx = elem.get('nsxtCluster', {})
-                    if nsx:
-                        domain.nsx_fqdn = nsx.get('vipFqdn', '')
-                    
-                    # Get clusters
-                    for cl in elem.get('clusters', []):
-                        domain.clusters.append(cl.get('id', ''))
-                    
-                    self.env.domains.append(domain)
-                    print(f"  Found domain: {domain.name} ({domain.domain_type})")
+            for domain in domains.result():
+                self.env.domains.append(domain)
+                log.debug("  Found domain: %s (%s)", domain.name, domain.domain_type)
         except Exception as e:
-            print(f"  Error getting domains: {e}")
+            log.warning("  Error getting domains: %s", e)
+            self.errors.append(f"{sddc_host} domains: {e}")
+        
+        # Map SDDC cluster IDs to their owning domain
+        cluster_id_to_domain = {
+            cluster_id: domain.name
+            for domain in self.env.domains
+            for cluster_id in domain.clusters
+        }
         
         # Get clusters
         try:
-            resp = requests.get(
-                f'https://{sddc_host}/v1/clusters',
-                headers=headers,
-                verify=False,
-                timeout=30
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                for elem in data.get('elements', []):
-                    cluster = ClusterInfo(
-                        name=elem.get('name', ''),
-                        host_count=len(elem.get('hosts', [])),
-                        datastore=elem.get('primaryDatastoreName', ''),
-                        datastore_type=elem.get('primaryDatastoreType', '')
-                    )
-                    
-                    # Find domain for this cluster
-                    for domain in self.env.domains:
-                        if elem.get('domain', {}).get('id') in str(domain.clusters):
-                            cluster.domain = domain.name
-                            break
-                    
-                    self.env.clusters.append(cluster)
-                    print(f"  Found cluster: {cluster.name}")
+            for cluster_id, cluster in clusters.result():
+                # Find domain for this cluster
+                cluster.domain = cluster_id_to_domain.get(cluster_id, '')
+                
+                self.env.clusters.append(cluster)
+                log.debug("  Found cluster: %s", cluster.name)
         except Exception as e:
-            print(f"  Error getting clusters: {e}")
+            log.warning("  Error getting clusters: %s", e)
+            self.errors.append(f"{sddc_host} clusters: {e}")
         
         # Get hosts
         try:
-            resp = requests.get(
-                f'https://{sddc_host}/v1/hosts',
-                headers=headers,
-                verify=False,
-                timeout=30
-            )
-            if resp.status_code == 200:
-                data = resp.json()
-                for elem in data.get('elements', []):
-                    host = HostInfo(
-                        fqdn=elem.get('fqdn', ''),
-                        state=elem.get('status', ''),
-                        power_state='poweredOn',
-                        cpu_cores=elem.get('cpu', {}).get('cores', 0),
-                        memory_gb=elem.get('memory', {}).get('totalCapacityMB', 0) / 1024
-                    )
-                    
-                    # Get ESXi version
-                    if not self.env.esxi_version and elem.get('esxiVersion'):
-                        self.env.esxi_version = elem.get('esxiVersion')
-                    
-                    # Get IP addresses
-                    for ip_info in elem.get('ipAddresses', []):
-                        ip_type = ip_info.get('type', '')
-                        ip_addr = ip_info.get('ipAddress', '')
-                        if ip_type == 'VSAN':
-                            host.vsan_ip = ip_addr
-                        elif ip_type == 'VMOTION':
-                            host.vmotion_ip = ip_addr
-                    
-                    # Get management IP from FQDN
-                    host.mgmt_ip = resolve_host(host.fqdn)
-                    
-                    self.env.hosts.append(host)
-                    print(f"  Found host: {host.fqdn}")
+            for host in hosts.result():
+                self.env.hosts.append(host)
+                log.debug("  Found host: %s", host.fqdn)
         except Exception as e:
-            print(f"  Error getting hosts: {e}")
+            log.warning("  Error getting hosts: %s", e)
+            self.errors.append(f"{sddc_host} hosts: {e}")
+        
+        log.info("  Found %d domains, %d clusters, %d hosts",
+                 len(self.env.domains), len(self.env.clusters), len(self.env.hosts))
+    
+    def _parse_domain(self, elem: Dict[str, Any]) -> DomainInfo:
+        """Build a DomainInfo from one SDDC Manager /v1/domains element"""
+        domain = DomainInfo(
+            name=elem.get('name', ''),
+            domain_type=elem.get('type', ''),
+            sso_domain=elem.get('ssoName', '')
+        )
+        
+        # Get vCenter
+        vcenters = elem.get('vcenters', [])
+        if vcenters:
+            domain.vcenter_fqdn = vcenters[0].get('fqdn', '')
+        
+        # Get NSX
+        nsx = elem.get('nsxtCluster', {})
+        if nsx:
+            domain.nsx_fqdn = nsx.get('vipFqdn', '')
+        
+        # Get clusters
+        for cl in elem.get('clusters', []):
+            domain.clusters.append(cl.get('id', ''))
+        
+        return domain
+    
+    def _parse_cluster(self, elem: Dict[str, Any]) -> tuple:
+        """
+        Build a ClusterInfo from one SDDC Manager /v1/clusters element.
+        
+        :return: (SDDC cluster ID, ClusterInfo); the owning domain is
+                 filled in once the domain list is known
+        """
+        return elem.get('id', ''), ClusterInfo(
+            name=elem.get('name', ''),
+            host_count=len(elem.get('hosts', [])),
+            datastore=elem.get('primaryDatastoreName', ''),
+            datastore_type=elem.get('primaryDatastoreType', '')
+        )
+    
+    def _parse_host(self, elem: Dict[str, Any]) -> HostInfo:
+        """Build a HostInfo from one SDDC Manager /v1/hosts element"""
+        host = HostInfo(
+            fqdn=elem.get('fqdn', ''),
+            state=elem.get('status', ''),
+            power_state='poweredOn',
+            cpu_cores=elem.get('cpu', {}).get('cores', 0),
+            memory_gb=elem.get('memory', {}).get('totalCapacityMB', 0) / 1024
+        )
+        
+        # Get ESXi version
+        if not self.env.esxi_version and elem.get('esxiVersion'):
+            self.env.esxi_version = elem.get('esxiVersion')
+        
+        # Get IP addresses
+        for ip_info in elem.get('ipAddresses', []):
+            ip_type = ip_info.get('type', '')
+            ip_addr = ip_info.get('ipAddress', '')
+            if ip_type == 'VSAN':
+                host.vsan_ip = ip_addr
+            elif ip_type == 'VMOTION':
+                host.vmotion_ip = ip_addr
+        
+        return host
+    
+    @contextmanager
+    def _sddc_elements(self, url: str, headers: Dict[str, str]) -> Iterator[Iterator[Dict[str, Any]]]:
+        """
+        GET an SDDC Manager list endpoint and yield an iterator over its
+        'elements' (empty, with the failure recorded, if the status is not
+        200). With ijson installed
+        the body is parsed incrementally while iterating, so peak memory
+        stays at one element. The response is closed on leaving the block,
+        whether or not the iterator was exhausted.
+        """
+        if not IJSON_AVAILABLE:
+            data = self._get_json(url, headers)
+            yield iter(data.get('elements', []) if data is not None else [])
+            return
+        
+        resp = self.http.get(url, headers=headers, verify=False, timeout=30, stream=True)
+        try:
+            if resp.status_code != 200:
+                self._http_error(url, resp.status_code)
+                yield iter([])
+            else:
+                resp.raw.decode_content = True
+                yield ijson.items(resp.raw, 'elements.item', use_float=True)
+        finally:
+            resp.close()
+    
+    def _fetch_elements(self, url: str, headers: Dict[str, str],
+                        parse: Callable[[Dict[str, Any]], Any]) -> List[Any]:
+        """Read an SDDC Manager list endpoint and return parse() of each element"""
+        with self._sddc_elements(url, headers) as elements:
+            return [parse(elem) for elem in elements]
+    
+    def _fetch_hosts(self, url: str, headers: Dict[str, str]) -> List[HostInfo]:
+        """Read SDDC Manager /v1/hosts, resolving management IPs as hosts stream in"""
+        pending = []
+        with ThreadPoolExecutor(max_workers=16) as resolver, \
+                self._sddc_elements(url, headers) as elements:
+            for elem in elements:
+                pending.append((self._parse_host(elem), resolver.submit(
+                    resolve_host, elem.get('fqdn', '')
+                )))
+        
+        hosts = []
+        for host, mgmt_ip in pending:
+            host.mgmt_ip = mgmt_ip.result()
+            hosts.append(host)
+        return hosts
+    
+    def _get_json(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        GET a URL on the shared session; return parsed JSON, or None (with
+        the failure recorded) if the status is not 200
+        """
+        resp = self.http.get(url, headers=headers, verify=False, timeout=30, **kwargs)
+        if resp.status_code == 200:
+            return json_loads(resp.content)
+        self._http_error(url, resp.status_code)
+        return None
+    
+    def _http_error(self, url: str, status_code: int):
+        """Record a non-200 reply, so the partial result is not cached"""
+        log.warning("  %s returned HTTP %s", url, status_code)
+        self.errors.append(f"{url}: HTTP {status_code}")
     
     def _get_sddc_token(self, host: str) -> Optional[str]:
-        """Get SDDC Manager access token"""
+        """Get SDDC Manager access token (reused until shortly before expiry)"""
+        cached = self._token_cache.get(host)
+        if cached and time.monotonic() < cached[1] - 60:
+            return cached[0]
+        
         try:
-            resp = requests.post(
+            resp = self.http.post(
                 f'https://{host}/v1/tokens',
                 json={
                     'username': 'administrator@vsphere.local',
@@ -464,99 +1003,149 @@ class LabDataCollector:
                 timeout=30
             )
             if resp.status_code == 200:
-                return resp.json().get('accessToken')
+                token = json_loads(resp.content).get('accessToken')
+                if token:
+                    self._token_cache[host] = (token, time.monotonic() + SDDC_TOKEN_TTL)
+                return token
         except Exception as e:
-            print(f"  Token request failed: {e}")
+            log.warning("  Token request failed: %s", e)
         return None
     
     def _collect_vcenter_info(self):
         """Collect information from vCenter servers"""
         if not PYVMOMI_AVAILABLE:
-            print("pyVmomi not available, skipping vCenter collection")
+            log.warning("pyVmomi not available, skipping vCenter collection")
             return
         
-        print("Collecting vCenter info...")
+        log.info("Collecting vCenter info...")
         
-        # Connect to each domain's vCenter
-        for domain in self.env.domains:
-            if not domain.vcenter_fqdn:
-                continue
-            
-            print(f"  Connecting to {domain.vcenter_fqdn}...")
-            
-            # Determine user based on SSO domain
-            if domain.sso_domain == 'vsphere.local':
-                user = 'administrator@vsphere.local'
-            else:
-                user = f'administrator@{domain.sso_domain}'
-            
-            si = self._connect_vcenter(domain.vcenter_fqdn, user)
-            if not si:
+        domains = [d for d in self.env.domains if d.vcenter_fqdn]
+        if not domains:
+            return
+        
+        # Query each domain's vCenter concurrently; workers return plain
+        # results and all self.env updates happen here, in domain order
+        with ThreadPoolExecutor(max_workers=min(8, len(domains))) as executor:
+            results = list(executor.map(self._collect_one_vcenter, domains))
+        
+        seen_datastores = {d.name for d in self.env.datastores}
+        clusters_by_name = {cl.name: cl for cl in self.env.clusters}
+        
+        for domain, result in zip(domains, results):
+            if result is None:
+                self.errors.append(f"{domain.vcenter_fqdn}: connection failed")
                 continue
-            
+            si, vms, datastores, networks, cluster_stats = result
             self.vcenter_connections[domain.vcenter_fqdn] = si
-            content = si.RetrieveContent()
             
             # Get VMs
             vms_list = self.env.mgmt_vms if domain.domain_type == 'MANAGEMENT' else self.env.wld_vms
+            vms_list.extend(vms)
             
-            container = content.viewManager.CreateContainerView(
-                content.rootFolder, [vim.VirtualMachine], True
-            )
-            for vm in container.view:
-                vm_info = VMInfo(
-                    name=vm.name,
-                    power_state=str(vm.runtime.powerState),
-                    vcpus=vm.summary.config.numCpu if hasattr(vm.summary.config, 'numCpu') else 0,
-                    memory_mb=vm.summary.config.memorySizeMB if hasattr(vm.summary.config, 'memorySizeMB') else 0,
-                    ip_address=vm.guest.ipAddress if vm.guest and vm.guest.ipAddress else ""
-                )
-                vms_list.append(vm_info)
-            container.Destroy()
-            
-            print(f"    Found {len(vms_list)} VMs")
-            
-            # Get Datastores
-            container = content.viewManager.CreateContainerView(
-                content.rootFolder, [vim.Datastore], True
-            )
-            for ds in container.view:
-                # Avoid duplicates
-                if not any(d.name == ds.name for d in self.env.datastores):
-                    ds_info = DatastoreInfo(
-                        name=ds.name,
-                        ds_type=ds.summary.type,
-                        capacity_gb=ds.summary.capacity / (1024**3),
-                        free_gb=ds.summary.freeSpace / (1024**3)
-                    )
+            # Get Datastores (avoid duplicates)
+            for ds_info in datastores:
+                if ds_info.name not in seen_datastores:
+                    seen_datastores.add(ds_info.name)
                     self.env.datastores.append(ds_info)
-            container.Destroy()
             
             # Get Networks/Port Groups
             networks_list = self.env.mgmt_networks if domain.domain_type == 'MANAGEMENT' else self.env.wld_networks
-            
-            container = content.viewManager.CreateContainerView(
-                content.rootFolder, [vim.dvs.DistributedVirtualPortgroup], True
-            )
-            for pg in container.view:
-                net_info = NetworkInfo(
-                    name=pg.name,
-                    dvs_name=pg.config.distributedVirtualSwitch.name if pg.config.distributedVirtualSwitch else ""
-                )
-                networks_list.append(net_info)
-            container.Destroy()
+            networks_list.extend(networks)
             
             # Update cluster info with vCenter data
-            container = content.viewManager.CreateContainerView(
-                content.rootFolder, [vim.ClusterComputeResource], True
-            )
-            for cluster in container.view:
-                for cl_info in self.env.clusters:
-                    if cl_info.name == cluster.name:
-                        cl_info.total_cpu_mhz = cluster.summary.totalCpu
-                        cl_info.total_memory_gb = cluster.summary.totalMemory / (1024**3)
-                        cl_info.domain = domain.name
-            container.Destroy()
+            for name, total_cpu_mhz, total_memory_gb in cluster_stats:
+                cl_info = clusters_by_name.get(name)
+                if cl_info:
+                    cl_info.total_cpu_mhz = total_cpu_mhz
+                    cl_info.total_memory_gb = total_memory_gb
+                    cl_info.domain = domain.name
+    
+    def _collect_one_vcenter(self, domain: DomainInfo) -> Optional[tuple]:
+        """
+        Collect VMs, datastores, port groups and cluster totals from one
+        domain's vCenter. Runs in a worker thread, so it only returns data.
+        
+        :return: (si, vms, datastores, networks, cluster_stats) or None
+        """
+        log.info("  Connecting to %s...", domain.vcenter_fqdn)
+        
+        # Determine user based on SSO domain
+        if domain.sso_domain == 'vsphere.local':
+            user = 'administrator@vsphere.local'
+        else:
+            user = f'administrator@{domain.sso_domain}'
+        
+        si = self._connect_vcenter(domain.vcenter_fqdn, user)
+        if not si:
+            return None
+        
+        content = si.RetrieveContent()
+        
+        # One inventory walk for every object type we report on
+        inventory = retrieve_properties(content, {
+            vim.VirtualMachine: [
+                'name', 'runtime.powerState', 'summary.config.numCpu',
+                'summary.config.memorySizeMB', 'guest.ipAddress'
+            ],
+            vim.Datastore: [
+                'name', 'summary.type', 'summary.capacity', 'summary.freeSpace'
+            ],
+            vim.dvs.DistributedVirtualPortgroup: [
+                'name', 'config.distributedVirtualSwitch'
+            ],
+            vim.DistributedVirtualSwitch: ['name'],
+            vim.ClusterComputeResource: [
+                'name', 'summary.totalCpu', 'summary.totalMemory'
+            ],
+        })
+        
+        # Get VMs
+        vms = []
+        for _, props in inventory[vim.VirtualMachine]:
+            vms.append(VMInfo(
+                name=props.get('name', ''),
+                # VMODL enums are str subclasses holding the short name
+                power_state=props.get('runtime.powerState') or '',
+                vcpus=props.get('summary.config.numCpu') or 0,
+                memory_mb=props.get('summary.config.memorySizeMB') or 0,
+                ip_address=props.get('guest.ipAddress') or ""
+            ))
+        
+        log.info("    %s: Found %d VMs", domain.vcenter_fqdn, len(vms))
+        
+        # Get Datastores
+        datastores = []
+        for _, props in inventory[vim.Datastore]:
+            datastores.append(DatastoreInfo(
+                name=props.get('name', ''),
+                ds_type=props.get('summary.type', ''),
+                capacity_gb=props.get('summary.capacity', 0) / (1024**3),
+                free_gb=props.get('summary.freeSpace', 0) / (1024**3)
+            ))
+        
+        # Get Networks/Port Groups (switch names resolved from one DVS query)
+        dvs_names = {
+            dvs: props.get('name', '')
+            for dvs, props in inventory[vim.DistributedVirtualSwitch]
+        }
+        networks = []
+        for _, props in inventory[vim.dvs.DistributedVirtualPortgroup]:
+            dvs = props.get('config.distributedVirtualSwitch')
+            networks.append(NetworkInfo(
+                name=props.get('name', ''),
+                dvs_name=dvs_names.get(dvs, "") if dvs else ""
+            ))
+        
+        # Get cluster totals
+        cluster_stats = []
+        for _, props in inventory[vim.ClusterComputeResource]:
+            cluster_stats.append((
+                props.get('name', ''),
+                props.get('summary.totalCpu', 0),
+                props.get('summary.totalMemory', 0) / (1024**3)
+            ))
+        
+        return si, vms, datastores, networks, cluster_stats
     
     def _connect_vcenter(self, host: str, user: str) -> Optional[Any]:
         """Connect to a vCenter server"""
@@ -578,7 +1167,7 @@ class LabDataCollector:
                 )
             return si
         except Exception as e:
-            print(f"    Connection failed: {e}")
+            log.warning("    Connection to %s failed: %s", host, e)
             return None
     
     def _disconnect_vcenters(self):
@@ -591,64 +1180,105 @@ class LabDataCollector:
     
     def _collect_nsx_info(self):
         """Collect NSX Edge information"""
-        print("Collecting NSX info...")
+        log.info("Collecting NSX info...")
         
+        # One query per distinct NSX manager; domains sharing a manager
+        # would otherwise return (and list) the same edges twice
+        managers = {}
         for domain in self.env.domains:
-            if not domain.nsx_fqdn:
-                continue
-            
-            # Get the NSX manager node (not VIP)
-            nsx_node = domain.nsx_fqdn.replace('nsx-mgmt-a', 'nsx-mgmt-01a').replace('nsx-wld01-a', 'nsx-wld01-01a')
-            
-            print(f"  Querying {nsx_node}...")
+            if domain.nsx_fqdn and domain.nsx_fqdn not in managers:
+                managers[domain.nsx_fqdn] = domain
+        if not managers:
+            return
+        domains = list(managers.values())
+        
+        # Query each domain's NSX manager concurrently; merge in domain order
+        with ThreadPoolExecutor(max_workers=min(8, len(domains))) as executor:
+            for edges in executor.map(self._query_nsx, domains):
+                self.env.nsx_edges.extend(edges)
+        
+        log.info("  Found %d NSX edges", len(self.env.nsx_edges))
+    
+    def _query_nsx(self, domain: DomainInfo) -> List[NSXEdgeInfo]:
+        """Query one domain's NSX manager for its Edge transport nodes"""
+        edges = []
+        
+        # Get the NSX manager node (not VIP)
+        nsx_node = _NSX_NODE_RE.sub(lambda m: _NSX_NODE_MAP[m.group(0)], domain.nsx_fqdn)
+        
+        log.info("  Querying %s...", nsx_node)
+        
+        try:
+            data = self._get_json(
+                f'https://{nsx_node}/api/v1/transport-nodes?node_types=EdgeNode',
+                auth=('admin', self.password)
+            )
             
-            try:
-                resp = requests.get(
-                    f'https://{nsx_node}/api/v1/transport-nodes?node_types=EdgeNode',
-                    auth=('admin', self.password),
-                    verify=False,
-                    timeout=30
-                )
-                
-                if resp.status_code == 200:
-                    data = resp.json()
-                    for elem in data.get('results', []):
-                        node_info = elem.get('node_deployment_info', {})
-                        
-                        edge = NSXEdgeInfo(
-                            name=node_info.get('display_name', elem.get('display_name', '')),
-                            cluster=domain.name
-                        )
-                        
-                        # Get management IP
-                        ip_list = node_info.get('ip_addresses', [])
-                        if ip_list:
-                            edge.mgmt_ip = ip_list[0]
-                        
-                        # Get TEP IPs
-                        host_switches = elem.get('host_switch_spec', {}).get('host_switches', [])
-                        for hs in host_switches:
-                            ip_spec = hs.get('ip_assignment_spec', {})
-                            edge.tep_ips = ip_spec.get('ip_list', [])
-                        
-                        self.env.nsx_edges.append(edge)
-                        print(f"    Found edge: {edge.name}")
-            except Exception as e:
-                print(f"    Error querying NSX: {e}")
+            if data is not None:
+                for elem in data.get('results', []):
+                    node_info = elem.get('node_deployment_info', {})
+                    
+                    edge = NSXEdgeInfo(
+                        name=node_info.get('display_name', elem.get('display_name', '')),
+                        cluster=domain.name
+                    )
+                    
+                    # Get management IP
+                    ip_list = node_info.get('ip_addresses', [])
+                    if ip_list:
+                        edge.mgmt_ip = ip_list[0]
+                    
+                    # Get TEP IPs
+                    host_switches = elem.get('host_switch_spec', {}).get('host_switches', [])
+                    for hs in host_switches:
+                        ip_spec = hs.get('ip_assignment_spec', {})
+                        edge.tep_ips = ip_spec.get('ip_list', [])
+                    
+                    edges.append(edge)
+                    log.debug("    Found edge: %s", edge.name)
+        except Exception as e:
+            log.warning("    Error querying NSX %s: %s", nsx_node, e)
+            self.errors.append(f"{nsx_node}: {e}")
+        
+        return edges
 
 #==============================================================================
 # MARKDOWN GENERATOR
 #==============================================================================
 
+@lru_cache(maxsize=256)
+def url_service_name(url: str) -> str:
+    """Classify a lab URL into the service name shown in LABDETAILS.md"""
+    for substring, service in _URL_SERVICE_RULES:
+        if substring in url:
+            if '5480' in url and service in _VAMI_SERVICES:
+                return f"{service} VAMI"
+            return service
+    return "Web Service"
+
 class LabDetailsGenerator:
     """Generates LABDETAILS.md from collected environment data"""
     
-    def __init__(self, env: LabEnvironment):
+    def __init__(self, env: LabEnvironment, out: Optional[TextIO] = None):
         self.env = env
-        self.lines = []
+        # Write straight to the caller's stream when given, else buffer in memory
+        self.buf = out if out is not None else io.StringIO()
+        self.line_count = 0
+        
+        # VCF release is inferred from the ESXi build unless already known
+        self.vcf_version = env.vcf_version or (
+            "9.0.1" if env.esxi_version and "9.0" in env.esxi_version else "")
+        # Sites are identified by the domain name suffix (mgmt-a, wld01-b, ...)
+        self.site_count = len({d.name.rsplit('-', 1)[-1] if '-' in d.name else 'a' for d in env.domains})
     
-    def generate(self) -> str:
-        """Generate the complete LABDETAILS.md content"""
+    def generate(self) -> Optional[str]:
+        """
+        Generate the complete LABDETAILS.md content
+        
+        :return: The document, or None when it was streamed to ``out``
+        """
+        self._precompute()
+        
         self._add_header()
         self._add_high_level_architecture()
         self._add_network_architecture()
@@ -667,11 +1297,93 @@ class LabDetailsGenerator:
         self._add_quick_reference()
         self._add_footer()
         
-        return '\n'.join(self.lines)
+        return self.buf.getvalue() if isinstance(self.buf, io.StringIO) else None
+    
+    def _precompute(self):
+        """Derive the domain/host IDs shared by the diagram sections once"""
+        self._domain_ids = {d.name: d.name.translate(_ID_TRANS) for d in self.env.domains}
+        
+        # Parse each host once into (short name, Mermaid ID) and partition by
+        # host number: esx-01a..04a are management, esx-05a+ are workload
+        self._host_meta = {}
+        mgmt_hosts = []
+        wld_hosts = []
+        for h in self.env.hosts:
+            short = h.fqdn.split('.', 1)[0]
+            host_id = short.translate(_ID_TRANS)
+            self._host_meta[h.fqdn] = (short, host_id)
+            parts = short.split('-')
+            num = parts[1].rstrip('a') if len(parts) > 1 else ''
+            bucket = wld_hosts if num.isdigit() and int(num) > 4 else mgmt_hosts
+            bucket.append((h, short, host_id))
+        self._mgmt_clusters = set()
+        self._wld_clusters = set()
+        self._cluster_hosts = {}
+        # First management/workload cluster, drawn on the complete diagram
+        self._clusters_by_tag = {}
+        for cl in self.env.clusters:
+            name_lower = cl.name.lower()
+            if 'wld' in name_lower:
+                self._wld_clusters.add(cl.name)
+                self._clusters_by_tag.setdefault('wld', cl)
+            if 'mgmt' in name_lower:
+                self._mgmt_clusters.add(cl.name)
+                self._clusters_by_tag.setdefault('mgmt', cl)
+                self._cluster_hosts[cl.name] = mgmt_hosts
+            elif 'wld' in name_lower:
+                self._cluster_hosts[cl.name] = wld_hosts
+        
+        # First datastore whose name contains each cluster's datastore key
+        self._datastore_for = {
+            cl.datastore: next((ds for ds in self.env.datastores if cl.datastore in ds.name), None)
+            for cl in self.env.clusters if cl.datastore
+        }
+        
+        # VM inventory tables list VMs by name
+        self._sorted_mgmt_vms = sorted(self.env.mgmt_vms, key=attrgetter('name'))
+        self._sorted_wld_vms = sorted(self.env.wld_vms, key=attrgetter('name'))
+        
+        # Lowercased names for the case-insensitive substring matches below
+        self._vm_lower = {vm.name: vm.name.lower() for vm in self.env.mgmt_vms + self.env.wld_vms}
+        self._edge_lower = {e.name: e.name.lower() for e in self.env.nsx_edges}
+        
+        # NSX edges per domain, matched on the domain prefix ("mgmt", "wld01")
+        self._domain_prefix = {d.name: d.name.split('-', 1)[0] for d in self.env.domains}
+        self._domain_edges = defaultdict(list)
+        for e in self.env.nsx_edges:
+            cluster_lower = e.cluster.lower()
+            for d in self.env.domains:
+                if self._domain_prefix[d.name] in cluster_lower or d.name in e.cluster:
+                    self._domain_edges[d.name].append(e)
+    
+    def _write(self, text: str):
+        """Write whole lines of raw text to the output, keeping the line count"""
+        self.buf.write(text)
+        self.line_count += text.count('\n')
     
     def _add(self, line: str = ""):
         """Add a line to the output"""
-        self.lines.append(line)
+        self.buf.write(line)
+        self.buf.write('\n')
+        self.line_count += line.count('\n') + 1
+    
+    def _core_ips(self) -> Dict[str, str]:
+        """Template values for the core VM (router/console/manager) IPs"""
+        return {
+            'router_ip': self.env.router_ip,
+            'console_ip': self.env.console_ip,
+            'manager_ip': self.env.manager_ip,
+        }
+    
+    def _add_mermaid_start(self, heading: str, chart: str = "flowchart TB"):
+        """Add a section heading and open a Mermaid diagram with the shared styles"""
+        self._write(f"{heading}\n\n```mermaid\n{chart}\n{MERMAID_STYLES}\n\n")
+    
+    def _add_lines(self, lines: List[str]):
+        """Add a batch of lines (e.g. table rows) with a single write"""
+        if lines:
+            self._write('\n'.join(lines))
+            self._add()
     
     def _add_header(self):
         """Add document header"""
@@ -696,12 +1408,10 @@ class LabDetailsGenerator:
         
         if self.env.esxi_version:
             # Try to extract VCF version from ESXi version
-            vcf_version = "9.0.1" if "9.0" in self.env.esxi_version else "Unknown"
-            self._add(f"| **VCF Version** | {vcf_version} |")
+            self._add(f"| **VCF Version** | {self.vcf_version or 'Unknown'} |")
             self._add(f"| **ESXi Version** | {self.env.esxi_version} |")
         
-        site_count = len(set(d.name.split('-')[-1] if '-' in d.name else 'a' for d in self.env.domains))
-        config = "Single Site" if site_count == 1 else f"Multi-Site ({site_count} sites)"
+        config = "Single Site" if self.site_count == 1 else f"Multi-Site ({self.site_count} sites)"
         self._add(f"| **Configuration** | {config} |")
         self._add(f"| **DNS Domain** | {self.env.dns_domain} |")
         self._add(f"| **Credentials** | See `/home/holuser/creds.txt` |")
@@ -711,28 +1421,12 @@ class LabDetailsGenerator:
     
     def _add_high_level_architecture(self):
         """Add high-level architecture diagram"""
-        self._add("## High-Level Architecture")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart TB")
-        self._add(MERMAID_STYLES)
-        self._add()
-        self._add('    subgraph External["External Network"]')
-        self._add('        Internet[("Internet<br/>192.168.0.0/24")]')
-        self._add('    end')
-        self._add()
-        self._add('    subgraph vPod["vPod Environment"]')
-        self._add('        subgraph CoreVMs["Core Infrastructure VMs<br/>10.1.10.128/25"]')
-        self._add(f'            Router["holorouter<br/>{self.env.router_ip}<br/>(DNS/DHCP/Proxy/FW)"]')
-        self._add(f'            Console["console<br/>{self.env.console_ip}<br/>(Linux Main Console)"]')
-        self._add(f'            Manager["manager<br/>{self.env.manager_ip}<br/>(Lab Startup/Automation)"]')
-        self._add('        end')
-        self._add()
-        self._add('        subgraph VCF["VMware Cloud Foundation"]')
+        self._add_mermaid_start("## High-Level Architecture")
+        self._write(_HIGH_LEVEL_HEAD_MD.format_map(self._core_ips()))
         
         # Add domains
         for domain in self.env.domains:
-            domain_id = domain.name.replace('-', '_').replace('.', '_')
+            domain_id = self._domain_ids[domain.name]
             domain_label = "Management Domain" if domain.domain_type == "MANAGEMENT" else f"Workload Domain"
             
             self._add(f'            subgraph {domain_id}["{domain_label} ({domain.name})"]')
@@ -754,106 +1448,52 @@ class LabDetailsGenerator:
             
             self._add('            end')
         
-        self._add('        end')
-        self._add('    end')
-        self._add()
-        self._add('    Internet --> Router')
-        self._add('    Router --> Console')
-        self._add('    Router --> Manager')
-        self._add('    Router --> VCF')
-        
-        # Apply styles
-        self._add()
-        self._add('    class Router,Console,Manager coreVM')
-        self._add('    class External external')
+        # Close subgraphs, link core VMs and apply styles
+        self._write(_HIGH_LEVEL_LINKS_MD)
         
         for domain in self.env.domains:
-            domain_id = domain.name.replace('-', '_').replace('.', '_')
+            domain_id = self._domain_ids[domain.name]
             if domain.domain_type == "MANAGEMENT":
                 self._add(f'    class SDDC,VC_{domain_id},NSX_{domain_id},Cluster_{domain_id} mgmtDomain')
             else:
                 self._add(f'    class VC_{domain_id},NSX_{domain_id},Cluster_{domain_id} wldDomain')
         
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_MERMAID_SECTION_END_MD)
     
     def _add_network_architecture(self):
         """Add network architecture diagram"""
-        self._add("## Network Architecture")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart LR")
-        self._add(MERMAID_STYLES)
-        self._add()
-        self._add('    subgraph External["External/Internet"]')
-        self._add('        ExtNet["192.168.0.0/24"]')
-        self._add('    end')
-        self._add()
-        self._add(f'    subgraph Router["holorouter ({self.env.router_ip})"]')
-        self._add('        FW["Firewall/NAT"]')
-        self._add('        DNS["DNS Server"]')
-        self._add('        Proxy["Squid Proxy :3128"]')
-        self._add('    end')
-        self._add()
-        self._add('    subgraph Networks["Internal Networks"]')
-        self._add('        subgraph CoreNet["Core Network<br/>10.1.10.128/25"]')
-        self._add(f'            Console2["console<br/>{self.env.console_ip}"]')
-        self._add(f'            Manager2["manager<br/>{self.env.manager_ip}"]')
-        self._add('        end')
-        self._add()
-        self._add('        subgraph MgmtNet["Management Network<br/>10.1.1.0/24"]')
-        self._add('            direction TB')
+        self._add_mermaid_start("## Network Architecture", "flowchart LR")
+        self._write(_NETWORK_HEAD_MD.format_map(self._core_ips()))
         
         # Add key management VMs
-        mgmt_vms_to_show = ['sddcmanager-a', 'vc-mgmt-a', 'vc-wld01-a', 'nsx-mgmt-01a', 'nsx-wld01-01a']
         for vm in self.env.mgmt_vms:
-            name_lower = vm.name.lower()
-            for show_name in mgmt_vms_to_show:
-                if show_name in name_lower:
-                    ip_suffix = vm.ip_address.split('.')[-1] if vm.ip_address else ""
-                    self._add(f'            VM_{vm.name.replace("-", "_")}["{vm.name} .{ip_suffix}"]')
-                    break
+            if _SHOW_MGMT_VMS_RE.search(self._vm_lower[vm.name]):
+                ip_suffix = vm.ip_address.split('.')[-1] if vm.ip_address else ""
+                self._add(f'            VM_{vm.name.translate(_DASH_TRANS)}["{vm.name} .{ip_suffix}"]')
         
         self._add('        end')
         self._add()
         self._add('        subgraph VSANNet["vSAN Network<br/>10.1.2.0/24"]')
         self._add('            direction TB')
         for host in self.env.hosts[:4]:  # Show first 4 hosts
-            short_name = host.fqdn.split('.')[0]
+            short_name, host_id = self._host_meta[host.fqdn]
             ip_suffix = host.vsan_ip.split('.')[-1] if host.vsan_ip else ""
-            self._add(f'            {short_name.replace("-", "_")}_v["{short_name} .{ip_suffix}"]')
-        self._add('        end')
-        self._add('    end')
-        self._add()
-        self._add('    ExtNet --> FW')
-        self._add('    FW --> CoreNet')
-        self._add('    FW --> MgmtNet')
-        self._add()
-        self._add('    class Console2,Manager2 coreVM')
-        self._add('    class ExtNet external')
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+            self._add(f'            {host_id}_v["{short_name} .{ip_suffix}"]')
+        self._write(_NETWORK_TAIL_MD)
+        self._write(_MERMAID_SECTION_END_MD)
     
     def _add_vcf_domain_architecture(self):
         """Add VCF domain architecture diagram"""
-        self._add("## VCF Domain Architecture")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart TB")
-        self._add(MERMAID_STYLES)
-        self._add()
+        if not self.env.domains:
+            return
+        self._add_mermaid_start("## VCF Domain Architecture")
         
-        vcf_version = "9.0.1" if self.env.esxi_version and "9.0" in self.env.esxi_version else ""
-        self._add(f'    subgraph VCF["VMware Cloud Foundation {vcf_version}"]')
+        self._add(f'    subgraph VCF["VMware Cloud Foundation {self.vcf_version}"]')
         self._add('        SDDC["SDDC Manager<br/>sddcmanager-a.site-a.vcf.lab"]')
         self._add()
         
         for domain in self.env.domains:
-            domain_id = domain.name.replace('-', '_').replace('.', '_')
+            domain_id = self._domain_ids[domain.name]
             domain_label = "Management Domain" if domain.domain_type == "MANAGEMENT" else "Workload Domain"
             style_class = "mgmtDomain" if domain.domain_type == "MANAGEMENT" else "wldDomain"
             
@@ -869,8 +1509,10 @@ class LabDetailsGenerator:
             if domain.nsx_fqdn:
                 self._add(f'            subgraph NSX_{domain_id}["NSX: {domain.nsx_fqdn}"]')
                 # Find NSX node for this domain
+                prefix = self._domain_prefix[domain.name]
                 for vm in self.env.mgmt_vms:
-                    if 'nsx' in vm.name.lower() and domain.name.split('-')[0] in vm.name.lower():
+                    name_lower = self._vm_lower[vm.name]
+                    if 'nsx' in name_lower and prefix in name_lower:
                         self._add(f'                NSXNode_{domain_id}["{vm.name}<br/>{vm.ip_address}"]')
                         break
                 self._add('            end')
@@ -880,26 +1522,15 @@ class LabDetailsGenerator:
                 if cl.domain == domain.name:
                     self._add(f'            subgraph Cluster_{domain_id}["Cluster: {cl.name}"]')
                     # List hosts in this cluster
-                    host_count = 0
-                    for host in self.env.hosts:
-                        short_name = host.fqdn.split('.')[0]
-                        host_num = int(short_name.split('-')[1].replace('a', '')) if '-' in short_name else 0
-                        
-                        # Assign to cluster based on host number
-                        if cl.name == 'cluster-mgmt-01a' and host_num <= 4:
-                            self._add(f'                Host_{short_name.replace("-", "_")}["{short_name}<br/>{host.cpu_cores} cores / {host.memory_gb:.0f} GB"]')
-                            host_count += 1
-                        elif cl.name == 'cluster-wld01-01a' and host_num > 4:
-                            self._add(f'                Host_{short_name.replace("-", "_")}["{short_name}<br/>{host.cpu_cores} cores / {host.memory_gb:.0f} GB"]')
-                            host_count += 1
+                    for host, short_name, host_id in self._cluster_hosts.get(cl.name, ()):
+                        self._add(f'                Host_{host_id}["{short_name}<br/>{host.cpu_cores} cores / {host.memory_gb:.0f} GB"]')
                     self._add('            end')
                     
                     # Datastore
                     self._add(f'            subgraph DS_{domain_id}["Datastore"]')
-                    for ds in self.env.datastores:
-                        if cl.datastore and cl.datastore in ds.name:
-                            self._add(f'                {ds.name.replace("-", "_")}["{ds.name}<br/>{ds.ds_type}<br/>{ds.capacity_gb:.1f} TB"]')
-                            break
+                    ds = self._datastore_for.get(cl.datastore)
+                    if ds:
+                        self._add(f'                {ds.name.translate(_DASH_TRANS)}["{ds.name}<br/>{ds.ds_type}<br/>{ds.capacity_gb:.1f} TB"]')
                     self._add('            end')
             
             self._add('        end')
@@ -914,72 +1545,54 @@ class LabDetailsGenerator:
         # Apply styles
         self._add('    class SDDC mgmtDomain')
         for domain in self.env.domains:
-            domain_id = domain.name.replace('-', '_').replace('.', '_')
+            domain_id = self._domain_ids[domain.name]
             style_class = "mgmtDomain" if domain.domain_type == "MANAGEMENT" else "wldDomain"
         
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_MERMAID_SECTION_END_MD)
     
     def _add_esxi_host_layout(self):
         """Add ESXi host layout diagram"""
-        self._add("## ESXi Host Layout")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart TB")
-        self._add(MERMAID_STYLES)
-        self._add()
+        if not self.env.clusters:
+            return
+        self._add_mermaid_start("## ESXi Host Layout")
         self._add('    subgraph Site["Site A - ESXi Hosts"]')
         
         # Group hosts by cluster
         for cl in self.env.clusters:
-            cl_id = cl.name.replace('-', '_').replace('.', '_')
-            style_class = "mgmtDomain" if "mgmt" in cl.name.lower() else "wldDomain"
+            cl_id = cl.name.translate(_ID_TRANS)
+            style_class = "mgmtDomain" if cl.name in self._mgmt_clusters else "wldDomain"
             
             self._add(f'        subgraph {cl_id}["{cl.name}"]')
             
-            for host in self.env.hosts:
-                short_name = host.fqdn.split('.')[0]
-                host_num = int(short_name.split('-')[1].replace('a', '')) if '-' in short_name else 0
-                
-                # Assign to cluster based on host number (1-4 = mgmt, 5-7 = wld)
-                in_this_cluster = False
-                if "mgmt" in cl.name.lower() and host_num <= 4:
-                    in_this_cluster = True
-                elif "wld" in cl.name.lower() and host_num > 4:
-                    in_this_cluster = True
-                
-                if in_this_cluster:
-                    host_id = short_name.replace('-', '_')
-                    self._add(f'            subgraph {host_id}["{host.fqdn}"]')
-                    self._add(f'                {host_id}_info["{host.cpu_cores} CPU Cores | {host.memory_gb:.0f} GB RAM<br/>')
-                    if host.mgmt_ip:
-                        self._add(f'MGMT: {host.mgmt_ip}<br/>')
-                    if host.vsan_ip:
-                        self._add(f'vSAN: {host.vsan_ip}<br/>')
-                    if host.vmotion_ip:
-                        self._add(f'vMotion: {host.vmotion_ip}"]')
-                    else:
-                        self._add('"]')
-                    self._add('            end')
+            # Hosts assigned by host number (1-4 = mgmt, 5-7 = wld)
+            for host, _, host_id in self._cluster_hosts.get(cl.name, ()):
+                self._add(f'            subgraph {host_id}["{host.fqdn}"]')
+                self._add(f'                {host_id}_info["{host.cpu_cores} CPU Cores | {host.memory_gb:.0f} GB RAM<br/>')
+                if host.mgmt_ip:
+                    self._add(f'MGMT: {host.mgmt_ip}<br/>')
+                if host.vsan_ip:
+                    self._add(f'vSAN: {host.vsan_ip}<br/>')
+                if host.vmotion_ip:
+                    self._add(f'vMotion: {host.vmotion_ip}"]')
+                else:
+                    self._add('"]')
+                self._add('            end')
             
             self._add('        end')
             self._add(f'        class {cl_id} {style_class}')
         
         self._add('    end')
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_MERMAID_SECTION_END_MD)
     
     def _add_vm_inventory(self):
         """Add VM inventory tables"""
+        if not self.env.domains:
+            return
         self._add("## Virtual Machine Inventory")
         self._add()
         
         for domain in self.env.domains:
-            vms = self.env.mgmt_vms if domain.domain_type == "MANAGEMENT" else self.env.wld_vms
+            vms = self._sorted_mgmt_vms if domain.domain_type == "MANAGEMENT" else self._sorted_wld_vms
             domain_label = "Management" if domain.domain_type == "MANAGEMENT" else "Workload"
             
             self._add(f"### {domain_label} Domain VMs ({domain.vcenter_fqdn})")
@@ -987,66 +1600,33 @@ class LabDetailsGenerator:
             self._add("| VM Name | Power State | vCPUs | Memory | IP Address |")
             self._add("| ------- | ----------- | ----- | ------ | ---------- |")
             
-            for vm in sorted(vms, key=lambda x: x.name):
-                power = "On" if "poweredOn" in vm.power_state else "Off"
-                mem_gb = f"{vm.memory_mb / 1024:.0f} GB" if vm.memory_mb else "-"
-                ip = vm.ip_address if vm.ip_address else "-"
-                self._add(f"| {vm.name} | {power} | {vm.vcpus} | {mem_gb} | {ip} |")
+            self._add_lines([self._vm_row(vm) for vm in vms])
             
             self._add()
         
         self._add("---")
         self._add()
     
+    @staticmethod
+    def _vm_row(vm: VMInfo) -> str:
+        """Format one VM inventory table row"""
+        power = _POWER_MAP.get(vm.power_state, "Off")
+        mem_gb = f"{vm.memory_mb / 1024:.0f} GB" if vm.memory_mb else "-"
+        ip = vm.ip_address if vm.ip_address else "-"
+        return f"| {vm.name} | {power} | {vm.vcpus} | {mem_gb} | {ip} |"
+    
     def _add_core_infrastructure(self):
         """Add core infrastructure VMs diagram"""
-        self._add("## Core Infrastructure VMs")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart TB")
-        self._add(MERMAID_STYLES)
-        self._add()
-        self._add('    subgraph Core["Core Infrastructure VMs (L1)"]')
-        self._add(f'        subgraph RouterVM["holorouter - {self.env.router_ip}"]')
-        self._add('            RouterSvc["Services:<br/>- DNS Server<br/>- DHCP Server<br/>- Squid Proxy (:3128)<br/>- Firewall/NAT<br/>- NTP Server"]')
-        self._add('        end')
-        self._add()
-        self._add(f'        subgraph ConsoleVM["console - {self.env.console_ip}"]')
-        self._add('            ConsoleSvc["Services:<br/>- Linux Desktop (Ubuntu)<br/>- Firefox Browser<br/>- VNC (:5901)<br/>- RDP (:3389)<br/>- SSH (:22)"]')
-        self._add('        end')
-        self._add()
-        self._add(f'        subgraph ManagerVM["manager - {self.env.manager_ip}"]')
-        self._add('            ManagerSvc["Services:<br/>- Lab Startup Scripts<br/>- NFS Export (/tmp/holorouter)<br/>- Python Automation<br/>- SSH (:22 via port 5480)"]')
-        self._add('        end')
-        self._add('    end')
-        self._add()
-        self._add('    RouterVM --> ConsoleVM')
-        self._add('    RouterVM --> ManagerVM')
-        self._add()
-        self._add('    class RouterVM,ConsoleVM,ManagerVM coreVM')
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_CORE_INFRASTRUCTURE_MD.format_map({'styles': MERMAID_STYLES, **self._core_ips()}))
     
     def _add_network_subnets(self):
         """Add network subnets reference table"""
-        self._add("## Network Subnets Reference")
-        self._add()
-        self._add("| Network | Subnet | Gateway | Purpose |")
-        self._add("| ------- | ------ | ------- | ------- |")
-        self._add("| Core/External | 10.1.10.128/25 | 10.1.10.129 | Console, Manager, Router |")
-        self._add("| Management | 10.1.1.0/24 | 10.1.1.1 | VCF Management Components |")
-        self._add("| vSAN | 10.1.2.0/24 | - | vSAN Traffic |")
-        self._add("| vMotion | 10.1.3.0/24 | - | vMotion Traffic |")
-        self._add("| TEP (Overlay) | 10.1.5.128/25 | 10.1.5.129 | NSX Transport Endpoint (GENEVE) |")
-        self._add("| External (Holodeck) | 192.168.0.0/24 | 192.168.0.1 | External/Internet Access |")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_NETWORK_SUBNETS_MD)
     
     def _add_dvs_diagrams(self):
         """Add Distributed Virtual Switch diagrams"""
+        if not (self.env.domains and (self.env.mgmt_networks or self.env.wld_networks)):
+            return
         self._add("## Distributed Virtual Switches")
         self._add()
         
@@ -1058,35 +1638,28 @@ class LabDetailsGenerator:
             if not networks:
                 continue
             
-            self._add(f"### {domain_label} vCenter ({domain.vcenter_fqdn})")
-            self._add()
-            self._add("```mermaid")
-            self._add("flowchart TB")
-            self._add(MERMAID_STYLES)
-            self._add()
+            self._add_mermaid_start(f"### {domain_label} vCenter ({domain.vcenter_fqdn})")
             
             # Group by DVS
-            dvs_map = {}
+            dvs_map = defaultdict(list)
             for net in networks:
-                dvs = net.dvs_name if net.dvs_name else "Unknown DVS"
-                if dvs not in dvs_map:
-                    dvs_map[dvs] = []
-                dvs_map[dvs].append(net.name)
+                dvs_map[net.dvs_name or "Unknown DVS"].append(net.name)
             
-            self._add(f'    subgraph DVS_{domain.name.replace("-", "_")}["Distributed Virtual Switches"]')
+            dvs_group_id = f'DVS_{domain.name.translate(_DASH_TRANS)}'
+            self._add(f'    subgraph {dvs_group_id}["Distributed Virtual Switches"]')
             
             for dvs_name, portgroups in dvs_map.items():
-                dvs_id = dvs_name.replace('-', '_').replace('.', '_')
+                dvs_id = dvs_name.translate(_ID_TRANS)
                 self._add(f'        subgraph {dvs_id}["{dvs_name}"]')
-                for pg in sorted(portgroups)[:8]:  # Limit to 8 port groups
-                    pg_id = pg.replace('-', '_').replace('.', '_').replace(' ', '_')
+                for pg in heapq.nsmallest(8, portgroups):  # Limit to 8 port groups
+                    pg_id = pg.translate(_ID_TRANS)
                     # Truncate long names
                     pg_display = pg if len(pg) < 40 else pg[:37] + "..."
                     self._add(f'            {pg_id}["{pg_display}"]')
                 self._add('        end')
             
             self._add('    end')
-            self._add(f'    class DVS_{domain.name.replace("-", "_")} {style_class}')
+            self._add(f'    class {dvs_group_id} {style_class}')
             self._add("```")
             self._add()
         
@@ -1095,16 +1668,13 @@ class LabDetailsGenerator:
     
     def _add_nsx_architecture(self):
         """Add NSX architecture diagram"""
-        self._add("## NSX Architecture")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart TB")
-        self._add(MERMAID_STYLES)
-        self._add()
+        if not self.env.domains:
+            return
+        self._add_mermaid_start("## NSX Architecture")
         self._add('    subgraph NSX["NSX-T Architecture"]')
         
         for domain in self.env.domains:
-            domain_id = domain.name.replace('-', '_').replace('.', '_')
+            domain_id = self._domain_ids[domain.name]
             domain_label = "Management" if domain.domain_type == "MANAGEMENT" else "Workload"
             style_class = "mgmtDomain" if domain.domain_type == "MANAGEMENT" else "wldDomain"
             
@@ -1114,12 +1684,12 @@ class LabDetailsGenerator:
                 self._add(f'            NSXMgr_{domain_id}["NSX Manager Cluster<br/>{domain.nsx_fqdn} (VIP)"]')
             
             # Find edges for this domain
-            domain_edges = [e for e in self.env.nsx_edges if domain.name.split('-')[0] in e.cluster.lower() or domain.name in e.cluster]
+            domain_edges = self._domain_edges[domain.name]
             
             if domain_edges:
                 self._add(f'            subgraph EdgeCluster_{domain_id}["Edge Cluster"]')
                 for edge in domain_edges:
-                    edge_id = edge.name.replace('-', '_')
+                    edge_id = edge.name.translate(_DASH_TRANS)
                     tep_str = ', '.join(edge.tep_ips) if edge.tep_ips else "N/A"
                     self._add(f'                {edge_id}["{edge.name}<br/>Mgmt: {edge.mgmt_ip}<br/>TEP: {tep_str}"]')
                 self._add('            end')
@@ -1128,55 +1698,11 @@ class LabDetailsGenerator:
             self._add(f'        class NSX_{domain_id} {style_class}')
         
         self._add('    end')
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_MERMAID_SECTION_END_MD)
     
     def _add_boot_sequence(self):
         """Add lab startup boot sequence diagram"""
-        self._add("## Lab Startup Boot Sequence")
-        self._add()
-        self._add("```mermaid")
-        self._add("sequenceDiagram")
-        self._add("    participant Router as holorouter")
-        self._add("    participant Manager as manager")
-        self._add("    participant ESXi as ESXi Hosts")
-        self._add("    participant NSX as NSX Manager")
-        self._add("    participant Edges as NSX Edges")
-        self._add("    participant VC as vCenter")
-        self._add("    participant SDDC as SDDC Manager")
-        self._add("    participant Ops as VCF Operations Suite")
-        self._add()
-        self._add("    Note over Router,Ops: Lab Startup Sequence (labstartup.py)")
-        self._add()
-        self._add("    Router->>Router: Start DNS/DHCP/Proxy")
-        self._add("    Manager->>Manager: Initialize lsfunctions")
-        self._add("    Manager->>ESXi: Connect to ESXi hosts")
-        self._add("    ESXi->>ESXi: Exit Maintenance Mode")
-        self._add()
-        self._add("    Manager->>Manager: Verify vSAN Datastore")
-        self._add("    Manager->>NSX: Power On NSX Manager(s)")
-        self._add("    Manager->>Edges: Power On NSX Edge VMs")
-        self._add()
-        self._add("    Note over Edges: Wait 5 minutes for Edge boot")
-        self._add()
-        self._add("    Manager->>VC: Power On vCenter(s)")
-        self._add()
-        self._add("    Note over VC: Wait for vCenter API")
-        self._add()
-        self._add("    Manager->>Manager: Connect to vCenters")
-        self._add("    Manager->>SDDC: Power On sddcmanager-a")
-        self._add("    Manager->>Ops: Power On VCF Operations Suite VMs")
-        self._add()
-        self._add("    Manager->>Manager: Verify URLs")
-        self._add("    Manager->>Router: Signal Ready")
-        self._add()
-        self._add("    Note over Router,Ops: Lab Ready!")
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_BOOT_SEQUENCE_MD)
     
     def _add_web_interfaces(self):
         """Add web interfaces table"""
@@ -1185,33 +1711,9 @@ class LabDetailsGenerator:
         self._add("| Service | URL | Expected Content |")
         self._add("| ------- | --- | ---------------- |")
         
-        for url, text in self.env.urls:
-            if url.startswith('#'):
-                continue
-            # Determine service name from URL
-            service = "Web Service"
-            if 'vc-mgmt' in url:
-                service = "vCenter Management"
-                if '5480' in url:
-                    service = "vCenter Management VAMI"
-            elif 'vc-wld' in url:
-                service = "vCenter Workload"
-                if '5480' in url:
-                    service = "vCenter Workload VAMI"
-            elif 'sddcmanager' in url:
-                service = "SDDC Manager"
-            elif 'nsx' in url:
-                service = "NSX Manager"
-            elif 'ops-a' in url:
-                service = "VCF Operations"
-            elif 'auto-' in url:
-                service = "VCF Automation"
-            elif 'opslcm' in url:
-                service = "VCF Operations Manager"
-            elif 'vmware.com' in url:
-                service = "VMware.com (Internet Test)"
-            
-            self._add(f"| {service} | {url} | {text} |")
+        rows = [f"| {url_service_name(url)} | {url} | {text} |"
+                for url, text in self.env.urls if not url.startswith('#')]
+        self._add_lines(rows)
         
         self._add()
         self._add("---")
@@ -1219,13 +1721,7 @@ class LabDetailsGenerator:
     
     def _add_credentials(self):
         """Add credentials table (referencing creds.txt)"""
-        self._add("## Credentials")
-        self._add()
-        self._add("> **Note:** The lab password is stored in `/home/holuser/creds.txt`")
-        self._add()
-        self._add("| System | Username | Password |")
-        self._add("| ------ | -------- | -------- |")
-        self._add("| vCenter (Management) | administrator@vsphere.local | See `/home/holuser/creds.txt` |")
+        self._write(_CREDENTIALS_HEAD_MD)
         
         # Find workload SSO domain
         for domain in self.env.domains:
@@ -1233,15 +1729,7 @@ class LabDetailsGenerator:
                 self._add(f"| vCenter (Workload) | administrator@{domain.sso_domain} | See `/home/holuser/creds.txt` |")
                 break
         
-        self._add("| SDDC Manager | administrator@vsphere.local | See `/home/holuser/creds.txt` |")
-        self._add("| NSX Manager | admin | See `/home/holuser/creds.txt` |")
-        self._add("| ESXi Hosts | root | See `/home/holuser/creds.txt` |")
-        self._add("| VCF Operations Suite | admin@local | See `/home/holuser/creds.txt` |")
-        self._add("| Linux VMs (holuser) | holuser | See `/home/holuser/creds.txt` |")
-        self._add("| Linux VMs (root) | root | See `/home/holuser/creds.txt` |")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_CREDENTIALS_TAIL_MD)
     
     def _add_storage_summary(self):
         """Add storage summary"""
@@ -1251,31 +1739,29 @@ class LabDetailsGenerator:
         if self.env.datastores:
             self._add("```mermaid")
             self._add("pie title vSAN Capacity Allocation (GB)")
-            for ds in self.env.datastores:
-                self._add(f'    "{ds.name}" : {ds.capacity_gb:.0f}')
+            self._add_lines([f'    "{ds.name}" : {ds.capacity_gb:.0f}' for ds in self.env.datastores])
             self._add("```")
             self._add()
         
         self._add("| Datastore | Type | Capacity | Free | Used |")
         self._add("| --------- | ---- | -------- | ---- | ---- |")
         
-        for ds in self.env.datastores:
-            used_gb = ds.capacity_gb - ds.free_gb
-            used_pct = (used_gb / ds.capacity_gb * 100) if ds.capacity_gb > 0 else 0
-            self._add(f"| {ds.name} | {ds.ds_type} | {ds.capacity_gb:.1f} GB | {ds.free_gb:.1f} GB | {used_pct:.0f}% |")
+        self._add_lines([self._datastore_row(ds) for ds in self.env.datastores])
         
         self._add()
         self._add("---")
         self._add()
     
+    @staticmethod
+    def _datastore_row(ds: DatastoreInfo) -> str:
+        """Format one storage summary table row"""
+        used_gb = ds.capacity_gb - ds.free_gb
+        used_pct = (used_gb / ds.capacity_gb * 100) if ds.capacity_gb > 0 else 0
+        return f"| {ds.name} | {ds.ds_type} | {ds.capacity_gb:.1f} GB | {ds.free_gb:.1f} GB | {used_pct:.0f}% |"
+    
     def _add_complete_diagram(self):
         """Add complete infrastructure diagram"""
-        self._add("## Complete Infrastructure Diagram")
-        self._add()
-        self._add("```mermaid")
-        self._add("flowchart TB")
-        self._add(MERMAID_STYLES)
-        self._add()
+        self._add_mermaid_start("## Complete Infrastructure Diagram")
         self._add('    subgraph External["External Access"]')
         self._add('        Internet["Internet<br/>192.168.0.0/24"]')
         self._add('    end')
@@ -1300,23 +1786,18 @@ class LabDetailsGenerator:
                 self._add(f'                VCM["{vc_short}"]')
                 self._add(f'                NSXM["{nsx_short}"]')
                 
-                # Find cluster
-                for cl in self.env.clusters:
-                    if "mgmt" in cl.name.lower():
-                        self._add(f'                subgraph MgmtHosts["ESXi Cluster ({cl.host_count} hosts)"]')
-                        for host in self.env.hosts:
-                            short_name = host.fqdn.split('.')[0]
-                            host_num = int(short_name.split('-')[1].replace('a', '')) if '-' in short_name else 0
-                            if host_num <= 4:
-                                self._add(f'                    {short_name.replace("-", "_")}["{short_name}"]')
-                        self._add('                end')
-                        break
+                cl = self._clusters_by_tag.get('mgmt')
+                if cl:
+                    self._add(f'                subgraph MgmtHosts["ESXi Cluster ({cl.host_count} hosts)"]')
+                    for _, short_name, host_id in self._cluster_hosts[cl.name]:
+                        self._add(f'                    {host_id}["{short_name}"]')
+                    self._add('                end')
         
         # Edges
-        mgmt_edges = [e for e in self.env.nsx_edges if 'mgmt' in e.name.lower()]
+        mgmt_edges = [e for e in self.env.nsx_edges if 'mgmt' in self._edge_lower[e.name]]
         if mgmt_edges:
             for edge in mgmt_edges:
-                self._add(f'                {edge.name.replace("-", "_")}["{edge.name}"]')
+                self._add(f'                {edge.name.translate(_DASH_TRANS)}["{edge.name}"]')
         
         self._add('            end')
         self._add()
@@ -1331,21 +1812,16 @@ class LabDetailsGenerator:
                 self._add(f'                VCW["{vc_short}"]')
                 self._add(f'                NSXW["{nsx_short}"]')
                 
-                # Find cluster
-                for cl in self.env.clusters:
-                    if "wld" in cl.name.lower():
-                        self._add(f'                subgraph WldHosts["ESXi Cluster ({cl.host_count} hosts)"]')
-                        for host in self.env.hosts:
-                            short_name = host.fqdn.split('.')[0]
-                            host_num = int(short_name.split('-')[1].replace('a', '')) if '-' in short_name else 0
-                            if host_num > 4:
-                                self._add(f'                    {short_name.replace("-", "_")}["{short_name}"]')
-                        self._add('                end')
-                        break
+                cl = self._clusters_by_tag.get('wld')
+                if cl:
+                    self._add(f'                subgraph WldHosts["ESXi Cluster ({cl.host_count} hosts)"]')
+                    for _, short_name, host_id in self._cluster_hosts[cl.name]:
+                        self._add(f'                    {host_id}["{short_name}"]')
+                    self._add('                end')
         
         # Tanzu/Supervisor if present
         for vm in self.env.wld_vms:
-            if 'supervisor' in vm.name.lower():
+            if 'supervisor' in self._vm_lower[vm.name]:
                 self._add('                SCP["Supervisor<br/>Control Plane"]')
                 break
         
@@ -1354,69 +1830,14 @@ class LabDetailsGenerator:
         
         # VCF Operations Suite
         self._add('            subgraph VCFOps["VCF Operations Suite"]')
-        aria_vms = ['auto', 'ops-a', 'opslcm', 'opslogs']
         for vm in self.env.mgmt_vms:
-            name_lower = vm.name.lower()
-            for aria_name in aria_vms:
-                if aria_name in name_lower and 'poweredOn' in vm.power_state:
-                    display_name = vm.name.split('-')[0] if '-' in vm.name else vm.name
-                    self._add(f'                {vm.name.replace("-", "_")}["{display_name}"]')
-                    break
-        self._add('            end')
-        
-        self._add('        end')
-        self._add('    end')
-        self._add()
-        self._add('    Internet --> Router')
-        self._add('    Router --> Console')
-        self._add('    Router --> Manager')
-        self._add('    Manager --> L2')
-        self._add()
-        self._add('    SDDC --> VCM')
-        self._add('    SDDC --> VCW')
-        self._add('    VCM --> MgmtHosts')
-        self._add('    VCM --> NSXM')
-        self._add('    VCW --> WldHosts')
-        self._add('    VCW --> NSXW')
-        self._add()
-        self._add('    class Router,Console,Manager coreVM')
-        self._add('    class Internet external')
-        self._add('    class MgmtDomain,SDDC,VCM,NSXM,MgmtHosts mgmtDomain')
-        self._add('    class WldDomain,VCW,NSXW,WldHosts,SCP wldDomain')
-        self._add('    class VCFOps vcfops')
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+            if vm.power_state == 'poweredOn' and _ARIA_VMS_RE.search(self._vm_lower[vm.name]):
+                self._add(f'                {vm.name.translate(_DASH_TRANS)}["{vm.name.partition("-")[0]}"]')
+        self._write(_COMPLETE_DIAGRAM_TAIL_MD)
+        self._write(_MERMAID_SECTION_END_MD)
     
     def _add_quick_reference(self):
         """Add quick reference commands"""
-        self._add("## Quick Reference Commands")
-        self._add()
-        self._add("### Lab Startup")
-        self._add()
-        self._add("```bash")
-        self._add("# Full lab startup")
-        self._add("cd /home/holuser/hol && python3 labstartup.py")
-        self._add()
-        self._add("# Check lab status")
-        self._add("cat /lmchol/startup_status.txt")
-        self._add()
-        self._add("# View startup dashboard")
-        self._add("firefox /lmchol/home/holuser/startup-status.htm")
-        self._add("```")
-        self._add()
-        self._add("### vCenter Connection (Python)")
-        self._add()
-        self._add("```python")
-        self._add("from pyVim import connect")
-        self._add()
-        self._add("# Read password from creds.txt")
-        self._add("with open('/home/holuser/creds.txt', 'r') as f:")
-        self._add("    password = f.read().strip()")
-        self._add()
-        self._add('si = connect.SmartConnect(')
-        
         # Use first management vCenter
         mgmt_vc = "vc-mgmt-a.site-a.vcf.lab"
         for domain in self.env.domains:
@@ -1424,55 +1845,88 @@ class LabDetailsGenerator:
                 mgmt_vc = domain.vcenter_fqdn
                 break
         
-        self._add(f'    host="{mgmt_vc}",')
-        self._add('    user="administrator@vsphere.local",')
-        self._add('    pwd=password,')
-        self._add('    disableSslCertValidation=True')
-        self._add(')')
-        self._add("```")
-        self._add()
-        self._add("### SDDC Manager API")
-        self._add()
-        self._add("```bash")
-        self._add("# Read password from creds.txt")
-        self._add('PASSWORD=$(cat /home/holuser/creds.txt)')
-        self._add()
-        self._add("# Get access token")
-        self._add('TOKEN=$(curl -k -s -X POST "https://sddcmanager-a.site-a.vcf.lab/v1/tokens" \\')
-        self._add('  -H "Content-Type: application/json" \\')
-        self._add('  -d "{\\\"username\\\": \\\"administrator@vsphere.local\\\", \\\"password\\\": \\\"$PASSWORD\\\"}" \\')
-        self._add("  | python3 -c \"import sys,json; print(json.load(sys.stdin)['accessToken'])\")")
-        self._add()
-        self._add("# List domains")
-        self._add('curl -k -s "https://sddcmanager-a.site-a.vcf.lab/v1/domains" \\')
-        self._add('  -H "Authorization: Bearer $TOKEN" | python3 -m json.tool')
-        self._add("```")
-        self._add()
-        self._add("### NSX Manager API")
-        self._add()
-        self._add("```bash")
-        self._add("# Read password from creds.txt")
-        self._add('PASSWORD=$(cat /home/holuser/creds.txt)')
-        self._add()
-        self._add("# Get cluster status")
-        self._add('curl -k -s -u admin:$PASSWORD \\')
-        self._add('  https://nsx-mgmt-01a.site-a.vcf.lab/api/v1/cluster/status | python3 -m json.tool')
-        self._add("```")
-        self._add()
-        self._add("---")
-        self._add()
+        self._write(_QUICK_REFERENCE_MD.format_map({'mgmt_vc': mgmt_vc}))
     
     def _add_footer(self):
         """Add document footer"""
-        self._add("## Document Information")
-        self._add()
-        self._add("| Property | Value |")
-        self._add("| -------- | ----- |")
-        self._add(f"| **Generated** | {datetime.datetime.now().strftime('%B %d, %Y at %H:%M:%S')} |")
-        self._add(f"| **Generated By** | `python3 Tools/generate_labdetails.py` |")
-        self._add("| **Lab Configuration** | `/tmp/config.ini` |")
-        self._add(f"| **Source INI** | `/home/holuser/hol/holodeck/{self.env.lab_sku}.ini` |")
-        self._add("| **Lab Startup Script** | `/home/holuser/hol/labstartup.py` |")
+        self._write(_FOOTER_MD.format_map({
+            'generated': datetime.datetime.now().strftime('%B %d, %Y at %H:%M:%S'),
+            'lab_sku': self.env.lab_sku,
+        }))
+
+#==============================================================================
+# ENVIRONMENT SNAPSHOT CACHE
+#==============================================================================
+
+def _env_cache_inputs(config_path: str) -> List[str]:
+    """Files whose modification invalidates a cached environment snapshot"""
+    return [config_path] + glob.glob(f'{HOLODECK_DIR}/*.ini')
+
+def load_env_cache(config_path: str) -> Optional[LabEnvironment]:
+    """
+    Return the cached LabEnvironment if it is still current, else None.
+    
+    The snapshot must be owned by us and not writable by anyone else
+    (it is unpickled from /tmp), younger than ENV_CACHE_TTL, newer than
+    every input INI, and collected from the same config path.
+    """
+    try:
+        st = os.stat(ENV_CACHE)
+    except OSError:
+        return None
+    if st.st_uid != os.getuid() or st.st_mode & 0o022:
+        log.warning("Ignoring environment cache with unsafe ownership/mode: %s", ENV_CACHE)
+        return None
+    if time.time() - st.st_mtime > ENV_CACHE_TTL:
+        return None
+    for path in _env_cache_inputs(config_path):
+        try:
+            if os.path.getmtime(path) > st.st_mtime:
+                return None
+        except OSError:
+            continue
+    try:
+        with open(ENV_CACHE, 'rb') as f:
+            cached_config, env = pickle.load(f)
+    except Exception as e:
+        log.warning("Could not read environment cache %s: %s", ENV_CACHE, e)
+        return None
+    return env if cached_config == config_path else None
+
+def save_env_cache(config_path: str, env: LabEnvironment):
+    """Persist a collected LabEnvironment snapshot (owner read/write only)"""
+    tmp_cache = f"{ENV_CACHE}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_cache, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((config_path, env), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_cache, ENV_CACHE)
+    except Exception as e:
+        log.warning("Could not write environment cache %s: %s", ENV_CACHE, e)
+        if os.path.exists(tmp_cache):
+            os.remove(tmp_cache)
+
+def collect_env(config_path: str, use_cache: bool = True) -> LabEnvironment:
+    """
+    Collect lab data, or reuse the snapshot from a recent run.
+    
+    Only a complete collection is cached: a run where a source failed, or
+    SDDC Manager returned no domains, is re-collected next time instead of
+    being served for ENV_CACHE_TTL.
+    """
+    env = load_env_cache(config_path) if use_cache else None
+    if env is not None:
+        log.info("Using cached lab data from %s (--no-cache to re-collect)", ENV_CACHE)
+        return env
+    
+    collector = LabDataCollector(config_path)
+    env = collector.collect_all()
+    if collector.errors or not env.domains:
+        log.warning("Lab data incomplete, not caching it: %s",
+                    "; ".join(collector.errors) or "no domains found")
+    else:
+        save_env_cache(config_path, env)
+    return env
 
 #==============================================================================
 # MAIN
@@ -1497,30 +1951,51 @@ def main():
         default=CONFIG_INI,
         help=f'Config file path (default: {CONFIG_INI})'
     )
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Also log every discovered domain, cluster, host and edge'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Re-collect lab data even if a current snapshot exists in {ENV_CACHE}'
+    )
     
     args = parser.parse_args()
     
+    # Progress goes to stderr so --dry-run stdout is only the markdown
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(message)s'
+    )
+    
     # Check for creds.txt
     if not os.path.isfile(CREDS_FILE):
         print(f"ERROR: Credentials file not found: {CREDS_FILE}")
         sys.exit(1)
     
-    # Collect lab data
-    collector = LabDataCollector(args.config)
-    env = collector.collect_all()
-    
-    # Generate markdown
-    generator = LabDetailsGenerator(env)
-    content = generator.generate()
+    # Collect lab data, or reuse the snapshot from a recent run
+    env = collect_env(args.config, use_cache=not args.no_cache)
     
+    # Generate markdown, streaming it to stdout or the output file
     if args.dry_run:
-        print(content)
+        LabDetailsGenerator(env, out=sys.stdout).generate()
     else:
-        # Write to file
-        with open(args.output, 'w') as f:
-            f.write(content)
+        # Write beside the target and rename, so a failed run keeps the old file
+        tmp_output = f"{args.output}.tmp"
+        try:
+            with open(tmp_output, 'w') as f:
+                generator = LabDetailsGenerator(env, out=f)
+                generator.generate()
+                size = f.tell()
+            os.replace(tmp_output, args.output)
+        except BaseException:
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+            raise
         print(f"\nLABDETAILS.md generated: {args.output}")
-        print(f"Total lines: {len(content.splitlines())}")
+        print(f"Total lines: {generator.line_count} ({size} bytes)")
 
 if __name__ == '__main__':
     main()
@@ -5,9 +5,10 @@
 
 import os
 import importlib.util
-from typing import List, Optional, Dict, Any
+from typing import Optional, Dict, Any, FrozenSet, Sequence, Tuple
 
-_DEFAULT_SEQUENCE: List[str] = [
+# Read-only: every lab type shares this one tuple unless it overrides below
+_DEFAULT_SEQUENCE: Sequence[str] = (
     'prelim',
     'ESXi',
     'VCF',
@@ -20,8 +21,8 @@ _DEFAULT_SEQUENCE: List[str] = [
     'VCFfinal',
     'VVFfinal',
     'final',
-    'odyssey'
-]
+    'odyssey',
+)
 
 
 class LabTypeLoader:
@@ -38,13 +39,16 @@ class LabTypeLoader:
     
     _DEFAULT_SEQUENCE = _DEFAULT_SEQUENCE
 
-    # Per-labtype startup sequences. All default to _DEFAULT_SEQUENCE.
+    # Per-labtype startup sequences. All share the _DEFAULT_SEQUENCE tuple.
     # Override a specific lab type here when its sequence actually differs.
-    # Example: 'DISCOVERY': ['prelim', 'ESXi', 'VCF', 'vSphere', 'urls', 'final']
-    STARTUP_SEQUENCE: Dict[str, List[str]] = {
-        lt: list(_DEFAULT_SEQUENCE) for lt in ('HOL', 'DISCOVERY', 'VXP', 'ATE', 'EDU')
+    # Example: 'DISCOVERY': ('prelim', 'ESXi', 'VCF', 'vSphere', 'urls', 'final')
+    STARTUP_SEQUENCE: Dict[str, Sequence[str]] = {
+        lt: _DEFAULT_SEQUENCE for lt in ('HOL', 'DISCOVERY', 'VXP', 'ATE', 'EDU')
     }
     
+    # Modules whose failure stops the startup sequence
+    CRITICAL_MODULES = frozenset(('prelim', 'ESXi', 'VCF', 'VCFfinal', 'urls', 'services'))
+    
     # Lab type descriptions and configuration
     # Keys are UPPERCASE to match the normalization in __init__
     # repo_pattern: 'standard' = PREFIX-XXYY (year-based), 'named' = PREFIX-Name (no year extraction)
@@ -102,18 +106,33 @@ class LabTypeLoader:
         if self.labtype not in self.LABTYPE_INFO:
             print(f'WARNING: Unknown labtype {self.labtype}, defaulting to HOL')
             self.labtype = 'HOL'
+        
+        # The lab type is fixed for the loader's lifetime - resolve its tables once
+        self._info = self.LABTYPE_INFO[self.labtype]
+        self._sequence = self.STARTUP_SEQUENCE.get(self.labtype, self._DEFAULT_SEQUENCE)
+        
+        # Resolved module paths and loaded modules, keyed by module name.
+        # These and the directory index last for the loader's lifetime: the
+        # vpodrepo and core repo are pulled by labstartup.sh before Python
+        # starts and nothing re-syncs them during a run. Create a new loader
+        # to see files added afterwards.
+        self._path_cache: Dict[str, Optional[str]] = {}
+        self._module_cache: Dict[str, Tuple[Any, str]] = {}
+        
+        # Regular files in each override directory, scanned once on first use
+        self._dir_index: Dict[str, FrozenSet[str]] = {}
     
     def get_labtype_info(self) -> Dict[str, Any]:
         """Get information about the current lab type"""
-        return self.LABTYPE_INFO.get(self.labtype, self.LABTYPE_INFO['HOL'])
+        return self._info
     
     def requires_firewall(self) -> bool:
         """Check if this lab type requires firewall"""
-        return self.get_labtype_info().get('firewall', True)
+        return self._info.get('firewall', True)
     
     def requires_proxy_filter(self) -> bool:
         """Check if this lab type requires proxy filtering"""
-        return self.get_labtype_info().get('proxy_filter', True)
+        return self._info.get('proxy_filter', True)
     
     def get_repo_pattern(self) -> str:
         """
@@ -123,7 +142,7 @@ class LabTypeLoader:
             'standard': PREFIX-XXYY format (year-based, e.g., HOL-2701, ATE-2705)
             'named': PREFIX-Name format (no year extraction, e.g., Discovery-Demo)
         """
-        return self.get_labtype_info().get('repo_pattern', 'standard')
+        return self._info.get('repo_pattern', 'standard')
     
     def get_override_path(self, subfolder: str, filename: str) -> Optional[str]:
         """
@@ -165,11 +184,24 @@ class LabTypeLoader:
         ]
         
         for path in search_paths:
-            if os.path.isfile(path):
+            directory, name = os.path.split(path)
+            if name in self._dir_files(directory):
                 return path
         
         return None
     
+    def _dir_files(self, directory: str) -> FrozenSet[str]:
+        """Names of the regular files in directory (empty if it does not exist)"""
+        files = self._dir_index.get(directory)
+        if files is None:
+            try:
+                with os.scandir(directory or '.') as it:
+                    files = frozenset(e.name for e in it if e.is_file())
+            except OSError:
+                files = frozenset()
+            self._dir_index[directory] = files
+        return files
+    
     def get_module_path(self, module_name: str) -> Optional[str]:
         """
         Find the path to a startup module, respecting override hierarchy:
@@ -183,7 +215,9 @@ class LabTypeLoader:
         :param module_name: Name of the module (without .py)
         :return: Full path to the module, or None if not found
         """
-        return self.get_override_path('Startup', f'{module_name}.py')
+        if module_name not in self._path_cache:
+            self._path_cache[module_name] = self.get_override_path('Startup', f'{module_name}.py')
+        return self._path_cache[module_name]
     
     def load_module(self, module_name: str):
         """
@@ -192,6 +226,10 @@ class LabTypeLoader:
         :param module_name: Name of the module
         :return: Tuple of (module, module_path)
         """
+        cached = self._module_cache.get(module_name)
+        if cached:
+            return cached
+        
         module_path = self.get_module_path(module_name)
         
         if not module_path:
@@ -201,11 +239,12 @@ class LabTypeLoader:
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
         
+        self._module_cache[module_name] = (module, module_path)
         return module, module_path
     
-    def get_startup_sequence(self) -> List[str]:
+    def get_startup_sequence(self) -> Sequence[str]:
         """Get the startup sequence for current labtype, falling back to default"""
-        return self.STARTUP_SEQUENCE.get(self.labtype, list(self._DEFAULT_SEQUENCE))
+        return self._sequence
     
     def run_startup(self, lsf):
         """
@@ -218,8 +257,7 @@ class LabTypeLoader:
         
         lsf.write_output(f'Starting {self.labtype} startup sequence: {sequence}')
         
-        # Define which modules are critical (failure should stop the sequence)
-        critical_modules = ['prelim', 'ESXi', 'VCF', 'VCFfinal', 'urls', 'services']
+        critical_modules = self.CRITICAL_MODULES
         
         for module_name in sequence:
             module_path = self.get_module_path(module_name)
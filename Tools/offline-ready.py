@@ -36,15 +36,19 @@ the lab without internet access. Disables all network-dependent operations
 start up cleanly using only local copies of repositories and configs.
 """
 
+import io
 import os
 import sys
 import argparse
 import subprocess
 import datetime
 import re
+import shlex
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from configparser import ConfigParser
-from pathlib import Path
+from functools import lru_cache
 
 #==============================================================================
 # CONFIGURATION
@@ -79,7 +83,13 @@ TESTING_FLAG_FILES = [
 # SSH targets
 ROUTER_HOST = 'router.site-a.vcf.lab'
 CONSOLE_HOST = 'console.site-a.vcf.lab'
-SSH_OPTIONS = '-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null'
+SSH_OPTIONS = ('-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null',
+               '-o', 'ConnectTimeout=10')
+
+# Command time budgets (seconds): local commands are quick, SSH sessions
+# get room for the connection plus the remote command
+CMD_TIMEOUT = 5
+SSH_TIMEOUT = 30
 
 # Internal domain patterns (URLs matching these are kept, all others removed)
 INTERNAL_PATTERNS = [
@@ -90,6 +100,19 @@ INTERNAL_PATTERNS = [
     r'172\.(1[6-9]|2[0-9]|3[0-1])\.\d+\.\d+',
     r'192\.168\.\d+\.\d+',
 ]
+_INTERNAL_RE = re.compile('|'.join(f'(?:{p})' for p in INTERNAL_PATTERNS))
+
+# "lockholuser = true" at the start of a line (value replaced with false)
+_LOCKHOLUSER_RE = re.compile(r'^(lockholuser\s*=\s*)true', re.MULTILINE)
+
+# A "URLS = ..." line plus its indented continuation lines (another URLS
+# key, a blank line or an unindented line ends the block)
+_URLS_KEY = r'[^\S\n]*URLS[^\S\n]*='
+_URLS_BLOCK_RE = re.compile(
+    rf'^({_URLS_KEY}([^\n]*))((?:\n(?!{_URLS_KEY})[ \t][^\n]*\S[^\n]*)*)', re.M
+)
+# One URL entry line within a block ("url[,expected text]"); comments are skipped
+_URLS_ENTRY_RE = re.compile(r'\n[ \t][^\S\n]*([^#\s][^\n]*)')
 
 
 #==============================================================================
@@ -100,6 +123,9 @@ _verbose = False
 _dry_run = False
 _log_fh = None
 
+# When this run started; every marker/flag file is stamped with it
+_run_ts = datetime.datetime.now().isoformat()
+
 
 def log(msg, level='INFO'):
     """Log a message to file and optionally to console."""
@@ -108,7 +134,9 @@ def log(msg, level='INFO'):
 
     if _log_fh:
         _log_fh.write(formatted + '\n')
-        _log_fh.flush()
+        # Buffered; errors are pushed out at once for anyone tailing the log
+        if level == 'ERROR':
+            _log_fh.flush()
 
     if level == 'ERROR':
         print(f'  ERROR: {msg}')
@@ -130,45 +158,111 @@ def action(msg):
 
 def read_password():
     """Read the lab password from creds.txt."""
-    if not os.path.isfile(CREDS_FILE):
+    try:
+        return read_file(CREDS_FILE).strip()
+    except (FileNotFoundError, IsADirectoryError):
         log(f'Credentials file not found: {CREDS_FILE}', 'ERROR')
         return None
-    with open(CREDS_FILE, 'r') as f:
-        return f.read().strip()
 
 
-def run_cmd(cmd, check=False):
-    """Run a shell command and return the result."""
+def run_cmd(cmd, check=False, input=None, env=None, timeout=CMD_TIMEOUT):
+    """Run a command (argv list, no shell) and return the result."""
     try:
         result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, timeout=30
+            cmd, input=input, env=env, capture_output=True, text=True, timeout=timeout
         )
         if check and result.returncode != 0:
-            log(f'Command failed: {cmd}\n  stderr: {result.stderr.strip()}', 'WARN')
+            log(f'Command failed: {shlex.join(cmd)}\n  stderr: {result.stderr.strip()}', 'WARN')
         return result
     except subprocess.TimeoutExpired:
-        log(f'Command timed out: {cmd}', 'WARN')
+        log(f'Command timed out: {shlex.join(cmd)}', 'WARN')
         return subprocess.CompletedProcess(cmd, 1, '', 'Timeout')
     except Exception as e:
-        log(f'Command error: {cmd}: {e}', 'ERROR')
+        log(f'Command error: {shlex.join(cmd)}: {e}', 'ERROR')
         return subprocess.CompletedProcess(cmd, 1, '', str(e))
 
 
-def ssh_cmd(host, command, password):
-    """Execute a command on a remote host via SSH."""
-    cmd = (
-        f'sshpass -p "{password}" ssh {SSH_OPTIONS} '
-        f'root@{host} "{command}"'
-    )
-    return run_cmd(cmd)
+def write_marker(path, text):
+    """Write a small marker/flag file in one write and make it mode 0644."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode())
+        # The open() mode only applies to new files (and is masked by umask)
+        os.fchmod(fd, 0o644)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def batched_output():
+    """Collect console output in memory and write it to stdout in one go."""
+    stdout = sys.stdout
+    sys.stdout = buf = io.StringIO()
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+        stdout.write(buf.getvalue())
+        stdout.flush()
+
+
+def run_step(step, *args):
+    """Run one preparation step, printing its output as a single block."""
+    with batched_output():
+        return step(*args)
+
+
+def read_file(path):
+    """Read a whole text file with one fd and a stat-sized read."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = [os.read(fd, os.fstat(fd).st_size or 65536)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, 65536))
+    finally:
+        os.close(fd)
+    return b''.join(chunks).decode()
+
+
+def rewrite_file(path, text):
+    """Replace the contents of an existing file in place."""
+    data = memoryview(text.encode())
+    fd = os.open(path, os.O_WRONLY | os.O_TRUNC)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def ssh_cmd(host, command, password, input=None):
+    """Execute a command on a remote host via SSH.
+
+    The password is handed to sshpass through $SSHPASS so it never
+    appears in the local argv (ps output or logged command lines).
+    """
+    cmd = ['sshpass', '-e', 'ssh', *SSH_OPTIONS, f'root@{host}', command]
+    return run_cmd(cmd, input=input, env={**os.environ, 'SSHPASS': password},
+                   timeout=SSH_TIMEOUT)
 
 
+@lru_cache(maxsize=None)
+def isdir_cached(path):
+    """os.path.isdir() remembered for the run.
+
+    The same few directories (some on the /lmchol NFS mount) are checked
+    by several steps, and this script never creates directories.
+    """
+    return os.path.isdir(path)
+
+
+@lru_cache(maxsize=1024)
 def is_internal_url(url):
-    """Check if a URL points to an internal lab resource."""
-    for pattern in INTERNAL_PATTERNS:
-        if re.search(pattern, url):
-            return True
-    return False
+    """Check if a URL points to an internal lab resource.
+
+    Cached: the same lab URLs recur across config.ini and holodeck/*.ini.
+    """
+    return _INTERNAL_RE.search(url) is not None
 
 
 #==============================================================================
@@ -179,26 +273,22 @@ def step_create_offline_markers():
     """Create offline-mode marker files checked by gitpull.sh scripts."""
     print('\n--- Step 1: Create offline-mode marker files ---')
 
+    marker_text = f'Offline mode enabled by offline-ready.py at {_run_ts}\n'
+
     for marker in OFFLINE_MARKERS:
         marker_dir = os.path.dirname(marker)
-        if not os.path.isdir(marker_dir):
+        if not isdir_cached(marker_dir):
             log(f'Directory does not exist, skipping marker: {marker}', 'WARN')
             continue
         action(f'Creating marker: {marker}')
         if not _dry_run:
-            with open(marker, 'w') as f:
-                f.write(f'Offline mode enabled by offline-ready.py at '
-                        f'{datetime.datetime.now().isoformat()}\n')
-            os.chmod(marker, 0o644)
+            write_marker(marker, marker_text)
 
     # Console marker (may not be mounted)
-    if os.path.isdir(LMCHOL_ROOT):
+    if isdir_cached(LMCHOL_ROOT):
         action(f'Creating marker: {LMCHOL_OFFLINE_MARKER}')
         if not _dry_run:
-            with open(LMCHOL_OFFLINE_MARKER, 'w') as f:
-                f.write(f'Offline mode enabled by offline-ready.py at '
-                        f'{datetime.datetime.now().isoformat()}\n')
-            os.chmod(LMCHOL_OFFLINE_MARKER, 0o644)
+            write_marker(LMCHOL_OFFLINE_MARKER, marker_text)
     else:
         log(f'{LMCHOL_ROOT} not mounted, skipping console marker', 'WARN')
 
@@ -214,18 +304,17 @@ def step_create_testing_flag():
     """
     print('\n--- Step 2: Create testing flag files ---')
 
+    flag_text = (f'OFFLINE MODE - Set by offline-ready.py at {_run_ts}\n'
+                 f'This file causes labstartup.sh/gitpull.sh to skip git '
+                 f'clone/pull operations.\n')
+
     created = 0
     for flag_path in TESTING_FLAG_FILES:
         flag_dir = os.path.dirname(flag_path)
-        if os.path.isdir(flag_dir):
+        if isdir_cached(flag_dir):
             action(f'Creating testing flag: {flag_path}')
             if not _dry_run:
-                with open(flag_path, 'w') as f:
-                    f.write(f'OFFLINE MODE - Set by offline-ready.py at '
-                            f'{datetime.datetime.now().isoformat()}\n'
-                            f'This file causes labstartup.sh/gitpull.sh to skip git '
-                            f'clone/pull operations.\n')
-                os.chmod(flag_path, 0o644)
+                write_marker(flag_path, flag_text)
             created += 1
         else:
             log(f'Directory does not exist, skipping flag: {flag_path}', 'WARN')
@@ -238,22 +327,59 @@ def step_create_testing_flag():
     return True
 
 
-def step_modify_config_lockholuser():
+def load_inis():
+    """Read config.ini and holodeck/*.ini into memory once.
+
+    Returns a dict of path -> file content. Steps 3 and 4 edit the
+    content in place and save_inis() writes back only what changed.
+    """
+    paths = []
+    if os.path.isfile(CONFIG_INI):
+        paths.append(CONFIG_INI)
+    else:
+        log(f'{CONFIG_INI} not found, skipping', 'WARN')
+
+    # holodeck/*.ini files are the source of truth for future boots
+    try:
+        with os.scandir(HOLODECK_DIR) as it:
+            paths.extend(sorted(
+                e.path for e in it
+                if e.name.endswith('.ini') and e.is_file()
+            ))
+    except (FileNotFoundError, NotADirectoryError):
+        log(f'{HOLODECK_DIR} not found, skipping holodeck ini files', 'WARN')
+
+    inis = {}
+    for filepath in paths:
+        try:
+            inis[filepath] = read_file(filepath)
+        except Exception as e:
+            log(f'Error reading {filepath}: {e}', 'ERROR')
+    return inis
+
+
+def save_inis(inis, originals):
+    """Write back each config file whose content was changed by steps 3-4."""
+    for filepath, content in inis.items():
+        if content == originals[filepath] or _dry_run:
+            continue
+        try:
+            rewrite_file(filepath, content)
+        except Exception as e:
+            log(f'Error writing {filepath}: {e}', 'ERROR')
+
+
+def step_modify_config_lockholuser(inis):
     """Set lockholuser = false in config.ini and holodeck/*.ini files."""
     print('\n--- Step 3: Set lockholuser = false ---')
 
     files_modified = []
 
-    # Modify /tmp/config.ini if it exists
-    if os.path.isfile(CONFIG_INI):
-        if _update_lockholuser(CONFIG_INI):
-            files_modified.append(CONFIG_INI)
-
-    # Modify all holodeck/*.ini files
-    if os.path.isdir(HOLODECK_DIR):
-        for ini_file in sorted(Path(HOLODECK_DIR).glob('*.ini')):
-            if _update_lockholuser(str(ini_file)):
-                files_modified.append(str(ini_file))
+    for filepath, content in inis.items():
+        new_content = _update_lockholuser(filepath, content)
+        if new_content is not None:
+            inis[filepath] = new_content
+            files_modified.append(filepath)
 
     if files_modified:
         log(f'Modified lockholuser in {len(files_modified)} file(s)', 'ACTION')
@@ -261,122 +387,70 @@ def step_modify_config_lockholuser():
         log('No config files found to modify', 'WARN')
 
 
-def _update_lockholuser(filepath):
-    """Update lockholuser to false in a single config file. Returns True if changed."""
-    try:
-        with open(filepath, 'r') as f:
-            content = f.read()
+def _update_lockholuser(filepath, content):
+    """Set lockholuser to false in one config file's content.
 
-        # Check if lockholuser exists and is set to true
-        if re.search(r'^lockholuser\s*=\s*true', content, re.MULTILINE):
-            action(f'Setting lockholuser = false in {filepath}')
-            if not _dry_run:
-                new_content = re.sub(
-                    r'^(lockholuser\s*=\s*)true',
-                    r'\1false',
-                    content,
-                    flags=re.MULTILINE
-                )
-                with open(filepath, 'w') as f:
-                    f.write(new_content)
-            return True
-        else:
-            log(f'lockholuser already false or not present in {filepath}')
-            return False
-    except Exception as e:
-        log(f'Error modifying {filepath}: {e}', 'ERROR')
-        return False
+    Returns the updated content, or None if nothing needed changing.
+    """
+    new_content, count = _LOCKHOLUSER_RE.subn(r'\1false', content)
+    if count:
+        action(f'Setting lockholuser = false in {filepath}')
+        return new_content
+    log(f'lockholuser already false or not present in {filepath}')
+    return None
 
 
-def _remove_external_urls_from_file(filepath):
-    """Remove external URLs from URLS key in a single config file.
+def _remove_external_urls_from_file(filepath, content):
+    """Remove external URLs from the URLS key in one config file's content.
 
-    Returns the number of external URLs removed.
+    Each URLS block is found with one regex pass over the whole file; only
+    its entry lines are looked at individually.
+    Returns (new_content, number of external URLs removed).
     """
-    try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-    except Exception as e:
-        log(f'Error reading {filepath}: {e}', 'ERROR')
-        return 0
-
-    lines = content.split('\n')
-    new_lines = []
-    in_urls_section = False
     urls_removed = []
     urls_kept = []
 
-    for line in lines:
-        stripped = line.strip()
-
-        if re.match(r'^URLS\s*=', stripped):
-            in_urls_section = True
-            url_part = stripped.split('=', 1)[1].strip()
-            if url_part and not url_part.startswith('#'):
-                url_only = url_part.split(',')[0].strip()
-                if is_internal_url(url_only):
-                    new_lines.append(line)
-                    urls_kept.append(url_only)
-                else:
-                    action(f'Removing external URL from {filepath}: {url_only}')
-                    urls_removed.append(url_only)
-                    new_lines.append(f'URLS = # External URLs removed by offline-ready.py')
+    def scrub_entry(m):
+        url_only = m.group(1).split(',')[0].strip()
+        if is_internal_url(url_only):
+            urls_kept.append(url_only)
+            return m.group(0)
+        action(f'Removing external URL from {filepath}: {url_only}')
+        urls_removed.append(url_only)
+        return ''
+
+    def scrub_block(m):
+        first_line, url_part, entries = m.groups()
+        url_part = url_part.strip()
+        if url_part and not url_part.startswith('#'):
+            url_only = url_part.split(',')[0].strip()
+            if is_internal_url(url_only):
+                urls_kept.append(url_only)
             else:
-                new_lines.append(line)
-            continue
+                action(f'Removing external URL from {filepath}: {url_only}')
+                urls_removed.append(url_only)
+                first_line = 'URLS = # External URLs removed by offline-ready.py'
+        return first_line + _URLS_ENTRY_RE.sub(scrub_entry, entries)
 
-        if in_urls_section:
-            if stripped and not stripped.startswith('#') and (
-                line.startswith(' ') or line.startswith('\t')
-            ):
-                url_only = stripped.split(',')[0].strip()
-                if is_internal_url(url_only):
-                    new_lines.append(line)
-                    urls_kept.append(url_only)
-                else:
-                    action(f'Removing external URL from {filepath}: {url_only}')
-                    urls_removed.append(url_only)
-                continue
-            elif stripped.startswith('#') and (
-                line.startswith(' ') or line.startswith('\t')
-            ):
-                new_lines.append(line)
-                continue
-            else:
-                in_urls_section = False
-                new_lines.append(line)
-                continue
-        else:
-            new_lines.append(line)
+    new_content = _URLS_BLOCK_RE.sub(scrub_block, content)
 
-    if urls_removed:
-        action(f'{filepath}: Removed {len(urls_removed)} external URL(s), '
-               f'kept {len(urls_kept)} internal URL(s)')
-        if not _dry_run:
-            with open(filepath, 'w') as f:
-                f.write('\n'.join(new_lines))
+    if not urls_removed:
+        return content, 0
 
-    return len(urls_removed)
+    action(f'{filepath}: Removed {len(urls_removed)} external URL(s), '
+           f'kept {len(urls_kept)} internal URL(s)')
+    return new_content, len(urls_removed)
 
 
-def step_remove_external_urls():
+def step_remove_external_urls(inis):
     """Remove external URLs from config.ini and holodeck/*.ini URLS sections."""
     print('\n--- Step 4: Remove external URLs from config files ---')
 
     total_removed = 0
 
-    # Process /tmp/config.ini
-    if os.path.isfile(CONFIG_INI):
-        total_removed += _remove_external_urls_from_file(CONFIG_INI)
-    else:
-        log(f'{CONFIG_INI} not found, skipping', 'WARN')
-
-    # Process holodeck/*.ini files (these are the source of truth for future boots)
-    if os.path.isdir(HOLODECK_DIR):
-        for ini_file in sorted(Path(HOLODECK_DIR).glob('*.ini')):
-            total_removed += _remove_external_urls_from_file(str(ini_file))
-    else:
-        log(f'{HOLODECK_DIR} not found, skipping holodeck ini files', 'WARN')
+    for filepath, content in inis.items():
+        inis[filepath], removed = _remove_external_urls_from_file(filepath, content)
+        total_removed += removed
 
     if total_removed == 0:
         log('No external URLs found in any config files')
@@ -390,64 +464,40 @@ def step_set_passwords(password):
         log('No password available from creds.txt', 'ERROR')
         return
 
-    # Manager - local accounts
-    action('Setting root password on Manager')
-    if not _dry_run:
-        result = run_cmd(f'echo "root:{password}" | chpasswd')
-        if result.returncode == 0:
-            log('Manager root password set successfully')
-        else:
-            log(f'Failed to set Manager root password: {result.stderr}', 'ERROR')
+    # One chpasswd per machine sets both accounts ("user:password" per line),
+    # so each remote host needs a single SSH session
+    accounts = ('root', 'holuser')
+    chpasswd_input = ''.join(f'{user}:{password}\n' for user in accounts)
+    account_desc = ' and '.join(accounts)
 
-    action('Setting holuser password on Manager')
-    if not _dry_run:
-        result = run_cmd(f'echo "holuser:{password}" | chpasswd')
-        if result.returncode == 0:
-            log('Manager holuser password set successfully')
-        else:
-            log(f'Failed to set Manager holuser password: {result.stderr}', 'ERROR')
-
-    # Router - remote via SSH
-    action(f'Setting root password on Router ({ROUTER_HOST})')
-    if not _dry_run:
-        result = ssh_cmd(ROUTER_HOST,
-                         f'echo "root:{password}" | chpasswd',
-                         password)
-        if result.returncode == 0:
-            log('Router root password set successfully')
-        else:
-            log(f'Failed to set Router root password: {result.stderr}', 'WARN')
-
-    action(f'Setting holuser password on Router ({ROUTER_HOST})')
+    # Manager - local accounts
+    action(f'Setting {account_desc} passwords on Manager')
     if not _dry_run:
-        result = ssh_cmd(ROUTER_HOST,
-                         f'echo "holuser:{password}" | chpasswd',
-                         password)
+        result = run_cmd(['chpasswd'], input=chpasswd_input)
         if result.returncode == 0:
-            log('Router holuser password set successfully')
+            log(f'Manager {account_desc} passwords set successfully')
         else:
-            log(f'Failed to set Router holuser password: {result.stderr}', 'WARN')
+            log(f'Failed to set Manager passwords: {result.stderr}', 'ERROR')
 
-    # Console - remote via SSH
-    action(f'Setting root password on Console ({CONSOLE_HOST})')
-    if not _dry_run:
-        result = ssh_cmd(CONSOLE_HOST,
-                         f'echo "root:{password}" | chpasswd',
-                         password)
-        if result.returncode == 0:
-            log('Console root password set successfully')
-        else:
-            log(f'Failed to set Console root password: {result.stderr}', 'WARN')
+    # Router and Console - remote via SSH, both sessions at once
+    remotes = (('Router', ROUTER_HOST), ('Console', CONSOLE_HOST))
+    for label, host in remotes:
+        action(f'Setting {account_desc} passwords on {label} ({host})')
+    if _dry_run:
+        return
 
-    action(f'Setting holuser password on Console ({CONSOLE_HOST})')
-    if not _dry_run:
-        result = ssh_cmd(CONSOLE_HOST,
-                         f'echo "holuser:{password}" | chpasswd',
-                         password)
-        if result.returncode == 0:
-            log('Console holuser password set successfully')
-        else:
-            log(f'Failed to set Console holuser password: {result.stderr}', 'WARN')
+    with ThreadPoolExecutor(max_workers=len(remotes)) as executor:
+        futures = [
+            executor.submit(ssh_cmd, host, 'chpasswd', password, chpasswd_input)
+            for _, host in remotes
+        ]
+        # Report in a fixed order regardless of which host answers first
+        for (label, _), future in zip(remotes, futures):
+            result = future.result()
+            if result.returncode == 0:
+                log(f'{label} {account_desc} passwords set successfully')
+            else:
+                log(f'Failed to set {label} passwords: {result.stderr}', 'WARN')
 
 
 def step_disable_vlp_agent():
@@ -467,11 +517,8 @@ def step_disable_vlp_agent():
     vlp_persistent = f'{HOLUSER_HOLROOT}/.vlp-disabled'
     action(f'Creating VLP disable marker: {vlp_persistent}')
     if not _dry_run:
-        if os.path.isdir(HOLUSER_HOLROOT):
-            with open(vlp_persistent, 'w') as f:
-                f.write(f'VLP Agent disabled by offline-ready.py at '
-                        f'{datetime.datetime.now().isoformat()}\n')
-            os.chmod(vlp_persistent, 0o644)
+        if isdir_cached(HOLUSER_HOLROOT):
+            write_marker(vlp_persistent, f'VLP Agent disabled by offline-ready.py at {_run_ts}\n')
         else:
             log(f'{HOLUSER_HOLROOT} does not exist', 'ERROR')
 
@@ -481,21 +528,28 @@ def step_verify_vpodrepo():
     print('\n--- Step 7: Verify local vpodrepo ---')
 
     vpodrepo = '/vpodrepo'
-    if not os.path.isdir(vpodrepo):
+
+    # One directory scan finds both lost+found (a mounted volume) and the
+    # lab directories; dirent types avoid a stat() per entry
+    has_lost_found = False
+    lab_dirs = []
+    try:
+        with os.scandir(vpodrepo) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                if entry.name == 'lost+found':
+                    has_lost_found = True
+                else:
+                    lab_dirs.append(entry.name)
+    except (FileNotFoundError, NotADirectoryError):
         log(f'{vpodrepo} does not exist or is not mounted', 'ERROR')
         log('The lab must have a local copy of the vpodrepo for offline use', 'ERROR')
         return False
 
-    if not os.path.isdir(f'{vpodrepo}/lost+found'):
+    if not has_lost_found:
         log(f'{vpodrepo} exists but does not appear to be a mounted volume', 'WARN')
 
-    # Check for any lab directories
-    lab_dirs = []
-    for item in os.listdir(vpodrepo):
-        item_path = os.path.join(vpodrepo, item)
-        if os.path.isdir(item_path) and item != 'lost+found':
-            lab_dirs.append(item)
-
     if lab_dirs:
         log(f'Found {len(lab_dirs)} lab directory(ies) in {vpodrepo}: '
             f'{", ".join(lab_dirs)}')
@@ -554,7 +608,7 @@ def main():
 
     # Open log file
     try:
-        _log_fh = open(LOG_FILE, 'w')
+        _log_fh = open(LOG_FILE, 'w', buffering=65536)
     except Exception:
         _log_fh = None
 
@@ -588,20 +642,26 @@ def main():
     # Execute steps
     errors = 0
 
-    step_create_offline_markers()
+    run_step(step_create_offline_markers)
 
-    if not step_create_testing_flag():
+    if not run_step(step_create_testing_flag):
         errors += 1
 
-    step_modify_config_lockholuser()
+    # Steps 3-4 edit the config files in memory; each file is written once
+    inis = run_step(load_inis)
+    originals = dict(inis)
+
+    run_step(step_modify_config_lockholuser, inis)
+
+    run_step(step_remove_external_urls, inis)
 
-    step_remove_external_urls()
+    run_step(save_inis, inis, originals)
 
-    step_set_passwords(password)
+    run_step(step_set_passwords, password)
 
-    step_disable_vlp_agent()
+    run_step(step_disable_vlp_agent)
 
-    if not step_verify_vpodrepo():
+    if not run_step(step_verify_vpodrepo):
         errors += 1
 
     # Final summary
@@ -7,17 +7,89 @@
 import os
 import datetime
 import json
+import threading
+from collections import Counter
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+# Use orjson for the state file when available (optional, faster)
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
 #==============================================================================
 # CONFIGURATION
 #==============================================================================
 
 STATUS_FILE = '/lmchol/home/holuser/startup-status.htm'
 STATE_FILE = '/tmp/startup-state.json'
+# Task changes appended between full STATE_FILE snapshots (one JSON per line)
+STATE_LOG_FILE = '/tmp/startup-state.log'
+# Log entries allowed before the next write compacts them into a snapshot
+STATE_LOG_MAX = 50
 REFRESH_SECONDS = 30
+# Seconds to coalesce a burst of task updates into one state/HTML write
+FLUSH_DELAY = 0.25
+
+#==============================================================================
+# FILE I/O
+#==============================================================================
+
+def _read_small_file(path: str) -> bytes:
+    """Read a small file with one stat-sized os.read, bypassing the io layer"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = [os.read(fd, os.fstat(fd).st_size or 65536)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, 65536))
+    finally:
+        os.close(fd)
+    return b''.join(chunks)
+
+
+def _append_file(path: str, data: bytes) -> None:
+    """Append data to path with a single O_APPEND write"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _remove_state_files() -> None:
+    """Remove the state snapshot and its change log"""
+    for path in (STATE_FILE, STATE_LOG_FILE):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _write_atomic(path: str, data) -> None:
+    """
+    Replace path with data (str or bytes) in one write plus a rename, so the
+    browser's auto-refresh and other startup modules never read a
+    half-written file
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    try:
+        with open(tmp_path, mode, buffering=65536) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 #==============================================================================
 # STATUS TYPES
@@ -31,7 +103,16 @@ class TaskStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+# Statuses that count as finished for group status and progress
+_DONE_STATUSES = frozenset((TaskStatus.COMPLETE, TaskStatus.SKIPPED))
+# Statuses that end a task; updates to them are written without debouncing
+_FINAL_STATUSES = frozenset((TaskStatus.COMPLETE, TaskStatus.FAILED, TaskStatus.SKIPPED))
+
+
+# Task/TaskGroup are read on every dashboard refresh; slots=True gives
+# fixed attribute slots instead of a per-instance __dict__
+
+@dataclass(slots=True)
 class Task:
     id: str
     name: str
@@ -67,532 +148,102 @@ class Task:
         return count_str
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskGroup:
     id: str
     name: str
     tasks: List[Task] = field(default_factory=list)
     
+    def status_counts(self) -> Counter:
+        """Number of tasks in each status, from a single pass over the tasks"""
+        return Counter(t.status for t in self.tasks)
+    
     @property
     def status(self) -> TaskStatus:
-        if not self.tasks:
-            return TaskStatus.PENDING
-        
-        statuses = [t.status for t in self.tasks]
-        
-        if TaskStatus.FAILED in statuses:
-            return TaskStatus.FAILED
-        if TaskStatus.RUNNING in statuses:
-            return TaskStatus.RUNNING
-        if all(s == TaskStatus.COMPLETE for s in statuses):
-            return TaskStatus.COMPLETE
-        if all(s == TaskStatus.SKIPPED for s in statuses):
-            return TaskStatus.SKIPPED
-        # If all tasks are either COMPLETE or SKIPPED (mixed), consider it complete
-        if all(s in [TaskStatus.COMPLETE, TaskStatus.SKIPPED] for s in statuses):
-            return TaskStatus.COMPLETE
-        return TaskStatus.PENDING
+        return _group_status(self.status_counts())
     
     @property
     def progress(self) -> float:
-        if not self.tasks:
-            return 0.0
-        completed = sum(1 for t in self.tasks if t.status in [TaskStatus.COMPLETE, TaskStatus.SKIPPED])
-        return (completed / len(self.tasks)) * 100
+        return _group_progress(self.status_counts())
+
+
+# Group status and progress are derived from status_counts(), so a render
+# can count each group's tasks once and reuse the counts everywhere
+
+def _group_status(counts: Counter) -> TaskStatus:
+    """Overall status of a group given its per-status task counts"""
+    if not counts:
+        return TaskStatus.PENDING
+    
+    statuses = counts.keys()
+    if TaskStatus.FAILED in statuses:
+        return TaskStatus.FAILED
+    if TaskStatus.RUNNING in statuses:
+        return TaskStatus.RUNNING
+    if statuses == {TaskStatus.SKIPPED}:
+        return TaskStatus.SKIPPED
+    # All COMPLETE, or a mix of COMPLETE and SKIPPED, counts as complete
+    if statuses <= _DONE_STATUSES:
+        return TaskStatus.COMPLETE
+    return TaskStatus.PENDING
+
+
+def _group_progress(counts: Counter) -> float:
+    """Percentage of a group's tasks that are complete or skipped"""
+    total = sum(counts.values())
+    if total == 0:
+        return 0.0
+    completed = counts[TaskStatus.COMPLETE] + counts[TaskStatus.SKIPPED]
+    return (completed / total) * 100
 
 
 #==============================================================================
-# STATUS DASHBOARD CLASS
+# HTML TEMPLATES
 #==============================================================================
 
-class StatusDashboard:
-    """Generate and update lab startup status HTML dashboard"""
-    
-    STATUS_ICONS = {
-        TaskStatus.PENDING: ('⏳', '#6b7280', 'Pending - Waiting to start'),
-        TaskStatus.RUNNING: ('🔄', '#3b82f6', 'Running - In progress'),
-        TaskStatus.COMPLETE: ('✅', '#22c55e', 'Complete - Successfully finished'),
-        TaskStatus.FAILED: ('❌', '#ef4444', 'Failed - Error occurred'),
-        TaskStatus.SKIPPED: ('⏭️', '#8b5cf6', 'Skipped - Not required')
-    }
-    
-    def __init__(self, lab_sku: str, load_state: bool = True):
-        self.lab_sku = lab_sku
-        self.start_time = datetime.datetime.now()
-        self.groups: Dict[str, TaskGroup] = {}
-        self.failed = False
-        self.failure_reason = ""
-        self._init_default_groups()
-        
-        # Try to load existing state to preserve progress across module calls
-        if load_state:
-            self._load_state()
-    
-    def _init_default_groups(self):
-        """
-        Initialize default task groups based on startup module sequence.
+# Static parts of the status page, built once instead of on every update
+
+_HTML_STYLE = '''    <style>
+        :root {
+            --bg-primary: #0f172a;
+            --bg-secondary: #1e293b;
+            --bg-tertiary: #334155;
+            --text-primary: #f8fafc;
+            --text-secondary: #94a3b8;
+            --accent-blue: #3b82f6;
+            --accent-green: #22c55e;
+            --accent-red: #ef4444;
+            --accent-yellow: #eab308;
+            --accent-purple: #8b5cf6;
+        }
         
-        Groups are ordered top-to-bottom matching the actual execution order
-        from labstartup.py. Each group corresponds to a Startup/ module.
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
         
-        Execution order:
-        1. prelim.py    - Preliminary checks (DNS, README, firewall)
-        2. ESXi.py      - ESXi host verification
-        3. VCF.py       - VCF startup (management cluster, NSX, vCenter)
-        4. VVF.py       - VVF startup (alternative to VCF)
-        5. vSphere.py   - vSphere configuration (clusters, VMs)
-        6. pings.py     - Network connectivity verification
-        7. services.py  - Linux services and TCP port verification
-        8. Kubernetes.py - Kubernetes certificate checks
-        9. urls.py      - URL verification
-        10. VCFfinal.py - VCF final tasks (Tanzu, VCF Automation)
-        11. final.py    - Final checks and cleanup
-        12. odyssey.py  - Odyssey client installation
-        """
-        # Define groups in execution order (top-to-bottom)
-        default_groups = [
-            # Group 1: prelim.py - Preliminary Checks
-            # Note: dns and dns_import run in labstartup.py BEFORE prelim.py is invoked
-            ('prelim', '1. Preliminary Checks (prelim.py)', [
-                ('dns', 'DNS Health Checks', 'Verify DNS resolution for all configured zones'),
-                ('dns_import', 'DNS Record Import', 'Import custom DNS records via tdns-mgr'),
-                ('readme', 'README Sync', 'Copy README to console desktop'),
-                ('update_manager', 'Update Manager', 'Disable Ubuntu update popups'),
-                ('firewall', 'Firewall Verification', 'Confirm firewall is active'),
-                ('proxy_filter', 'Proxy Filter', 'Verify proxy filtering is active'),
-                ('odyssey_cleanup', 'Odyssey Cleanup', 'Clean previous Odyssey installation files'),
-                ('vscode_proxy', 'VS Code Proxy', 'Configure VS Code proxy on console for Marketplace access'),
-                ('lab_files', 'Lab Files', 'Push lab files to console'),
-                ('holorouter_tls_renew', 'Holorouter TLS', 'Queue renew-nginx script + flag on NFS for doupdate.sh on router'),
-                ('playwright_install', 'Playwright Install', 'Install Playwright + Chromium on manager if required by config'),
-                ('vault_firefox_trust', 'Vault CA in Firefox', 'Trust Vault PKI root CA in console Firefox for auth/vault.vcf.lab'),
-            ]),
-            
-            # Group 2: ESXi.py - ESXi Host Verification
-            ('esxi', '2. ESXi Host Verification (ESXi.py)', [
-                ('host_check', 'Host Connectivity', 'Ping and verify ESXi hosts are responding'),
-                ('host_ports', 'Host Port Checks', 'Verify ESXi management ports (443, 902)'),
-            ]),
-            
-            # Group 3: VCF.py - VCF Startup (skipped for VVF labs)
-            ('vcf', '3. VCF Startup (VCF.py)', [
-                ('mgmt_cluster', 'Management Cluster', 'Connect to VCF management cluster hosts'),
-                ('exit_maintenance', 'Exit Maintenance Mode', 'Remove hosts from maintenance mode'),
-                ('datastore', 'Datastore Verification', 'Verify VCF management datastore'),
-                ('nsx_mgr', 'NSX Manager', 'Start and verify NSX Manager VM'),
-                ('nsx_edges', 'NSX Edge VMs', 'Start NSX Edge virtual machines'),
-                ('vcenter', 'vCenter Server', 'Start and verify vCenter Server'),
-            ]),
-            
-            # Group 4: VVF.py - VVF Startup (skipped for VCF labs)
-            ('vvf', '4. VVF Startup (VVF.py)', [
-                ('mgmt_cluster', 'Management Cluster', 'Connect to VVF management cluster ESXi hosts'),
-                ('exit_maintenance', 'Exit Maintenance Mode', 'Remove hosts from maintenance mode'),
-                ('datastore', 'Datastore Verification', 'Verify VVF management datastores (both sites)'),
-                ('nsx_mgr', 'NSX Manager', 'NSX Manager (skipped — VVF has no NSX)'),
-                ('nsx_edges', 'NSX Edge VMs', 'NSX Edges (skipped — VVF has no NSX)'),
-                ('vcenter', 'vCenter Server', 'Start and verify vCenter Server VMs'),
-            ]),
-            
-            # Group 5: vSphere.py - vSphere Configuration
-            ('vsphere', '5. vSphere Configuration (vSphere.py)', [
-                ('vcenter_wait', 'Wait for vCenter', 'Wait for vCenter to become available'),
-                ('vcenter_connect', 'vCenter Connection', 'Connect to vCenter servers'),
-                ('datastores', 'Datastore Verification', 'Verify all datastores are accessible'),
-                ('maintenance', 'Exit Maintenance Mode', 'Exit hosts from maintenance mode'),
-                ('drs', 'DRS Configuration', 'Configure DRS settings'),
-                ('shell_warning', 'Shell Warning Suppress', 'Suppress ESXi shell warnings'),
-                ('vcenter_ready', 'vCenter Ready', 'Verify vCenter UI is accessible'),
-                ('autostart_services', 'Autostart Services', 'Verify all autostart vCenter services are running'),
-                ('power_on_vms', 'Power On VMs', 'Power on configured virtual machines'),
-                ('power_on_vapps', 'Power On vApps', 'Power on configured vApps'),
-                ('nested_vms', 'Nested VMs Complete', 'All VM startup tasks completed'),
-            ]),
-            
-            # Group 6: pings.py - Network Connectivity
-            ('pings', '6. Network Connectivity (pings.py)', [
-                ('ping_targets', 'Ping Targets', 'Verify IP connectivity to configured hosts'),
-            ]),
-            
-            # Group 7: services.py - Service Verification
-            ('services', '7. Service Verification (services.py)', [
-                ('linux_services', 'Linux Services', 'Start and verify Linux services'),
-                ('tcp_ports', 'TCP Port Checks', 'Verify service ports are responding'),
-            ]),
-            
-            # Group 8: Kubernetes.py - Kubernetes Certificates
-            ('kubernetes', '8. Kubernetes Certificates (Kubernetes.py)', [
-                ('cert_check', 'Certificate Check', 'Check Kubernetes certificate expiration'),
-                ('cert_renew', 'Certificate Renewal', 'Renew expired certificates if needed'),
-            ]),
-            
-            # Group 9: urls.py - URL Verification
-            ('urls', '9. URL Verification (urls.py)', [
-                ('url_checks', 'URL Checks', 'Verify all configured web interfaces'),
-            ]),
-            
-            # Group 10: VCFfinal.py - VCF Final Tasks
-            ('vcffinal', '10. VCF Final Tasks (VCFfinal.py)', [
-                ('wcp_vcenter', 'WCP vCenter Services', 'Check/start vapi-endpoint, trustmanagement, wcp'),
-                ('tanzu_control', 'Supervisor Control Plane', 'Power on SCP VMs, verify Supervisor RUNNING'),
-                ('wcp_certs', 'WCP Certificate Fix', 'Fix Kubernetes certificates and webhooks on Supervisor spherelets'),
-                ('wcp_dns', 'Supervisor DNS Check', 'Verify kube-dns endpoint points to CoreDNS pods'),
-                ('svc_dns', 'Supervisor Service DNS', 'Patch vSphere Pod DNS for Supervisor Services'),
-                ('tanzu_deploy', 'Tanzu Deployment', 'Run Tanzu deployment scripts'),
-                ('vsp_vms', 'VSP Platform VMs', 'Start and verify VSP Platform virtual machines'),
-                ('vcf_components', 'VCF Components', 'Scale up VCF components on VSP management cluster'),
-                ('k8s_certs', 'K8s Certificate Check/Renewal',
-                 'Check and renew expiring K8s certs on VSP and VCFA clusters: '
-                 'kubeadm control-plane certs (Phase 1), kubelet serving certs (Phase 2), '
-                 'cluster CA extension to 10 years (Phase 3.0), '
-                 'cert-manager leaf cert renewal to 5 years (Phase 3.1), '
-                 'Antrea controller TLS (Phase 4). Threshold: 365 days.'),
-                ('vcfa_vms', 'VCF Automation VMs', 'Start VCF Automation virtual machines'),
-                ('vcfa_k8s_health', 'VCFA K8s Health Check', 'Remediate VCF Automation K8s cluster issues'),
-                ('vcfa_urls', 'VCF Automation URL Verification', 'Verify VCF Automation URLs'),
-                ('vcf_component_urls', 'VCF Component URL Checks', 'Verify VCF Component URLs'),
-                ('nsx_passwords', 'NSX Password Config', 'Clear NSX password expiration'),
-            ]),
-            
-            # Group 10b: VVFfinal.py - VVF Final Tasks (skipped for VCF labs)
-            ('vvffinal', '10b. VVF Final Tasks (VVFfinal.py)', [
-                ('vsp_vms', 'VSP Platform VMs', 'Power on VSP Platform VMs (both sites)'),
-                ('vsp_api_health', 'VSP API Health', 'Wait for VSP management API (port 5480) per site — '
-                 'power-off-marker from shutdown triggers automatic component recovery'),
-                ('k8s_certs', 'K8s Certificate Check/Renewal',
-                 'Check and renew expiring K8s certs on VSP clusters via vsp_cert_renewer.py'),
-                ('vcf_component_urls', 'VCF Component URL Checks',
-                 'Verify Fleet LCM endpoints (fleet-01a, fleet-01b) return HTTP 200/401'),
-            ]),
-
-            # Group 11: final.py - Final Checks
-            ('final', '11. Final Checks (final.py)', [
-                ('custom', 'Custom Checks', 'Lab-specific final checks'),
-                ('labcheck', 'LabCheck Schedule', 'Configure labcheck scheduled task'),
-                ('holuser_lock', 'holuser lock', 'Lock holuser account if configured'),
-                ('ready', 'Lab Ready', 'Mark lab as ready'),
-            ]),
-            
-            # Group 12: odyssey.py - Odyssey Installation
-            ('odyssey', '12. Odyssey Installation (odyssey.py)', [
-                ('install', 'Odyssey Install', 'Download and install Odyssey client'),
-            ]),
-        ]
+        body {
+            font-family: 'Segoe UI', system-ui, -apple-system, sans-serif;
+            background: var(--bg-primary);
+            color: var(--text-primary);
+            min-height: 100vh;
+            padding: 2rem;
+        }
         
-        for group_id, group_name, tasks in default_groups:
-            task_list = [
-                Task(id=f'{group_id}_{t[0]}', name=t[1], description=t[2])
-                for t in tasks
-            ]
-            self.groups[group_id] = TaskGroup(id=group_id, name=group_name, tasks=task_list)
-    
-    def update_task(self, group_id: str, task_id: str, status, message: str = "",
-                    total: int = 0, success: int = 0, failed: int = 0, skipped: int = 0):
-        """
-        Update a specific task status with optional item counts
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+        }
         
-        :param group_id: Group identifier
-        :param task_id: Task identifier (without group prefix)
-        :param status: Status string (pending, running, complete, failed, skipped) or TaskStatus enum
-        :param message: Optional status message
-        :param total: Total number of items processed (e.g., URLs, VMs, services)
-        :param success: Number of items that succeeded
-        :param failed: Number of items that failed
-        :param skipped: Number of items that were skipped
+        header {
+            text-align: center;
+            margin-bottom: 2rem;
+            padding-bottom: 1.5rem;
+            border-bottom: 1px solid var(--bg-tertiary);
+        }
         
-        Example:
-            # URL check with 6 URLs, all successful
-            dashboard.update_task('urls', 'url_checks', 'complete', 
-                                  total=6, success=6)
-            # Shows: "6 items: 6 succeeded"
-            
-            # VM startup with some failures
-            dashboard.update_task('vsphere', 'power_on_vms', 'failed',
-                                  message='Could not start all VMs',
-                                  total=10, success=8, failed=2)
-            # Shows: "10 items: 8 succeeded, 2 failed - Could not start all VMs"
-        """
-        if group_id not in self.groups:
-            return
-        
-        # Handle both string and TaskStatus enum
-        if isinstance(status, TaskStatus):
-            status_enum = status
-        else:
-            status_enum = TaskStatus(status.lower())
-        
-        full_task_id = f'{group_id}_{task_id}'
-        
-        for task in self.groups[group_id].tasks:
-            if task.id == full_task_id:
-                if status_enum == TaskStatus.RUNNING and task.start_time is None:
-                    task.start_time = datetime.datetime.now()
-                elif status_enum in (TaskStatus.COMPLETE, TaskStatus.FAILED, TaskStatus.SKIPPED):
-                    task.end_time = datetime.datetime.now()
-                
-                task.status = status_enum
-                task.message = message
-                
-                # Update item counts
-                task.total_items = total
-                task.success_items = success
-                task.failed_items = failed
-                task.skipped_items = skipped
-                break
-        
-        self._save_state()
-        self.generate_html()
-    
-    def set_failed(self, reason: str, group_id: str = None, task_id: str = None):
-        """
-        Mark the entire startup as failed.
-        
-        When a failure occurs, this method:
-        1. Sets the overall failed state and reason
-        2. Marks the specific failing task as FAILED (if provided)
-        3. If no specific task is provided, finds any RUNNING task and marks it as FAILED
-        
-        This ensures the dashboard shows both:
-        - The failure banner at the top with the error message
-        - The specific task and group that failed with FAILED status
-        
-        :param reason: Failure reason message
-        :param group_id: Optional group ID of the failing task
-        :param task_id: Optional task ID (without group prefix) of the failing task
-        """
-        self.failed = True
-        self.failure_reason = reason
-        
-        # If specific task was provided, mark it as failed
-        if group_id and task_id:
-            self.update_task(group_id, task_id, TaskStatus.FAILED, reason)
-        else:
-            # Find any currently RUNNING task and mark it as FAILED
-            # This handles the case where labfail() is called without task context
-            for gid, group in self.groups.items():
-                for task in group.tasks:
-                    if task.status == TaskStatus.RUNNING:
-                        task.status = TaskStatus.FAILED
-                        task.message = reason
-                        task.end_time = datetime.datetime.now()
-                        # Only mark the first running task as failed
-                        # (there should typically only be one)
-                        break
-                else:
-                    # Continue to next group if no running task found in this group
-                    continue
-                # Break outer loop if we found and marked a running task
-                break
-        
-        self._save_state()
-        self.generate_html()
-    
-    def skip_group(self, group_id: str, message: str = "Not applicable"):
-        """
-        Skip all tasks in a group.
-        
-        Use this to mark an entire group as skipped when it doesn't apply
-        to the current lab type (e.g., skip VVF when running VCF).
-        
-        :param group_id: Group identifier to skip
-        :param message: Optional message explaining why skipped
-        """
-        if group_id not in self.groups:
-            return
-        
-        for task in self.groups[group_id].tasks:
-            if task.status == TaskStatus.PENDING:
-                task.status = TaskStatus.SKIPPED
-                task.message = message
-        
-        self._save_state()
-        self.generate_html()
-    
-    def set_complete(self):
-        """Mark the entire startup as complete"""
-        for group in self.groups.values():
-            for task in group.tasks:
-                if task.status == TaskStatus.PENDING:
-                    task.status = TaskStatus.SKIPPED
-        self._save_state()
-        self.generate_html()
-    
-    def _load_state(self):
-        """Load state from JSON file if it exists and matches current lab_sku"""
-        try:
-            if os.path.exists(STATE_FILE):
-                with open(STATE_FILE, 'r') as f:
-                    state = json.load(f)
-                
-                # Only load state if it's for the same lab SKU
-                if state.get('lab_sku') == self.lab_sku:
-                    # Restore start time
-                    if 'start_time' in state:
-                        self.start_time = datetime.datetime.fromisoformat(state['start_time'])
-                    
-                    # Restore failure state
-                    self.failed = state.get('failed', False)
-                    self.failure_reason = state.get('failure_reason', '')
-                    
-                    # Restore task statuses
-                    if 'groups' in state:
-                        for gid, group_state in state['groups'].items():
-                            if gid in self.groups:
-                                for task_state in group_state.get('tasks', []):
-                                    task_id = task_state.get('id', '')
-                                    for task in self.groups[gid].tasks:
-                                        if task.id == task_id:
-                                            task.status = TaskStatus(task_state.get('status', 'pending'))
-                                            task.message = task_state.get('message', '')
-                                            # Restore item counts
-                                            task.total_items = task_state.get('total_items', 0)
-                                            task.success_items = task_state.get('success_items', 0)
-                                            task.failed_items = task_state.get('failed_items', 0)
-                                            task.skipped_items = task_state.get('skipped_items', 0)
-                                            break
-        except Exception:
-            # If loading fails, continue with fresh state
-            pass
-    
-    def _save_state(self):
-        """Save current state to JSON file"""
-        state = {
-            'lab_sku': self.lab_sku,
-            'start_time': self.start_time.isoformat(),
-            'failed': self.failed,
-            'failure_reason': self.failure_reason,
-            'groups': {}
-        }
-        
-        for gid, group in self.groups.items():
-            state['groups'][gid] = {
-                'name': group.name,
-                'tasks': [
-                    {
-                        'id': t.id,
-                        'name': t.name,
-                        'status': t.status.value,
-                        'message': t.message,
-                        'total_items': t.total_items,
-                        'success_items': t.success_items,
-                        'failed_items': t.failed_items,
-                        'skipped_items': t.skipped_items
-                    }
-                    for t in group.tasks
-                ]
-            }
-        
-        try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(state, f, indent=2)
-        except Exception:
-            pass
-    
-    def _get_overall_progress(self) -> float:
-        """Calculate overall progress percentage"""
-        total_tasks = sum(len(g.tasks) for g in self.groups.values())
-        if total_tasks == 0:
-            return 0.0
-        
-        completed = sum(
-            1 for g in self.groups.values() 
-            for t in g.tasks 
-            if t.status in [TaskStatus.COMPLETE, TaskStatus.SKIPPED]
-        )
-        return (completed / total_tasks) * 100
-    
-    def _get_elapsed_time(self) -> str:
-        """Get elapsed time as formatted string"""
-        elapsed = datetime.datetime.now() - self.start_time
-        minutes = int(elapsed.total_seconds() // 60)
-        seconds = int(elapsed.total_seconds() % 60)
-        return f"{minutes}m {seconds}s"
-    
-    def generate_html(self) -> str:
-        """Generate the HTML status page"""
-        progress = self._get_overall_progress()
-        elapsed = self._get_elapsed_time()
-        
-        # Determine overall status
-        has_failed_tasks = any(
-            t.status == TaskStatus.FAILED
-            for g in self.groups.values()
-            for t in g.tasks
-        )
-        
-        if self.failed or has_failed_tasks:
-            overall_status = "FAILED"
-            status_color = "#ef4444"
-        elif progress >= 100:
-            overall_status = "READY"
-            status_color = "#22c55e"
-        else:
-            has_running = any(
-                t.status == TaskStatus.RUNNING 
-                for g in self.groups.values() 
-                for t in g.tasks
-            )
-            has_completed = any(
-                t.status in [TaskStatus.COMPLETE, TaskStatus.SKIPPED]
-                for g in self.groups.values() 
-                for t in g.tasks
-            )
-            
-            if has_running or has_completed:
-                overall_status = "RUNNING"
-                status_color = "#f59e0b"  # Amber/orange for running
-            else:
-                overall_status = "STARTING"
-                status_color = "#3b82f6"
-        
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="refresh" content="{REFRESH_SECONDS}">
-    <title>{self.lab_sku} - Lab Startup Status</title>
-    <style>
-        :root {{
-            --bg-primary: #0f172a;
-            --bg-secondary: #1e293b;
-            --bg-tertiary: #334155;
-            --text-primary: #f8fafc;
-            --text-secondary: #94a3b8;
-            --accent-blue: #3b82f6;
-            --accent-green: #22c55e;
-            --accent-red: #ef4444;
-            --accent-yellow: #eab308;
-            --accent-purple: #8b5cf6;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', system-ui, -apple-system, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            min-height: 100vh;
-            padding: 2rem;
-        }}
-        
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-        
-        header {{
-            text-align: center;
-            margin-bottom: 2rem;
-            padding-bottom: 1.5rem;
-            border-bottom: 1px solid var(--bg-tertiary);
-        }}
-        
-        h1 {{
+        h1 {
             font-size: 2.5rem;
             font-weight: 700;
             margin-bottom: 0.5rem;
@@ -600,292 +251,927 @@ class StatusDashboard:
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
-        }}
+        }
         
-        .status-badge {{
+        .status-badge {
             display: inline-block;
             padding: 0.5rem 1.5rem;
             border-radius: 9999px;
             font-weight: 600;
             font-size: 1.1rem;
-            background: {status_color};
             color: white;
             margin: 1rem 0;
-        }}
+        }
         
-        .meta-info {{
+        .meta-info {
             display: flex;
             justify-content: center;
             gap: 2rem;
             color: var(--text-secondary);
             font-size: 0.9rem;
-        }}
+        }
         
-        .progress-container {{
+        .progress-container {
             background: var(--bg-secondary);
             border-radius: 1rem;
             padding: 1.5rem;
             margin-bottom: 2rem;
-        }}
+        }
         
-        .progress-bar {{
+        .progress-bar {
             height: 1.5rem;
             background: var(--bg-tertiary);
             border-radius: 0.75rem;
             overflow: hidden;
             margin-bottom: 0.5rem;
-        }}
+        }
         
-        .progress-fill {{
+        .progress-fill {
             height: 100%;
             background: linear-gradient(90deg, var(--accent-blue), var(--accent-green));
             border-radius: 0.75rem;
             transition: width 0.5s ease;
-            width: {progress:.1f}%;
-        }}
+        }
         
-        .progress-text {{
+        .progress-text {
             text-align: center;
             color: var(--text-secondary);
-        }}
+        }
         
-        .task-groups {{
+        .task-groups {
             display: grid;
             gap: 1.5rem;
-        }}
+        }
         
-        .task-group {{
+        .task-group {
             background: var(--bg-secondary);
             border-radius: 1rem;
             padding: 1.5rem;
             border-left: 4px solid var(--accent-blue);
-        }}
+        }
         
-        .task-group.complete {{
+        .task-group.complete {
             border-left-color: var(--accent-green);
-        }}
+        }
         
-        .task-group.failed {{
+        .task-group.failed {
             border-left-color: var(--accent-red);
-        }}
+        }
         
-        .task-group.running {{
+        .task-group.running {
             border-left-color: var(--accent-yellow);
-        }}
+        }
         
-        .group-header {{
+        .group-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 1rem;
             cursor: pointer;
             user-select: none;
-        }}
+        }
         
-        .group-header:hover {{
+        .group-header:hover {
             opacity: 0.9;
-        }}
+        }
         
-        .group-title {{
+        .group-title {
             font-size: 1.25rem;
             font-weight: 600;
             display: flex;
             align-items: center;
             gap: 0.5rem;
-        }}
+        }
         
-        .group-toggle {{
+        .group-toggle {
             font-size: 0.8rem;
             transition: transform 0.3s ease;
-        }}
+        }
         
-        .group-toggle.collapsed {{
+        .group-toggle.collapsed {
             transform: rotate(-90deg);
-        }}
+        }
         
-        .group-status-icon {{
+        .group-status-icon {
             font-size: 1.2rem;
-        }}
+        }
         
-        .group-progress {{
+        .group-progress {
             font-size: 0.9rem;
             color: var(--text-secondary);
-        }}
+        }
         
-        .tasks {{
+        .tasks {
             display: grid;
             gap: 0.75rem;
             transition: max-height 0.3s ease, opacity 0.3s ease;
             overflow: hidden;
-        }}
+        }
         
-        .tasks.collapsed {{
+        .tasks.collapsed {
             max-height: 0;
             opacity: 0;
             margin-top: 0;
-        }}
+        }
         
-        .tasks.expanded {{
+        .tasks.expanded {
             max-height: 2000px;
             opacity: 1;
-        }}
+        }
         
-        .task {{
+        .task {
             display: flex;
             align-items: center;
             gap: 1rem;
             padding: 0.75rem 1rem;
             background: var(--bg-tertiary);
             border-radius: 0.5rem;
-        }}
+        }
+        
+        .task-icon {
+            font-size: 1.25rem;
+            width: 2rem;
+            text-align: center;
+        }
+        
+        .task-info {
+            flex: 1;
+        }
+        
+        .task-name {
+            font-weight: 500;
+        }
+        
+        .task-desc {
+            font-size: 0.8rem;
+            color: var(--text-secondary);
+        }
+        
+        .task-message {
+            font-size: 0.8rem;
+            color: var(--accent-yellow);
+        }
+        
+        .task-details {
+            font-size: 0.8rem;
+            color: var(--accent-green);
+            margin-top: 0.25rem;
+        }
+        
+        .task-details.has-failures {
+            color: var(--accent-red);
+        }
+        
+        .task-details .count-success {
+            color: var(--accent-green);
+        }
+        
+        .task-details .count-failed {
+            color: var(--accent-red);
+        }
+        
+        .task-details .count-skipped {
+            color: var(--accent-purple);
+        }
+        
+        .legend {
+            margin-top: 2rem;
+            padding: 1.5rem;
+            background: var(--bg-secondary);
+            border-radius: 1rem;
+        }
+        
+        .legend h3 {
+            margin-bottom: 1rem;
+            color: var(--text-secondary);
+        }
+        
+        .legend-items {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 1.5rem;
+        }
+        
+        .legend-item {
+            display: flex;
+            align-items: center;
+            gap: 0.5rem;
+        }
+        
+        .failure-banner {
+            background: #fecaca;
+            border: 2px solid var(--accent-red);
+            color: #7f1d1d;
+            padding: 1.5rem;
+            border-radius: 1rem;
+            margin-bottom: 2rem;
+            text-align: center;
+        }
+        
+        .failure-banner h2 {
+            margin-bottom: 0.5rem;
+            color: #991b1b;
+        }
+        
+        .failure-banner .fail-icon {
+            font-size: 2rem;
+            margin-bottom: 0.5rem;
+        }
+        
+        .auto-refresh {
+            text-align: center;
+            color: var(--text-secondary);
+            font-size: 0.8rem;
+            margin-top: 2rem;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+'''
+
+_HTML_LEGEND_HEAD = '''
+        </div>
+        
+        <div class="legend">
+            <h3>Status Legend</h3>
+            <div class="legend-items">
+'''
+
+_HTML_LEGEND_ITEM = '''
+                <div class="legend-item">
+                    <span>{icon}</span>
+                    <span>{label}</span>
+                </div>
+'''
+
+_HTML_TAIL = f'''
+            </div>
+        </div>
+        
+        <div class="auto-refresh">
+            Auto-refreshing every {REFRESH_SECONDS} seconds
+        </div>
+    </div>
+    
+    <script>
+        function toggleGroup(header) {{
+            const tasks = header.nextElementSibling;
+            const toggle = header.querySelector('.group-toggle');
+            
+            if (tasks.classList.contains('collapsed')) {{
+                tasks.classList.remove('collapsed');
+                tasks.classList.add('expanded');
+                toggle.classList.remove('collapsed');
+            }} else {{
+                tasks.classList.remove('expanded');
+                tasks.classList.add('collapsed');
+                toggle.classList.add('collapsed');
+            }}
+        }}
+    </script>
+</body>
+</html>
+'''
+
+
+#==============================================================================
+# STATUS DASHBOARD CLASS
+#==============================================================================
+
+# Dashboards in this process with a debounced write still pending. Startup
+# modules run in one process and each creates its own StatusDashboard, so a
+# new one writes these out before loading state.
+_pending_dashboards = set()
+
+# Serialises snapshot/log writes between dashboards in this process, so a
+# snapshot never removes a log entry appended while it was being written
+_state_file_lock = threading.Lock()
+
+
+class StatusDashboard:
+    """Generate and update lab startup status HTML dashboard"""
+    
+    STATUS_ICONS = {
+        TaskStatus.PENDING: ('⏳', '#6b7280', 'Pending - Waiting to start'),
+        TaskStatus.RUNNING: ('🔄', '#3b82f6', 'Running - In progress'),
+        TaskStatus.COMPLETE: ('✅', '#22c55e', 'Complete - Successfully finished'),
+        TaskStatus.FAILED: ('❌', '#ef4444', 'Failed - Error occurred'),
+        TaskStatus.SKIPPED: ('⏭️', '#8b5cf6', 'Skipped - Not required')
+    }
+    
+    # Legend and closing markup depend only on STATUS_ICONS - rendered once
+    _HTML_FOOTER = _HTML_LEGEND_HEAD + ''.join(
+        _HTML_LEGEND_ITEM.format(icon=icon, label=status.value.title())
+        for status, (icon, _, _) in STATUS_ICONS.items()
+    ) + _HTML_TAIL
+    
+    def __init__(self, lab_sku: str, load_state: bool = True):
+        self.lab_sku = lab_sku
+        self.start_time = datetime.datetime.now()
+        self.groups: Dict[str, TaskGroup] = {}
+        # Every task by its full '<group>_<task>' id, for O(1) lookup on update
+        self._tasks: Dict[str, Task] = {}
+        self.failed = False
+        self.failure_reason = ""
+        self._init_default_groups()
+        
+        # Pending-write state for the debounced flush (see _mark_dirty)
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        
+        # Task changes not yet written, and entries already in STATE_LOG_FILE.
+        # Until a snapshot for this lab_sku exists, the next write is a full one.
+        self._log_entries: Dict[str, dict] = {}
+        self._log_count = 0
+        self._needs_snapshot = True
+        # Whether this dashboard shares the state files with other dashboards
+        self._shares_state = load_state
+        
+        # Try to load existing state to preserve progress across module calls
+        if load_state:
+            for dashboard in list(_pending_dashboards):
+                dashboard.generate_html()
+            self._load_state()
+    
+    def _init_default_groups(self):
+        """
+        Initialize default task groups based on startup module sequence.
+        
+        Groups are ordered top-to-bottom matching the actual execution order
+        from labstartup.py. Each group corresponds to a Startup/ module.
+        
+        Execution order:
+        1. prelim.py    - Preliminary checks (DNS, README, firewall)
+        2. ESXi.py      - ESXi host verification
+        3. VCF.py       - VCF startup (management cluster, NSX, vCenter)
+        4. VVF.py       - VVF startup (alternative to VCF)
+        5. vSphere.py   - vSphere configuration (clusters, VMs)
+        6. pings.py     - Network connectivity verification
+        7. services.py  - Linux services and TCP port verification
+        8. Kubernetes.py - Kubernetes certificate checks
+        9. urls.py      - URL verification
+        10. VCFfinal.py - VCF final tasks (Tanzu, VCF Automation)
+        11. final.py    - Final checks and cleanup
+        12. odyssey.py  - Odyssey client installation
+        """
+        # Define groups in execution order (top-to-bottom)
+        default_groups = [
+            # Group 1: prelim.py - Preliminary Checks
+            # Note: dns and dns_import run in labstartup.py BEFORE prelim.py is invoked
+            ('prelim', '1. Preliminary Checks (prelim.py)', [
+                ('dns', 'DNS Health Checks', 'Verify DNS resolution for all configured zones'),
+                ('dns_import', 'DNS Record Import', 'Import custom DNS records via tdns-mgr'),
+                ('readme', 'README Sync', 'Copy README to console desktop'),
+                ('update_manager', 'Update Manager', 'Disable Ubuntu update popups'),
+                ('firewall', 'Firewall Verification', 'Confirm firewall is active'),
+                ('proxy_filter', 'Proxy Filter', 'Verify proxy filtering is active'),
+                ('odyssey_cleanup', 'Odyssey Cleanup', 'Clean previous Odyssey installation files'),
+                ('vscode_proxy', 'VS Code Proxy', 'Configure VS Code proxy on console for Marketplace access'),
+                ('lab_files', 'Lab Files', 'Push lab files to console'),
+                ('holorouter_tls_renew', 'Holorouter TLS', 'Queue renew-nginx script + flag on NFS for doupdate.sh on router'),
+                ('playwright_install', 'Playwright Install', 'Install Playwright + Chromium on manager if required by config'),
+                ('vault_firefox_trust', 'Vault CA in Firefox', 'Trust Vault PKI root CA in console Firefox for auth/vault.vcf.lab'),
+            ]),
+            
+            # Group 2: ESXi.py - ESXi Host Verification
+            ('esxi', '2. ESXi Host Verification (ESXi.py)', [
+                ('host_check', 'Host Connectivity', 'Ping and verify ESXi hosts are responding'),
+                ('host_ports', 'Host Port Checks', 'Verify ESXi management ports (443, 902)'),
+            ]),
+            
+            # Group 3: VCF.py - VCF Startup (skipped for VVF labs)
+            ('vcf', '3. VCF Startup (VCF.py)', [
+                ('mgmt_cluster', 'Management Cluster', 'Connect to VCF management cluster hosts'),
+                ('exit_maintenance', 'Exit Maintenance Mode', 'Remove hosts from maintenance mode'),
+                ('datastore', 'Datastore Verification', 'Verify VCF management datastore'),
+                ('nsx_mgr', 'NSX Manager', 'Start and verify NSX Manager VM'),
+                ('nsx_edges', 'NSX Edge VMs', 'Start NSX Edge virtual machines'),
+                ('vcenter', 'vCenter Server', 'Start and verify vCenter Server'),
+            ]),
+            
+            # Group 4: VVF.py - VVF Startup (skipped for VCF labs)
+            ('vvf', '4. VVF Startup (VVF.py)', [
+                ('mgmt_cluster', 'Management Cluster', 'Connect to VVF management cluster ESXi hosts'),
+                ('exit_maintenance', 'Exit Maintenance Mode', 'Remove hosts from maintenance mode'),
+                ('datastore', 'Datastore Verification', 'Verify VVF management datastores (both sites)'),
+                ('nsx_mgr', 'NSX Manager', 'NSX Manager (skipped — VVF has no NSX)'),
+                ('nsx_edges', 'NSX Edge VMs', 'NSX Edges (skipped — VVF has no NSX)'),
+                ('vcenter', 'vCenter Server', 'Start and verify vCenter Server VMs'),
+            ]),
+            
+            # Group 5: vSphere.py - vSphere Configuration
+            ('vsphere', '5. vSphere Configuration (vSphere.py)', [
+                ('vcenter_wait', 'Wait for vCenter', 'Wait for vCenter to become available'),
+                ('vcenter_connect', 'vCenter Connection', 'Connect to vCenter servers'),
+                ('datastores', 'Datastore Verification', 'Verify all datastores are accessible'),
+                ('maintenance', 'Exit Maintenance Mode', 'Exit hosts from maintenance mode'),
+                ('drs', 'DRS Configuration', 'Configure DRS settings'),
+                ('shell_warning', 'Shell Warning Suppress', 'Suppress ESXi shell warnings'),
+                ('vcenter_ready', 'vCenter Ready', 'Verify vCenter UI is accessible'),
+                ('autostart_services', 'Autostart Services', 'Verify all autostart vCenter services are running'),
+                ('power_on_vms', 'Power On VMs', 'Power on configured virtual machines'),
+                ('power_on_vapps', 'Power On vApps', 'Power on configured vApps'),
+                ('nested_vms', 'Nested VMs Complete', 'All VM startup tasks completed'),
+            ]),
+            
+            # Group 6: pings.py - Network Connectivity
+            ('pings', '6. Network Connectivity (pings.py)', [
+                ('ping_targets', 'Ping Targets', 'Verify IP connectivity to configured hosts'),
+            ]),
+            
+            # Group 7: services.py - Service Verification
+            ('services', '7. Service Verification (services.py)', [
+                ('linux_services', 'Linux Services', 'Start and verify Linux services'),
+                ('tcp_ports', 'TCP Port Checks', 'Verify service ports are responding'),
+            ]),
+            
+            # Group 8: Kubernetes.py - Kubernetes Certificates
+            ('kubernetes', '8. Kubernetes Certificates (Kubernetes.py)', [
+                ('cert_check', 'Certificate Check', 'Check Kubernetes certificate expiration'),
+                ('cert_renew', 'Certificate Renewal', 'Renew expired certificates if needed'),
+            ]),
+            
+            # Group 9: urls.py - URL Verification
+            ('urls', '9. URL Verification (urls.py)', [
+                ('url_checks', 'URL Checks', 'Verify all configured web interfaces'),
+            ]),
+            
+            # Group 10: VCFfinal.py - VCF Final Tasks
+            ('vcffinal', '10. VCF Final Tasks (VCFfinal.py)', [
+                ('wcp_vcenter', 'WCP vCenter Services', 'Check/start vapi-endpoint, trustmanagement, wcp'),
+                ('tanzu_control', 'Supervisor Control Plane', 'Power on SCP VMs, verify Supervisor RUNNING'),
+                ('wcp_certs', 'WCP Certificate Fix', 'Fix Kubernetes certificates and webhooks on Supervisor spherelets'),
+                ('wcp_dns', 'Supervisor DNS Check', 'Verify kube-dns endpoint points to CoreDNS pods'),
+                ('svc_dns', 'Supervisor Service DNS', 'Patch vSphere Pod DNS for Supervisor Services'),
+                ('tanzu_deploy', 'Tanzu Deployment', 'Run Tanzu deployment scripts'),
+                ('vsp_vms', 'VSP Platform VMs', 'Start and verify VSP Platform virtual machines'),
+                ('vcf_components', 'VCF Components', 'Scale up VCF components on VSP management cluster'),
+                ('k8s_certs', 'K8s Certificate Check/Renewal',
+                 'Check and renew expiring K8s certs on VSP and VCFA clusters: '
+                 'kubeadm control-plane certs (Phase 1), kubelet serving certs (Phase 2), '
+                 'cluster CA extension to 10 years (Phase 3.0), '
+                 'cert-manager leaf cert renewal to 5 years (Phase 3.1), '
+                 'Antrea controller TLS (Phase 4). Threshold: 365 days.'),
+                ('vcfa_vms', 'VCF Automation VMs', 'Start VCF Automation virtual machines'),
+                ('vcfa_k8s_health', 'VCFA K8s Health Check', 'Remediate VCF Automation K8s cluster issues'),
+                ('vcfa_urls', 'VCF Automation URL Verification', 'Verify VCF Automation URLs'),
+                ('vcf_component_urls', 'VCF Component URL Checks', 'Verify VCF Component URLs'),
+                ('nsx_passwords', 'NSX Password Config', 'Clear NSX password expiration'),
+            ]),
+            
+            # Group 10b: VVFfinal.py - VVF Final Tasks (skipped for VCF labs)
+            ('vvffinal', '10b. VVF Final Tasks (VVFfinal.py)', [
+                ('vsp_vms', 'VSP Platform VMs', 'Power on VSP Platform VMs (both sites)'),
+                ('vsp_api_health', 'VSP API Health', 'Wait for VSP management API (port 5480) per site — '
+                 'power-off-marker from shutdown triggers automatic component recovery'),
+                ('k8s_certs', 'K8s Certificate Check/Renewal',
+                 'Check and renew expiring K8s certs on VSP clusters via vsp_cert_renewer.py'),
+                ('vcf_component_urls', 'VCF Component URL Checks',
+                 'Verify Fleet LCM endpoints (fleet-01a, fleet-01b) return HTTP 200/401'),
+            ]),
+
+            # Group 11: final.py - Final Checks
+            ('final', '11. Final Checks (final.py)', [
+                ('custom', 'Custom Checks', 'Lab-specific final checks'),
+                ('labcheck', 'LabCheck Schedule', 'Configure labcheck scheduled task'),
+                ('holuser_lock', 'holuser lock', 'Lock holuser account if configured'),
+                ('ready', 'Lab Ready', 'Mark lab as ready'),
+            ]),
+            
+            # Group 12: odyssey.py - Odyssey Installation
+            ('odyssey', '12. Odyssey Installation (odyssey.py)', [
+                ('install', 'Odyssey Install', 'Download and install Odyssey client'),
+            ]),
+        ]
+        
+        for group_id, group_name, tasks in default_groups:
+            task_list = [
+                Task(id=f'{group_id}_{t[0]}', name=t[1], description=t[2])
+                for t in tasks
+            ]
+            self.groups[group_id] = TaskGroup(id=group_id, name=group_name, tasks=task_list)
+            self._tasks.update((task.id, task) for task in task_list)
+    
+    def update_task(self, group_id: str, task_id: str, status, message: str = "",
+                    total: int = 0, success: int = 0, failed: int = 0, skipped: int = 0):
+        """
+        Update a specific task status with optional item counts
+        
+        :param group_id: Group identifier
+        :param task_id: Task identifier (without group prefix)
+        :param status: Status string (pending, running, complete, failed, skipped) or TaskStatus enum
+        :param message: Optional status message
+        :param total: Total number of items processed (e.g., URLs, VMs, services)
+        :param success: Number of items that succeeded
+        :param failed: Number of items that failed
+        :param skipped: Number of items that were skipped
+        
+        Example:
+            # URL check with 6 URLs, all successful
+            dashboard.update_task('urls', 'url_checks', 'complete', 
+                                  total=6, success=6)
+            # Shows: "6 items: 6 succeeded"
+            
+            # VM startup with some failures
+            dashboard.update_task('vsphere', 'power_on_vms', 'failed',
+                                  message='Could not start all VMs',
+                                  total=10, success=8, failed=2)
+            # Shows: "10 items: 8 succeeded, 2 failed - Could not start all VMs"
+        """
+        if group_id not in self.groups:
+            return
+        
+        # Handle both string and TaskStatus enum
+        if isinstance(status, TaskStatus):
+            status_enum = status
+        else:
+            status_enum = TaskStatus(status.lower())
         
-        .task-icon {{
-            font-size: 1.25rem;
-            width: 2rem;
-            text-align: center;
-        }}
+        task = self._tasks.get(f'{group_id}_{task_id}')
+        if task is None:
+            return
         
-        .task-info {{
-            flex: 1;
-        }}
+        if status_enum == TaskStatus.RUNNING and task.start_time is None:
+            task.start_time = datetime.datetime.now()
+        elif status_enum in _FINAL_STATUSES:
+            task.end_time = datetime.datetime.now()
+        
+        task.status = status_enum
+        task.message = message
+        
+        # Update item counts
+        task.total_items = total
+        task.success_items = success
+        task.failed_items = failed
+        task.skipped_items = skipped
+        # A module's last update is usually a final status, often with no
+        # generate_html() after it, so those are written straight away
+        self._mark_dirty(task, immediate=status_enum in _FINAL_STATUSES)
+    
+    def set_failed(self, reason: str, group_id: str = None, task_id: str = None):
+        """
+        Mark the entire startup as failed.
         
-        .task-name {{
-            font-weight: 500;
-        }}
+        When a failure occurs, this method:
+        1. Sets the overall failed state and reason
+        2. Marks the specific failing task as FAILED (if provided)
+        3. If no specific task is provided, finds any RUNNING task and marks it as FAILED
         
-        .task-desc {{
-            font-size: 0.8rem;
-            color: var(--text-secondary);
-        }}
+        This ensures the dashboard shows both:
+        - The failure banner at the top with the error message
+        - The specific task and group that failed with FAILED status
         
-        .task-message {{
-            font-size: 0.8rem;
-            color: var(--accent-yellow);
-        }}
+        :param reason: Failure reason message
+        :param group_id: Optional group ID of the failing task
+        :param task_id: Optional task ID (without group prefix) of the failing task
+        """
+        self.failed = True
+        self.failure_reason = reason
         
-        .task-details {{
-            font-size: 0.8rem;
-            color: var(--accent-green);
-            margin-top: 0.25rem;
-        }}
+        # If specific task was provided, mark it as failed
+        if group_id and task_id:
+            self.update_task(group_id, task_id, TaskStatus.FAILED, reason)
+        else:
+            # Find any currently RUNNING task and mark it as FAILED
+            # This handles the case where labfail() is called without task context
+            self._refresh_tasks()
+            for group in self.groups.values():
+                for task in group.tasks:
+                    if task.status == TaskStatus.RUNNING:
+                        task.status = TaskStatus.FAILED
+                        task.message = reason
+                        task.end_time = datetime.datetime.now()
+                        # Only mark the first running task as failed
+                        # (there should typically only be one)
+                        self.flush(task)
+                        return
         
-        .task-details.has-failures {{
-            color: var(--accent-red);
-        }}
+        self.flush()
+    
+    def skip_group(self, group_id: str, message: str = "Not applicable"):
+        """
+        Skip all tasks in a group.
         
-        .task-details .count-success {{
-            color: var(--accent-green);
-        }}
+        Use this to mark an entire group as skipped when it doesn't apply
+        to the current lab type (e.g., skip VVF when running VCF).
         
-        .task-details .count-failed {{
-            color: var(--accent-red);
-        }}
+        :param group_id: Group identifier to skip
+        :param message: Optional message explaining why skipped
+        """
+        if group_id not in self.groups:
+            return
         
-        .task-details .count-skipped {{
-            color: var(--accent-purple);
-        }}
+        skipped = []
+        for task in self.groups[group_id].tasks:
+            if task.status == TaskStatus.PENDING:
+                task.status = TaskStatus.SKIPPED
+                task.message = message
+                skipped.append(task)
         
-        .legend {{
-            margin-top: 2rem;
-            padding: 1.5rem;
-            background: var(--bg-secondary);
-            border-radius: 1rem;
-        }}
+        self._mark_dirty(*skipped, immediate=True)
+    
+    def set_complete(self):
+        """Mark the entire startup as complete"""
+        self._refresh_tasks()
+        skipped = []
+        for group in self.groups.values():
+            for task in group.tasks:
+                if task.status == TaskStatus.PENDING:
+                    task.status = TaskStatus.SKIPPED
+                    skipped.append(task)
+        self.flush(*skipped)
+    
+    def _mark_dirty(self, *tasks: Task, immediate: bool = False):
+        """
+        Queue the changed tasks for the state log and write state/HTML now
+        if immediate, else FLUSH_DELAY seconds from now.
         
-        .legend h3 {{
-            margin-bottom: 1rem;
-            color: var(--text-secondary);
-        }}
+        A burst of updates shares the one pending timer, so it costs a single
+        write instead of one per update. The timer thread is non-daemon, so a
+        pending write still happens if the process exits before it fires.
+        """
+        with self._lock:
+            for task in tasks:
+                self._log_entries[task.id] = self._task_state(task)
+            self._dirty = True
+            if immediate:
+                self.generate_html()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DELAY, self.generate_html)
+                self._flush_timer.start()
+                _pending_dashboards.add(self)
+    
+    def flush(self, *tasks: Task):
+        """
+        Save a full state snapshot, including the changed tasks, and write
+        the HTML page now, for terminal states
+        """
+        with self._lock:
+            self._needs_snapshot = True
+            self._mark_dirty(*tasks, immediate=True)
+    
+    def _load_state(self):
+        """Load state from JSON file if it exists and matches current lab_sku"""
+        try:
+            state = json_loads(_read_small_file(STATE_FILE))
+            
+            # Only load state if it's for the same lab SKU
+            if state.get('lab_sku') == self.lab_sku:
+                # Restore start time
+                if 'start_time' in state:
+                    self.start_time = datetime.datetime.fromisoformat(state['start_time'])
+                
+                # Restore failure state
+                self.failed = state.get('failed', False)
+                self.failure_reason = state.get('failure_reason', '')
+                
+                # Restore task statuses
+                self._restore_tasks(state)
+                
+                self._needs_snapshot = False
+                self._replay_log()
+        except Exception:
+            # No state file yet, or loading fails: continue with fresh state
+            pass
+    
+    def _restore_tasks(self, state: dict):
+        """Restore every task saved in a state snapshot"""
+        for group_state in state.get('groups', {}).values():
+            for task_state in group_state.get('tasks', []):
+                task = self._tasks.get(task_state.get('id', ''))
+                if task is not None:
+                    self._restore_task(task, task_state)
+    
+    def _refresh_tasks(self):
+        """Bring tasks up to date with what other dashboards have saved"""
+        if self._shares_state:
+            with self._lock, _state_file_lock:
+                self._merge_saved_tasks()
+    
+    def _merge_saved_tasks(self):
+        """
+        Pick up task changes other dashboards saved since this one loaded:
+        re-read the snapshot and log, then re-apply this dashboard's own
+        unwritten changes on top. Run before writing a snapshot, which
+        replaces both files.
+        """
+        try:
+            state = json_loads(_read_small_file(STATE_FILE))
+        except Exception:
+            return
+        if state.get('lab_sku') != self.lab_sku:
+            return
         
-        .legend-items {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 1.5rem;
-        }}
+        self._restore_tasks(state)
+        self._replay_log()
+        for task_state in self._log_entries.values():
+            self._restore_task(self._tasks[task_state['id']], task_state)
+    
+    def _replay_log(self):
+        """Apply task changes logged since the snapshot was written"""
+        try:
+            data = _read_small_file(STATE_LOG_FILE)
+        except FileNotFoundError:
+            return
         
-        .legend-item {{
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }}
+        for line in data.splitlines():
+            try:
+                task_state = json_loads(line)
+            except ValueError:
+                # Torn final line from an interrupted append
+                continue
+            task = self._tasks.get(task_state.get('id', ''))
+            if task is not None:
+                self._restore_task(task, task_state)
+            self._log_count += 1
+    
+    @staticmethod
+    def _restore_task(task: Task, task_state: dict):
+        """Restore a task's status, message and item counts from saved state"""
+        task.status = TaskStatus(task_state.get('status', 'pending'))
+        task.message = task_state.get('message', '')
+        # Restore item counts
+        task.total_items = task_state.get('total_items', 0)
+        task.success_items = task_state.get('success_items', 0)
+        task.failed_items = task_state.get('failed_items', 0)
+        task.skipped_items = task_state.get('skipped_items', 0)
+    
+    @staticmethod
+    def _task_state(task: Task) -> dict:
+        """Saved state of a single task, as stored in the snapshot and the log"""
+        return {
+            'id': task.id,
+            'name': task.name,
+            'status': task.status.value,
+            'message': task.message,
+            'total_items': task.total_items,
+            'success_items': task.success_items,
+            'failed_items': task.failed_items,
+            'skipped_items': task.skipped_items
+        }
+    
+    def _append_log(self):
+        """Append the pending task changes to STATE_LOG_FILE"""
+        entries = list(self._log_entries.values())
+        self._log_entries.clear()
+        try:
+            with _state_file_lock:
+                _append_file(STATE_LOG_FILE, b''.join(json_dumps(e) + b'\n' for e in entries))
+            self._log_count += len(entries)
+        except Exception:
+            # Changes not logged: write them with the next snapshot instead
+            self._needs_snapshot = True
+    
+    def _save_state(self):
+        """Save a full snapshot of the current state and truncate the change log"""
+        with _state_file_lock:
+            if self._shares_state:
+                self._merge_saved_tasks()
+            self._write_snapshot()
+    
+    def _write_snapshot(self):
+        """Write STATE_FILE from this dashboard's tasks and remove the change log"""
+        state = {
+            'lab_sku': self.lab_sku,
+            'start_time': self.start_time.isoformat(),
+            'failed': self.failed,
+            'failure_reason': self.failure_reason,
+            'groups': {}
+        }
         
-        .failure-banner {{
-            background: #fecaca;
-            border: 2px solid var(--accent-red);
-            color: #7f1d1d;
-            padding: 1.5rem;
-            border-radius: 1rem;
-            margin-bottom: 2rem;
-            text-align: center;
-        }}
+        for gid, group in self.groups.items():
+            state['groups'][gid] = {
+                'name': group.name,
+                'tasks': [self._task_state(t) for t in group.tasks]
+            }
         
-        .failure-banner h2 {{
-            margin-bottom: 0.5rem;
-            color: #991b1b;
-        }}
+        self._log_entries.clear()
+        try:
+            _write_atomic(STATE_FILE, json_dumps(state))
+        except Exception:
+            return
         
-        .failure-banner .fail-icon {{
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-        }}
+        # Snapshot now covers everything logged so far
+        try:
+            os.remove(STATE_LOG_FILE)
+        except OSError:
+            pass
+        self._log_count = 0
+        self._needs_snapshot = False
+    
+    def _get_elapsed_time(self) -> str:
+        """Get elapsed time as formatted string"""
+        elapsed = datetime.datetime.now() - self.start_time
+        minutes = int(elapsed.total_seconds() // 60)
+        seconds = int(elapsed.total_seconds() % 60)
+        return f"{minutes}m {seconds}s"
+    
+    def generate_html(self) -> str:
+        """
+        Generate the HTML status page, saving any pending state first so the
+        next module's StatusDashboard loads the latest task statuses
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self._dirty = False
+                if (self._needs_snapshot or
+                        self._log_count + len(self._log_entries) > STATE_LOG_MAX):
+                    self._save_state()
+                else:
+                    self._append_log()
+            # Only once the state is on disk, so a new dashboard never skips it
+            _pending_dashboards.discard(self)
+            return self._render_html()
+    
+    def _render_html(self) -> str:
+        """Render the HTML status page and write it to STATUS_FILE"""
+        # Count each group's tasks once; the overall status and progress and
+        # every group's status, progress and collapse state derive from these
+        group_counts = {gid: g.status_counts() for gid, g in self.groups.items()}
+        totals = sum(group_counts.values(), Counter())
+        progress = _group_progress(totals)
+        elapsed = self._get_elapsed_time()
         
-        .auto-refresh {{
-            text-align: center;
-            color: var(--text-secondary);
-            font-size: 0.8rem;
-            margin-top: 2rem;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
+        # Determine overall status
+        if self.failed or TaskStatus.FAILED in totals:
+            overall_status = "FAILED"
+            status_color = "#ef4444"
+        elif progress >= 100:
+            overall_status = "READY"
+            status_color = "#22c55e"
+        else:
+            has_running = TaskStatus.RUNNING in totals
+            has_completed = not totals.keys().isdisjoint(_DONE_STATUSES)
+            
+            if has_running or has_completed:
+                overall_status = "RUNNING"
+                status_color = "#f59e0b"  # Amber/orange for running
+            else:
+                overall_status = "STARTING"
+                status_color = "#3b82f6"
+        
+        # Collect fragments and join once (repeated += on one growing string is quadratic)
+        parts = [f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta http-equiv="refresh" content="{REFRESH_SECONDS}">
+    <title>{self.lab_sku} - Lab Startup Status</title>
+''', _HTML_STYLE, f'''        <header>
             <h1>{self.lab_sku}</h1>
-            <div class="status-badge">{overall_status}</div>
+            <div class="status-badge" style="background: {status_color};">{overall_status}</div>
             <div class="meta-info">
                 <span>Started: {self.start_time.strftime('%H:%M:%S')}</span>
                 <span>Elapsed: {elapsed}</span>
                 <span>Last Updated: {datetime.datetime.now().strftime('%H:%M:%S')}</span>
             </div>
         </header>
-'''
+''']
         
         # Add failure banner if failed
         if self.failed:
-            html += f'''
+            parts.append(f'''
         <div class="failure-banner">
             <h2>⚠️ Lab Startup Failed</h2>
             <p>{self.failure_reason}</p>
         </div>
-'''
+''')
         
         # Progress bar
-        html += f'''
+        parts.append(f'''
         <div class="progress-container">
             <div class="progress-bar">
-                <div class="progress-fill"></div>
+                <div class="progress-fill" style="width: {progress:.1f}%;"></div>
             </div>
             <div class="progress-text">{progress:.0f}% Complete</div>
         </div>
         
         <div class="task-groups">
-'''
+''')
         
         # Task groups
         for group in self.groups.values():
             group_class = ""
             group_status_icon = "🔄"
+            counts = group_counts[group.id]
+            group_status = _group_status(counts)
             
-            if group.status == TaskStatus.COMPLETE:
+            if group_status == TaskStatus.COMPLETE:
                 group_class = "complete"
                 group_status_icon = "✅"
-            elif group.status == TaskStatus.FAILED:
+            elif group_status == TaskStatus.FAILED:
                 group_class = "failed"
                 group_status_icon = "❌"
-            elif group.status == TaskStatus.RUNNING:
+            elif group_status == TaskStatus.RUNNING:
                 group_class = "running"
                 group_status_icon = "🔄"
-            elif group.status == TaskStatus.SKIPPED:
+            elif group_status == TaskStatus.SKIPPED:
                 group_class = "complete"  # Use complete style (collapsed, muted)
                 group_status_icon = "⏭️"
             else:
@@ -894,18 +1180,12 @@ class StatusDashboard:
             # Determine if group should be collapsed:
             # - Collapse if all tasks are Complete and/or Skipped (no failures, no pending/running)
             # - Keep expanded if there are any failures OR any pending/running tasks
-            statuses = [t.status for t in group.tasks]
-            has_failures = TaskStatus.FAILED in statuses
-            has_pending_or_running = any(s in [TaskStatus.PENDING, TaskStatus.RUNNING] for s in statuses)
-            all_done = all(s in [TaskStatus.COMPLETE, TaskStatus.SKIPPED] for s in statuses)
-            
-            # Collapse only if all tasks are done (complete/skipped) and no failures
-            should_collapse = all_done and not has_failures
+            should_collapse = counts.keys() <= _DONE_STATUSES
             
             tasks_class = "collapsed" if should_collapse else "expanded"
             toggle_class = "collapsed" if should_collapse else ""
             
-            html += f'''
+            parts.append(f'''
             <div class="task-group {group_class}">
                 <div class="group-header" onclick="toggleGroup(this)">
                     <span class="group-title">
@@ -913,20 +1193,20 @@ class StatusDashboard:
                         {group.name}
                         <span class="group-status-icon">{group_status_icon}</span>
                     </span>
-                    <span class="group-progress">{group.progress:.0f}%</span>
+                    <span class="group-progress">{_group_progress(counts):.0f}%</span>
                 </div>
                 <div class="tasks {tasks_class}">
-'''
+''')
             
             for task in group.tasks:
                 icon, color, tooltip = self.STATUS_ICONS[task.status]
-                html += f'''
+                parts.append(f'''
                     <div class="task" title="{tooltip}">
                         <span class="task-icon">{icon}</span>
                         <div class="task-info">
                             <div class="task-name">{task.name}</div>
                             <div class="task-desc">{task.description}</div>
-'''
+''')
                 # Show item counts if present
                 if task.total_items > 0:
                     details_class = "task-details"
@@ -943,74 +1223,32 @@ class StatusDashboard:
                         count_parts.append(f'<span class="count-skipped">{task.skipped_items} skipped</span>')
                     
                     count_str = ", ".join(count_parts) if count_parts else "processed"
-                    html += f'''
+                    parts.append(f'''
                             <div class="{details_class}">{task.total_items} items: {count_str}</div>
-'''
+''')
                 
                 if task.message:
-                    html += f'''
+                    parts.append(f'''
                             <div class="task-message">{task.message}</div>
-'''
-                html += '''
+''')
+                parts.append('''
                         </div>
                     </div>
-'''
+''')
             
-            html += '''
+            parts.append('''
                 </div>
             </div>
-'''
-        
-        html += '''
-        </div>
-        
-        <div class="legend">
-            <h3>Status Legend</h3>
-            <div class="legend-items">
-'''
-        
-        for status, (icon, color, tooltip) in self.STATUS_ICONS.items():
-            html += f'''
-                <div class="legend-item">
-                    <span>{icon}</span>
-                    <span>{status.value.title()}</span>
-                </div>
-'''
+''')
         
-        html += f'''
-            </div>
-        </div>
+        parts.append(self._HTML_FOOTER)
         
-        <div class="auto-refresh">
-            Auto-refreshing every {REFRESH_SECONDS} seconds
-        </div>
-    </div>
-    
-    <script>
-        function toggleGroup(header) {{
-            const tasks = header.nextElementSibling;
-            const toggle = header.querySelector('.group-toggle');
-            
-            if (tasks.classList.contains('collapsed')) {{
-                tasks.classList.remove('collapsed');
-                tasks.classList.add('expanded');
-                toggle.classList.remove('collapsed');
-            }} else {{
-                tasks.classList.remove('expanded');
-                tasks.classList.add('collapsed');
-                toggle.classList.add('collapsed');
-            }}
-        }}
-    </script>
-</body>
-</html>
-'''
+        html = ''.join(parts)
         
         # Write to file
         try:
             os.makedirs(os.path.dirname(STATUS_FILE), exist_ok=True)
-            with open(STATUS_FILE, 'w') as f:
-                f.write(html)
+            _write_atomic(STATUS_FILE, html)
         except Exception as e:
             print(f'Error writing status dashboard: {e}')
         
@@ -1030,8 +1268,7 @@ def init_dashboard(lab_sku: str = "INITIALIZING") -> 'StatusDashboard':
     """
     # Remove existing state file
     try:
-        if os.path.exists(STATE_FILE):
-            os.remove(STATE_FILE)
+        _remove_state_files()
     except Exception:
         pass
     
@@ -1049,8 +1286,7 @@ def clear_dashboard() -> None:
     """
     # Remove existing files
     try:
-        if os.path.exists(STATE_FILE):
-            os.remove(STATE_FILE)
+        _remove_state_files()
     except Exception:
         pass
     
@@ -1111,8 +1347,7 @@ def clear_dashboard() -> None:
     
     try:
         os.makedirs(os.path.dirname(STATUS_FILE), exist_ok=True)
-        with open(STATUS_FILE, 'w') as f:
-            f.write(waiting_html)
+        _write_atomic(STATUS_FILE, waiting_html)
     except Exception as e:
         print(f'Error clearing dashboard: {e}')
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# test_generate_labdetails.py - HOLFY27 Lab Details Generator Unit Tests
+# Version 1.0 - October 2026
+# Author - HOL Core Team
+
+import pytest
+import os
+import sys
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# generate_labdetails imports requests at module level
+pytest.importorskip('requests')
+
+
+class TestEnvCache:
+    """Test the collected environment snapshot cache"""
+    
+    def _collect(self, tmpdir, env, errors):
+        """Run collect_env with a stub collector returning env and errors"""
+        import generate_labdetails as gl
+        
+        collector = MagicMock()
+        collector.collect_all.return_value = env
+        collector.errors = errors
+        
+        cache = os.path.join(tmpdir, 'labenv.pkl')
+        config = os.path.join(tmpdir, 'config.ini')
+        with patch.object(gl, 'ENV_CACHE', cache), \
+             patch.object(gl, 'LabDataCollector', return_value=collector):
+            result = gl.collect_env(config)
+        return result, cache
+    
+    def test_failed_collection_not_cached(self):
+        """Test a collection with a failed source is not written to the cache"""
+        from generate_labdetails import LabEnvironment
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = LabEnvironment()
+            result, cache = self._collect(
+                tmpdir, env, ['sddcmanager-a.site-a.vcf.lab: authentication failed']
+            )
+            
+            assert result is env
+            assert not os.path.exists(cache)
+    
+    def test_collection_without_domains_not_cached(self):
+        """Test an empty collection is not cached even without recorded errors"""
+        from generate_labdetails import LabEnvironment
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result, cache = self._collect(tmpdir, LabEnvironment(), [])
+            
+            assert not os.path.exists(cache)
+    
+    def test_complete_collection_cached(self):
+        """Test a complete collection is cached and reused by the next run"""
+        import generate_labdetails as gl
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = gl.LabEnvironment(lab_sku='HOL-2705')
+            env.domains.append(gl.DomainInfo(name='mgmt-a', domain_type='MANAGEMENT'))
+            result, cache = self._collect(tmpdir, env, [])
+            
+            assert os.path.exists(cache)
+            with patch.object(gl, 'ENV_CACHE', cache):
+                cached = gl.load_env_cache(os.path.join(tmpdir, 'config.ini'))
+            assert cached.lab_sku == 'HOL-2705'
+            assert [d.name for d in cached.domains] == ['mgmt-a']
+    
+    def test_non_200_reply_recorded_as_error(self):
+        """Test an SDDC Manager list returning non-200 is recorded, so it is not cached"""
+        import json
+        import generate_labdetails as gl
+        
+        bodies = {
+            'domains': (200, {'elements': [{'name': 'mgmt-a', 'type': 'MANAGEMENT'}]}),
+            'clusters': (503, {}),
+            'hosts': (200, {'elements': []}),
+        }
+        
+        def get(url, **kwargs):
+            status, body = bodies[url.rsplit('/', 1)[1]]
+            return MagicMock(status_code=status, content=json.dumps(body).encode())
+        
+        with patch.object(gl, 'get_password', return_value='x'), \
+             patch.object(gl, 'IJSON_AVAILABLE', False):
+            collector = gl.LabDataCollector()
+            collector.http = MagicMock(get=get)
+            with patch.object(collector, '_get_sddc_token', return_value='token'):
+                collector._collect_sddc_info()
+        
+        assert [d.name for d in collector.env.domains] == ['mgmt-a']
+        assert collector.errors == [
+            'https://sddcmanager-a.site-a.vcf.lab/v1/clusters: HTTP 503'
+        ]
@@ -489,3 +489,55 @@ class TestLabTypeRepoPatterns:
             loader = LabTypeLoader(labtype_input, '/home/holuser/hol')
             assert loader.labtype == 'DISCOVERY'
             assert loader.get_repo_pattern() == 'named'
+    
+    def test_run_startup_stops_only_on_critical_failure(self, tmp_path, mock_lsf, monkeypatch):
+        """Test that a failing non-critical module is skipped past but a critical one stops the sequence"""
+        from Tools.labtypes import LabTypeLoader
+        
+        startup_dir = tmp_path / 'hol' / 'Startup'
+        startup_dir.mkdir(parents=True)
+        for name in ('pings', 'prelim', 'final'):
+            (startup_dir / f'{name}.py').write_text('')
+        monkeypatch.setitem(LabTypeLoader.STARTUP_SEQUENCE, 'HOL', ['pings', 'prelim', 'final'])
+        
+        loader = LabTypeLoader('HOL', str(tmp_path / 'hol'), str(tmp_path / 'vpodrepo'))
+        mock_lsf.startup = MagicMock(return_value=False)
+        
+        with pytest.raises(RuntimeError, match='prelim'):
+            loader.run_startup(mock_lsf)
+        assert [c.args[0] for c in mock_lsf.startup.call_args_list] == ['pings', 'prelim']
+    
+    def test_load_module_reuses_loaded_module(self, tmp_path):
+        """Test that a startup module is resolved and executed only once per loader"""
+        from Tools.labtypes import LabTypeLoader
+        
+        startup_dir = tmp_path / 'hol' / 'Startup'
+        startup_dir.mkdir(parents=True)
+        (startup_dir / 'pings.py').write_text('MODULE_NAME = "pings"\n')
+        
+        loader = LabTypeLoader('HOL', str(tmp_path / 'hol'), str(tmp_path / 'vpodrepo'))
+        module, module_path = loader.load_module('pings')
+        
+        assert module.MODULE_NAME == 'pings'
+        assert module_path == str(startup_dir / 'pings.py')
+        assert loader.load_module('pings')[0] is module
+    
+    def test_get_module_path_index_lasts_for_loader(self, tmp_path):
+        """Test that the directory index prefers vpodrepo overrides and is kept for the loader's lifetime"""
+        from Tools.labtypes import LabTypeLoader
+        
+        core_dir = tmp_path / 'hol' / 'Startup'
+        core_dir.mkdir(parents=True)
+        (core_dir / 'prelim.py').write_text('')
+        vpod_dir = tmp_path / 'vpodrepo' / 'Startup'
+        vpod_dir.mkdir(parents=True)
+        
+        loader = LabTypeLoader('HOL', str(tmp_path / 'hol'), str(tmp_path / 'vpodrepo'))
+        assert loader.get_module_path('prelim') == str(core_dir / 'prelim.py')
+        assert loader.get_module_path('missing') is None
+        
+        (vpod_dir / 'prelim.py').write_text('')
+        assert loader.get_module_path('prelim') == str(core_dir / 'prelim.py')
+        
+        loader = LabTypeLoader('HOL', str(tmp_path / 'hol'), str(tmp_path / 'vpodrepo'))
+        assert loader.get_module_path('prelim') == str(vpod_dir / 'prelim.py')
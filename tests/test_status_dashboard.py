@@ -116,6 +116,20 @@ class TestTaskGroup:
         
         assert group.status == TaskStatus.FAILED
     
+    def test_task_group_status_complete_and_skipped(self):
+        """Test TaskGroup status for all-skipped and mixed complete/skipped tasks"""
+        from status_dashboard import TaskGroup, Task, TaskStatus
+        
+        skipped = Task(id='t1', name='Task 1', description='', status=TaskStatus.SKIPPED)
+        group = TaskGroup(id='test', name='Test', tasks=[skipped])
+        assert group.status == TaskStatus.SKIPPED
+        
+        group.tasks.append(Task(id='t2', name='Task 2', description='', status=TaskStatus.COMPLETE))
+        assert group.status == TaskStatus.COMPLETE
+        
+        group.tasks.append(Task(id='t3', name='Task 3', description='', status=TaskStatus.PENDING))
+        assert group.status == TaskStatus.PENDING
+    
     def test_task_group_progress(self):
         """Test TaskGroup progress calculation"""
         from status_dashboard import TaskGroup, Task, TaskStatus
@@ -182,6 +196,92 @@ class TestStatusDashboard:
         assert task.status == TaskStatus.RUNNING
         assert task.message == 'Checking DNS...'
     
+    def test_update_task_burst_writes_once(self):
+        """Test a burst of running-task updates is coalesced into one state write"""
+        from status_dashboard import StatusDashboard
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('status_dashboard.STATUS_FILE', os.path.join(tmpdir, 'status.htm')):
+                dashboard = StatusDashboard('HOL-2705', load_state=False)
+                with patch.object(dashboard, '_save_state') as save_state:
+                    for task_id in ('dns', 'dns_import', 'readme', 'firewall'):
+                        dashboard.update_task('prelim', task_id, 'running')
+                    assert save_state.call_count == 0
+                    
+                    dashboard.generate_html()
+                    assert save_state.call_count == 1
+                    assert dashboard._flush_timer is None
+    
+    def test_final_status_seen_by_next_dashboard(self):
+        """Test a module's last update is on disk before the next module's dashboard loads"""
+        from status_dashboard import StatusDashboard, TaskStatus
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('status_dashboard.STATUS_FILE', os.path.join(tmpdir, 'status.htm')), \
+                 patch('status_dashboard.STATE_FILE', os.path.join(tmpdir, 'state.json')), \
+                 patch('status_dashboard.STATE_LOG_FILE', os.path.join(tmpdir, 'state.log')):
+                # Own SKU: dashboards left pending by other tests flush into these paths
+                pings = StatusDashboard('HOL-2799')
+                pings.update_task('pings', 'ping_targets', 'complete')
+                pings.update_task('services', 'linux_services', 'running')
+                
+                services = StatusDashboard('HOL-2799')
+                services.set_failed('Service check failed')
+                
+                reloaded = StatusDashboard('HOL-2799')
+                tasks = {t.id: t for g in reloaded.groups.values() for t in g.tasks}
+                assert tasks['pings_ping_targets'].status == TaskStatus.COMPLETE
+                assert tasks['services_linux_services'].status == TaskStatus.FAILED
+    
+    def test_state_log_replayed_by_next_dashboard(self):
+        """Test task changes logged after a snapshot are restored on load"""
+        from status_dashboard import StatusDashboard, TaskStatus
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('status_dashboard.STATUS_FILE', os.path.join(tmpdir, 'status.htm')), \
+                 patch('status_dashboard.STATE_FILE', os.path.join(tmpdir, 'state.json')), \
+                 patch('status_dashboard.STATE_LOG_FILE', os.path.join(tmpdir, 'state.log')):
+                first = StatusDashboard('HOL-2705')
+                first.update_task('prelim', 'dns', 'complete')
+                first.generate_html()
+                
+                second = StatusDashboard('HOL-2705')
+                second.update_task('prelim', 'readme', 'running', total=2, success=1)
+                second.generate_html()
+                assert os.path.exists(os.path.join(tmpdir, 'state.log'))
+                
+                third = StatusDashboard('HOL-2705')
+                tasks = {t.id: t for t in third.groups['prelim'].tasks}
+                assert tasks['prelim_dns'].status == TaskStatus.COMPLETE
+                assert tasks['prelim_readme'].status == TaskStatus.RUNNING
+                assert tasks['prelim_readme'].success_items == 1
+                
+                third.set_complete()
+                assert not os.path.exists(os.path.join(tmpdir, 'state.log'))
+    
+    def test_snapshot_keeps_other_dashboards_log_entries(self):
+        """Test a full snapshot keeps task changes another dashboard logged after it loaded"""
+        from status_dashboard import StatusDashboard, TaskStatus
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch('status_dashboard.STATUS_FILE', os.path.join(tmpdir, 'status.htm')), \
+                 patch('status_dashboard.STATE_FILE', os.path.join(tmpdir, 'state.json')), \
+                 patch('status_dashboard.STATE_LOG_FILE', os.path.join(tmpdir, 'state.log')):
+                # Own SKU: dashboards left pending by other tests flush into these paths
+                first = StatusDashboard('HOL-2798')
+                first.update_task('prelim', 'dns', 'complete')
+                
+                second = StatusDashboard('HOL-2798')
+                second.update_task('esxi', 'host_check', 'complete')
+                
+                first.set_complete()
+                
+                reloaded = StatusDashboard('HOL-2798')
+                tasks = {t.id: t for g in reloaded.groups.values() for t in g.tasks}
+                assert tasks['prelim_dns'].status == TaskStatus.COMPLETE
+                assert tasks['esxi_host_check'].status == TaskStatus.COMPLETE
+                assert tasks['esxi_host_ports'].status == TaskStatus.SKIPPED
+    
     def test_set_failed(self):
         """Test marking dashboard as failed"""
         from status_dashboard import StatusDashboard